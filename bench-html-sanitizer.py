@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import time
+
+from seed_pipeline.legacy import clean_html_for_postgres
+from seed_pipeline.reader import read_product_groups
+from seed_pipeline.sanitize import sanitize_html_for_postgres
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+CLEANERS = {
+    'legacy clean_html_for_postgres': clean_html_for_postgres,
+    'sanitize_html_for_postgres': sanitize_html_for_postgres,
+}
+
+
+def read_descriptions(csv_file):
+    """All product descriptions in the export"""
+    return [group.get('Description') for group in read_product_groups(csv_file)]
+
+
+def time_cleaner(cleaner, descriptions, repeat):
+    """Best-of-``repeat`` wall time for one pass over all descriptions"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in descriptions:
+            cleaner(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark description cleaners over an export')
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'product_20250827_234649.csv'))
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    descriptions = read_descriptions(args.csv)
+    total_bytes = sum(len(text.encode('utf-8')) for text in descriptions)
+    print(f"{len(descriptions)} descriptions, {total_bytes / 1024:.0f} KB")
+
+    results = {}
+    for name, cleaner in CLEANERS.items():
+        elapsed = time_cleaner(cleaner, descriptions, args.repeat)
+        results[name] = elapsed
+        mb_per_s = total_bytes / elapsed / 1024 / 1024
+        print(f"  {name:34} {elapsed * 1000:8.2f} ms  {mb_per_s:7.1f} MB/s")
+
+    baseline, candidate = results.values()
+    print(f"Speedup: {baseline / candidate:.2f}x")
+
+if __name__ == '__main__':
+    main()
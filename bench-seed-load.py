@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from seed_pipeline.pgload import Cluster, LoadError, apply_migrations, load_sections, pg_bin_dir
+from seed_pipeline.splice import open_seed
+from seed_pipeline.validate import validate_file
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def print_section(load):
+    rate = f"{load.rows / load.seconds:12,.0f} rows/s" if load.seconds and load.rows else ' ' * 19
+    print(f"  {load.name[:40]:40} {load.seconds * 1000:10.1f} ms  {load.rows:9,} rows  {rate}  "
+          f"{load.wal_bytes / 1024 / 1024:8.1f} MB WAL")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load a seed into a throwaway Postgres and time each section')
+    parser.add_argument('seed', nargs='?', default=os.path.join(ROOT, 'supabase/seed.sql'))
+    parser.add_argument('--migrations', default=os.path.join(ROOT, 'supabase/migrations'))
+    parser.add_argument('--pg-bin', help='PostgreSQL bin directory (default: initdb on PATH, then pg_config --bindir)')
+    parser.add_argument('--port', type=int, default=54329, help='port of the unix socket the cluster listens on')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        help='server setting for the cluster, e.g. --set synchronous_commit=off (repeatable)')
+    parser.add_argument('--label', help='free-form tag stored in the report (e.g. the --format the seed was made with)')
+    parser.add_argument('--report', help='default: .cache/load/<seed name>.json')
+    parser.add_argument('--keep', action='store_true', help='leave the cluster directory behind for inspection')
+    args = parser.parse_args()
+
+    # An unterminated literal would leave psql waiting for the rest of
+    # the statement instead of failing, so check the seed first
+    summary = validate_file(args.seed)
+    if summary.issues:
+        issue = summary.issues[0]
+        print(f"❌ {args.seed} has {len(summary.issues)} issues, first at line {issue.line}: {issue.message}")
+        print("   Run validate-seed.py for the full list")
+        sys.exit(1)
+
+    seed_name = os.path.splitext(os.path.basename(args.seed))[0]
+    report = args.report or os.path.join(ROOT, f'.cache/load/{seed_name}.json')
+    try:
+        bin_dir = pg_bin_dir(args.pg_bin)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    sections = []
+    with Cluster(bin_dir, port=args.port, settings=args.set, keep=args.keep) as cluster:
+        version = cluster.server_version()
+        print(f"Started PostgreSQL {version} in {cluster.root}")
+        start = time.perf_counter()
+        try:
+            skipped = apply_migrations(cluster, args.migrations)
+        except LoadError as e:
+            print(f"❌ Migration failed: {e}")
+            sys.exit(1)
+        print(f"✅ Applied migrations in {time.perf_counter() - start:.1f}s"
+              + (f" (skipped extensions: {', '.join(skipped)})" if skipped else ''))
+
+        size_mb = os.path.getsize(args.seed) / 1024 / 1024
+        print(f"Loading {args.seed} ({size_mb:.1f} MB)...")
+        with open_seed(args.seed) as (data, index):
+            kinds = Counter(statement.kind for statement in index.statements)
+            try:
+                for load in load_sections(cluster, data, index):
+                    sections.append(load)
+                    print_section(load)
+            except LoadError as e:
+                print(f"❌ Load failed after {len(sections)} sections: {e}")
+                sys.exit(1)
+
+    total_seconds = sum(load.seconds for load in sections)
+    total_rows = sum(load.rows for load in sections)
+    total_wal = sum(load.wal_bytes for load in sections)
+
+    directory = os.path.dirname(report)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(report, 'w') as f:
+        json.dump({
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'label': args.label,
+            'seed': {
+                'path': os.path.relpath(args.seed, ROOT),
+                'bytes': os.path.getsize(args.seed),
+                'sha256': file_sha256(args.seed),
+                'statements': dict(sorted(kinds.items())),
+            },
+            'postgres': {'version': version, 'settings': args.set, 'skipped_extensions': skipped},
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'sections': [load._asdict() for load in sections],
+            'total': {'seconds': total_seconds, 'rows': total_rows, 'wal_bytes': total_wal},
+        }, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    print(f"✅ Loaded {total_rows:,} rows in {total_seconds:.2f}s ({total_wal / 1024 / 1024:.1f} MB WAL)")
+    print(f"✅ Saved report to {report}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from itertools import chain
+
+from seed_pipeline import legacy
+from seed_pipeline.brands import BRAND_MAPPING, BRAND_SLUGS, brand_rows
+from seed_pipeline.categories import render_product_categories
+from seed_pipeline.parallel import DEFAULT_CHUNK_SIZE, chunked
+from seed_pipeline.reader import read_product_groups
+from seed_pipeline.render import render_batched_inserts, render_copy, render_inserts
+from seed_pipeline.splice import Replacement, open_seed, splice
+from seed_pipeline.synthetic import DEFAULT_SEED, write_export
+from seed_pipeline.tables import BRANDS, PRODUCT_CATEGORIES, PRODUCTS
+from seed_pipeline.transform import CHILD_TABLES, transform_chunk
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+STAGES = ('read', 'transform', 'render', 'splice', 'write')
+
+RENDERERS = {
+    'insert': render_inserts,
+    'batched': render_batched_inserts,
+    'copy': render_copy,
+}
+
+
+def scaled_export(sample_csv, products, path):
+    """Write an export of ``products`` products by tiling the sample's product groups
+
+    Every pass over the sample shifts row IDs by a multiple of its largest
+    ID and suffixes SKUs, so products and variants stay unique.
+    """
+    groups = list(read_product_groups(sample_csv))
+    with open(sample_csv, 'r', encoding='utf-8-sig', newline='') as f:
+        header = next(csv.reader(f))
+    columns = groups[0].columns
+    id_index = columns['ID']
+    sku_index = columns['SKU']
+    stride = max(int(row[id_index]) for group in groups
+                 for row in chain((group.product,), group.variants, group.images, group.videos)
+                 if row[id_index].isdigit()) + 1
+
+    def shifted(row, tile):
+        if not tile:
+            return row
+        row = list(row)
+        if row[id_index].isdigit():
+            row[id_index] = str(int(row[id_index]) + tile * stride)
+        if row[sku_index]:
+            row[sku_index] = f'{row[sku_index]}-{tile}'
+        return row
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for n in range(products):
+            tile, position = divmod(n, len(groups))
+            group = groups[position]
+            for row in chain((group.product,), group.variants, group.images, group.videos):
+                writer.writerow(shifted(row, tile))
+
+
+def stage_recorder(results, trace):
+    """Context manager factory: ``with stage(name)`` records (seconds, peak bytes)
+
+    The peak is traced Python allocation above what was live when the
+    stage started, or None when tracemalloc is off.
+    """
+    @contextmanager
+    def stage(name):
+        gc.collect()
+        if trace:
+            tracemalloc.reset_peak()
+            live = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        results[name] = (elapsed, tracemalloc.get_traced_memory()[1] - live if trace else None)
+    return stage
+
+
+class PieceSink:
+    """Binary "file" that keeps references to what is written instead of copying it"""
+
+    def __init__(self):
+        self.pieces = []
+
+    def write(self, data):
+        self.pieces.append(data)
+        return len(data)
+
+
+def run_pipeline(csv_file, base_seed, output, render, stage):
+    """generate-clean-seed.py, one stage at a time (serial, no description cache)"""
+    with stage('read'):
+        groups = list(read_product_groups(csv_file))
+
+    with stage('transform'):
+        products = []
+        children = {table.name: [] for table, _ in CHILD_TABLES}
+        children[PRODUCT_CATEGORIES.name] = []
+        for chunk in chunked(groups, DEFAULT_CHUNK_SIZE):
+            rows, chunk_children, _, _ = transform_chunk(chunk)
+            products.extend(rows)
+            for name, child_rows in chunk_children.items():
+                children[name].extend(child_rows)
+    del groups
+
+    with stage('render'):
+        chunks = list(chain(
+            render(BRANDS, brand_rows()),
+            render(PRODUCTS, products),
+            *(render(table, children[table.name]) for table, _ in CHILD_TABLES),
+            render_product_categories(children[PRODUCT_CATEGORIES.name]),
+        ))
+    del products, children
+
+    with ExitStack() as stack:
+        with stage('splice'):
+            data, index = stack.enter_context(open_seed(base_seed))
+            section = index.section('🛍️ Products')
+            sink = PieceSink()
+            splice(data, [Replacement(section.start, section.end, chunks)], sink)
+        with stage('write'):
+            with open(output, 'wb') as out:
+                out.writelines(sink.pieces)
+        # The pieces point into the mapped seed
+        del sink
+
+
+def run_legacy(csv_file, base_seed, output, stage):
+    """proper-escape-html.py: products and brands only, built as whole strings"""
+    with stage('read'):
+        groups = list(read_product_groups(csv_file))
+
+    with stage('transform'):
+        products = legacy.product_dicts(groups, BRAND_MAPPING)
+    del groups
+
+    with stage('render'):
+        brand_sql = legacy.brand_inserts(BRAND_SLUGS)
+        product_sql = legacy.product_inserts(products)
+    del products
+
+    with stage('splice'):
+        with open(base_seed, 'r') as f:
+            existing_seed = f.read()
+        final_seed = legacy.splice_seed(existing_seed, brand_sql, product_sql)
+        del existing_seed
+
+    with stage('write'):
+        with open(output, 'w') as f:
+            f.write(final_seed)
+
+
+def measure(run, repeat):
+    """Best-of-``repeat`` stage times, then one traced run for peak memory"""
+    times = {}
+    for _ in range(repeat):
+        results = {}
+        run(stage_recorder(results, trace=False))
+        for name, (elapsed, _) in results.items():
+            times[name] = min(elapsed, times.get(name, elapsed))
+    results = {}
+    tracemalloc.start()
+    try:
+        run(stage_recorder(results, trace=True))
+    finally:
+        tracemalloc.stop()
+    return {name: {'seconds': times[name], 'peak_bytes': results[name][1]} for name in STAGES}
+
+
+def print_run(label, products, stages, previous=None):
+    print(f"  {label}")
+    for name in STAGES:
+        seconds = stages[name]['seconds']
+        peak_mb = stages[name]['peak_bytes'] / 1024 / 1024
+        line = f"    {name:9} {seconds * 1000:10.1f} ms  {products / seconds:12,.0f} products/s  {peak_mb:9.1f} MB peak"
+        if previous is not None and name in previous:
+            was = previous[name]
+            line += (f"  ({(seconds / was['seconds'] - 1) * 100:+.0f}% time, "
+                     f"{(stages[name]['peak_bytes'] / max(was['peak_bytes'], 1) - 1) * 100:+.0f}% memory)")
+        print(line)
+    total = sum(stages[name]['seconds'] for name in STAGES)
+    print(f"    {'total':9} {total * 1000:10.1f} ms  {products / total:12,.0f} products/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the seed pipeline stage by stage on scaled exports')
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'product_20250827_234649.csv'),
+                        help='sample export tiled up to each size')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='benchmark synthetic exports (see generate-synthetic-export.py) instead of the tiled sample')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='random seed for --synthetic exports')
+    parser.add_argument('--base-seed', default=os.path.join(ROOT, 'supabase/seed.sql.old-before-brands'))
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='product counts to benchmark')
+    parser.add_argument('--format', choices=sorted(RENDERERS), default='insert')
+    parser.add_argument('--repeat', type=int, default=1, help='timing runs per size (best is kept)')
+    parser.add_argument('--no-legacy', action='store_true', help='skip the proper-escape-html.py baseline')
+    parser.add_argument('--workdir', default=os.path.join(ROOT, '.cache/bench'),
+                        help='where scaled exports are kept between runs and seeds are written')
+    parser.add_argument('--baseline', default=os.path.join(ROOT, 'benchmarks/seed-pipeline-baseline.json'),
+                        help='earlier --save output to compare against')
+    parser.add_argument('--save', help='write results as JSON (e.g. to update the baseline)')
+    args = parser.parse_args()
+
+    previous = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            previous = json.load(f)['results']
+        print(f"Comparing against {os.path.relpath(args.baseline)}")
+
+    os.makedirs(args.workdir, exist_ok=True)
+    render = RENDERERS[args.format]
+    # Files in the workdir are named for everything that went into them, so
+    # runs on other inputs or formats never read or overwrite each other's
+    if args.synthetic:
+        source = f'synthetic-seed{args.seed}'
+    else:
+        source = 'tiled-' + os.path.splitext(os.path.basename(args.csv))[0]
+    results = {}
+    for size in args.sizes:
+        # Results are keyed by input so synthetic runs are only compared
+        # with synthetic runs of the same seed
+        key = f'synthetic-{size}-seed{args.seed}' if args.synthetic else str(size)
+        export = os.path.join(args.workdir, f'export-{source}-{size}.csv')
+        if not os.path.exists(export):
+            print(f"Writing {size:,} product export...")
+            if args.synthetic:
+                write_export(export, size, seed=args.seed)
+            else:
+                scaled_export(args.csv, size, export)
+        export_mb = os.path.getsize(export) / 1024 / 1024
+        print(f"{size:,} products ({export_mb:.1f} MB export)")
+
+        output = os.path.join(args.workdir, f'seed-{source}-{size}-{args.format}.sql')
+        runs = {f'pipeline {args.format}': lambda stage: run_pipeline(export, args.base_seed, output, render, stage)}
+        if not args.no_legacy:
+            legacy_output = os.path.join(args.workdir, f'seed-{source}-{size}-legacy.sql')
+            runs['legacy'] = lambda stage: run_legacy(export, args.base_seed, legacy_output, stage)
+        results[key] = {}
+        for label, run in runs.items():
+            stages = measure(run, args.repeat)
+            results[key][label] = stages
+            print_run(label, size, stages, previous.get(key, {}).get(label))
+
+    if args.save:
+        directory = os.path.dirname(args.save)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'cpus': os.cpu_count(),
+                'results': results,
+            }, f, indent=2)
+            f.write('\n')
+        print(f"✅ Saved results to {args.save}")
+
+if __name__ == '__main__':
+    main()
@@ -1,82 +1,53 @@
 #!/usr/bin/env python3
-import re
-
-def extract_section(content, start_marker, end_marker=None):
-    """Extract a section from content between markers"""
-    start_idx = content.find(start_marker)
-    if start_idx == -1:
-        return ""
-    
-    if end_marker:
-        end_idx = content.find(end_marker, start_idx + len(start_marker))
-        if end_idx == -1:
-            return content[start_idx:]
-        return content[start_idx:end_idx]
-    else:
-        return content[start_idx:]
+from seed_pipeline.media import hand_made_images
+from seed_pipeline.splice import open_seed, replace, splice
+from seed_pipeline.seed_index import Section, read_seed_index
 
 def main():
-    # Read the original seed
+    # Map both seeds; nothing is read into memory up front
     print("Reading original seed...")
-    with open('/Volumes/Projects2025/toynami-paypal/supabase/seed.sql.old-before-brands', 'r') as f:
-        original = f.read()
-    
-    # Read the generated seed
     print("Reading generated seed with products from CSV...")
-    with open('/Volumes/Projects2025/toynami-paypal/supabase/seed_generated.sql', 'r') as f:
-        generated = f.read()
-    
-    # Extract parts we need
-    print("Extracting sections...")
-    
-    # 1. Get the header and initial setup from original
-    header_end = "-- ======================================\n-- 📸 Media Library"
-    header = extract_section(original, "", header_end)
-    
-    # 2. Get media library and media usage from original
-    media_start = "-- ======================================\n-- 📸 Media Library"
-    media_end = "-- ======================================\n-- 🏢 Brands"
-    media_section = extract_section(original, media_start, media_end)
-    
-    # 3. Get brands from generated (with UUIDs)
-    brands_start = "-- ======================================\n-- 🏢 Brands"
-    brands_end = "-- ======================================\n-- 🛍️ Products"
-    brands_section = extract_section(generated, brands_start, brands_end)
-    
-    # 4. Get products from generated
-    products_start = "-- ======================================\n-- 🛍️ Products"
-    products_end = "-- ======================================\n-- 📁 Categories"
-    products_section = extract_section(generated, products_start, products_end)
-    
-    # 5. Get everything after products from original (categories, etc)
-    after_products_start = "-- ======================================\n-- 📁 Categories"
-    after_products = extract_section(original, after_products_start)
-    
-    # Combine all parts
-    print("Combining sections...")
-    final_seed = f"""{header}
-{media_section}
-{brands_section}
-{products_section}
-{after_products}"""
-    
-    # Write final seed
-    output_file = '/Volumes/Projects2025/toynami-paypal/supabase/seed.sql'
-    print(f"Writing final seed to {output_file}...")
-    with open(output_file, 'w') as f:
-        f.write(final_seed)
-    
+    with open_seed('/Volumes/Projects2025/toynami-paypal/supabase/seed.sql.old-before-brands') as (original, original_index), \
+            open_seed('/Volumes/Projects2025/toynami-paypal/supabase/seed_generated.sql') as (generated, generated_index):
+        # Everything from brands through product categories comes from the
+        # generated seed: brands (with UUIDs), products and their variants,
+        # images, image usage and category links. The original's
+        # hand-written product images and their usage records are dropped;
+        # the header, media library, categories and everything after
+        # product categories stay as they are in the original
+        print("Extracting sections...")
+        first = original_index.section('Brands')
+        last = original_index.section('Product Categories')
+        source_first = generated_index.section('🏢 Brands')
+        source_last = generated_index.section('🔗 Product Categories')
+        for name, section in (('Brands', first), ('Product Categories', last),
+                              ('🏢 Brands', source_first), ('🔗 Product Categories', source_last)):
+            if section is None:
+                print(f"❌ Could not find {name} section")
+                return
+        replacements = [replace(Section('Brands to Product Categories', first.start, last.end),
+                                [generated[source_first.start:source_last.end]])]
+        replacements += hand_made_images(original, original_index)
+
+        # Write final seed
+        output_file = '/Volumes/Projects2025/toynami-paypal/supabase/seed.sql'
+        print(f"Writing final seed to {output_file}...")
+        with open(output_file, 'wb') as f:
+            splice(original, replacements, f)
+
     # Count some stats
-    product_count = final_seed.count('INSERT INTO products (')
-    brand_count = final_seed.count('INSERT INTO brands (')
-    media_count = final_seed.count('INSERT INTO media_library')
-    
+    _, index = read_seed_index(output_file)
+    def count(table):
+        return sum(1 for statement in index.statements if statement.kind == 'INSERT' and statement.table == table)
+
     print(f"\n✅ Final seed.sql created:")
-    print(f"  - {brand_count} brand INSERTs with explicit UUIDs")
-    print(f"  - {product_count} product INSERTs with brand_ids")
-    print(f"  - {media_count} media library INSERT")
-    print(f"  - Preserved all media_usage mappings")
+    print(f"  - {count('brands')} brand INSERTs with explicit UUIDs")
+    print(f"  - {count('products')} product INSERTs with brand_ids")
+    print(f"  - {count('product_variants')} product variant INSERTs")
+    print(f"  - {count('media_library')} media library INSERTs")
+    print(f"  - {count('media_usage')} media usage INSERTs")
+    print(f"  - {count('product_categories')} product category INSERTs")
     print(f"  - Preserved categories, settings, etc.")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
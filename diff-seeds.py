@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import os
+import sys
+import time
+
+from seed_pipeline.seed_diff import MISSING, diff_seeds, unmatched_statements
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def key_text(key):
+    return ', '.join('NULL' if value is None else value for value in key)
+
+
+def value_text(value, width):
+    if value is MISSING:
+        return '(not set)'
+    if value is None:
+        return 'NULL'
+    text = repr(value)
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+def print_table(diff, limit, width):
+    print(f"- {diff.table}: {len(diff.added)} added, {len(diff.removed)} removed, "
+          f"{len(diff.changed)} changed, {diff.unchanged} unchanged")
+    for key in diff.added[:limit]:
+        print(f"    + ({key_text(key)})")
+    for key in diff.removed[:limit]:
+        print(f"    - ({key_text(key)})")
+    for change in diff.changed[:limit]:
+        print(f"    ~ ({key_text(change.key)})")
+        for column, old, new in change.columns:
+            print(f"        {column}: {value_text(old, width)} -> {value_text(new, width)}")
+    hidden = sum(max(len(rows) - limit, 0) for rows in (diff.added, diff.removed, diff.changed))
+    if hidden:
+        print(f"    ... and {hidden} more rows")
+
+
+def json_value(value):
+    return None if value is MISSING else value
+
+
+def write_json(path, diffs, args):
+    with open(path, 'w') as f:
+        json.dump({
+            'old': args.old,
+            'new': args.new,
+            'tables': [{
+                'table': diff.table,
+                'added': [list(key) for key in diff.added],
+                'removed': [list(key) for key in diff.removed],
+                'changed': [{
+                    'key': list(change.key),
+                    'columns': {column: {'old': json_value(old), 'new': json_value(new)}
+                                for column, old, new in change.columns},
+                } for change in diff.changed],
+                'unchanged': diff.unchanged,
+            } for diff in diffs],
+        }, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare two seed files row by row, keyed by table and primary key; '
+                    'exits 1 if they differ and 2 if some statements could not be compared, like diff')
+    parser.add_argument('old')
+    parser.add_argument('new', nargs='?', default=os.path.join(ROOT, 'supabase/seed.sql'))
+    parser.add_argument('--table', action='append', help='only report this table (repeatable)')
+    parser.add_argument('--limit', type=int, default=10, help='rows to list per table and kind of change')
+    parser.add_argument('--width', type=int, default=60, help='characters of each value to show')
+    parser.add_argument('--json', help='also write every difference to this file')
+    args = parser.parse_args()
+
+    print(f"Comparing {args.old} -> {args.new}...")
+    start = time.perf_counter()
+    diffs, old_summary, new_summary = diff_seeds(args.old, args.new)
+    elapsed = time.perf_counter() - start
+
+    for path, summary in ((args.old, old_summary), (args.new, new_summary)):
+        if summary.issues:
+            issue = summary.issues[0]
+            print(f"❌ {path} has {len(summary.issues)} issues, first at line {issue.line}: {issue.message}")
+            print("   Rows it could not parse are not compared; run validate-seed.py for the full list")
+
+    unmatched = unmatched_statements(old_summary, new_summary)
+    for path, lines in zip((args.old, args.new), unmatched):
+        if lines:
+            print(f"❌ {path} has {len(lines)} statements whose rows cannot be read and that the other seed "
+                  f"does not have, first at line {lines[0]}")
+
+    if args.table:
+        diffs = [diff for diff in diffs if diff.table in args.table]
+    differing = [diff for diff in diffs if diff.added or diff.removed or diff.changed]
+    for diff in diffs:
+        print_table(diff, args.limit, args.width)
+    if args.json:
+        write_json(args.json, diffs, args)
+        print(f"✅ Saved differences to {args.json}")
+
+    rows = sum(len(diff.added) + len(diff.removed) + len(diff.changed) for diff in differing)
+    if differing:
+        print(f"Found {rows:,} differing rows in {len(differing)} of {len(diffs)} tables ({elapsed:.2f}s)")
+        sys.exit(1)
+    unread = sum(map(len, unmatched))
+    if unread:
+        print(f"No row differences in {len(diffs)} tables, but {unread} statements could not be compared "
+              f"({elapsed:.2f}s)")
+        sys.exit(2)
+    print(f"✅ No differences in {len(diffs)} tables ({elapsed:.2f}s)")
+
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,43 @@
 #!/usr/bin/env python3
 import re
 
+from seed_pipeline.seed_index import read_seed_index
+
 def fix_seed():
     print("Reading seed.sql...")
-    with open('/Volumes/Projects2025/toynami-paypal/supabase/seed.sql', 'r') as f:
-        content = f.read()
-    
+    data, index = read_seed_index('/Volumes/Projects2025/toynami-paypal/supabase/seed.sql')
+
     # Find the start of the original brands section
     # It starts after media usage and before our generated brands
-    media_end = content.find('-- ======================================\n-- 🏢 Brands')
-    if media_end == -1:
+    brands_sections = index.sections_named('🏢 Brands')
+    if not brands_sections:
         print("Could not find brands section marker")
         return
-    
-    # Find where our generated brands start (with the comment)
-    generated_brands_start = content.find('-- ======================================\n-- 🏢 Brands', media_end + 1)
-    
-    if generated_brands_start != -1:
+    media_end = brands_sections[0].start
+
+    if len(brands_sections) > 1:
+        # Find where our generated brands start (with the comment)
+        generated_brands_start = brands_sections[1].start
+
         # We have duplicate brands sections
         # Remove everything between media end and our generated brands
-        before_media_end = content[:media_end]
-        after_generated_brands = content[generated_brands_start:]
+        before_media_end = data[:media_end]
+        after_generated_brands = data[generated_brands_start:]
         
         # Combine without the duplicate brands
-        content = before_media_end + after_generated_brands
+        data = before_media_end + after_generated_brands
         print("Removed duplicate brand entries")
     else:
         print("No duplicate brands found")
     
     # Write the fixed content
-    with open('/Volumes/Projects2025/toynami-paypal/supabase/seed.sql', 'w') as f:
-        f.write(content)
+    with open('/Volumes/Projects2025/toynami-paypal/supabase/seed.sql', 'wb') as f:
+        f.write(data)
     
     print("✅ Fixed seed.sql - removed duplicate brand entries")
     
     # Count what we have
+    content = data.decode('utf-8')
     brand_with_id = content.count('INSERT INTO brands (id,')
     brand_without_id = len(re.findall(r'INSERT INTO brands \((?!id)', content))
     products = content.count('INSERT INTO products')
@@ -3,49 +3,24 @@ import csv
 import re
 import html
 
-# Brand mappings
-BRAND_MAPPING = {
-    '38': '7530230c-c28d-428e-8a5c-ccd476908c30',  # Acid Rain World
-    '39': 'bf9e0455-dcbd-49e4-b887-58d0120eda79',  # Mospeada
-    '40': '55edbf04-244d-49fc-abe6-114606068ef6',  # Futurama
-    '47': 'd9acfb7b-e561-4f39-9ab0-0cdc29c5ce34',  # Macross
-    '49': 'f3bd21c4-bb53-46a0-862f-7788d04395b6',  # Naruto
-    '50': '14ad8bae-5090-41f8-aa33-cdcf63c3284c',  # Sanrio
-    '54': '63e24c0a-dbe4-45a0-9b0d-ffc51b62f6d2',  # Emily the Strange
-    '55': '77c6dd4c-182b-487a-8216-8c8477d5c4b6',  # MILLINILLIONS
-    '57': '4aa84b5d-ffa4-4a1d-a2c7-7658c8254621',  # Skelanimals
-    '58': '94e17899-9b83-4b6f-a56a-d7fb61d4b74f',  # Miyo's Mystic Musings
-    '60': '4e2e0b59-4743-4937-b2fd-2e390151435a',  # Voltron
-    '61': '49b61eec-34e7-4f8f-b0b6-9af5c37ad625',  # Robotech
-    '62': 'ea2ad5e9-da36-4a74-9855-fffffdec94c1',  # Tulipop
-    '64': '4151ef87-a643-4e59-a1fa-f6dc5b3ad24b',  # Acid Rain World B2FIVE
-    '42': None,  # Shogun Warriors
-    '65': None,  # Mega Man
-}
+from seed_pipeline.brands import BRAND_MAPPING
+from seed_pipeline.sql import text_literal
 
 def escape_for_postgres(html_text):
-    """Use PostgreSQL dollar quoting for complex HTML"""
+    """Decode HTML entities and quote the HTML unchanged, in the cheapest safe form"""
     if not html_text or html_text == '':
         return 'NULL'
     
     # Decode HTML entities
     text = html.unescape(html_text)
     
-    # Use dollar quoting to avoid escaping issues
-    delimiter = '$$DESC$$'
-    counter = 1
-    while delimiter in text:
-        delimiter = f'$$DESC{counter}$$'
-        counter += 1
-    
-    return f"{delimiter}{text}{delimiter}"
+    return text_literal(text)
 
 def clean_text(text):
     """Clean plain text for SQL"""
     if text is None or text == '':
         return 'NULL'
-    text = str(text).replace("'", "''")
-    return f"'{text}'"
+    return text_literal(str(text))
 
 def clean_number(val):
     if val is None or val == '':
@@ -223,7 +198,7 @@ def main():
     print("✅ Fixed seed.sql with:")
     print(f"  - {len(products)} products with brand_id column")
     print(f"  - {products_with_brands} products linked to brands")
-    print("  - HTML descriptions using dollar quoting")
+    print("  - HTML descriptions quoted as is, dollar-quoted when they hold many single quotes")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
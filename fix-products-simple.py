@@ -1,27 +1,10 @@
 #!/usr/bin/env python3
-import csv
 import re
 import html
 
-# Brand mappings
-BRAND_MAPPING = {
-    '38': '7530230c-c28d-428e-8a5c-ccd476908c30',  # Acid Rain World
-    '39': 'bf9e0455-dcbd-49e4-b887-58d0120eda79',  # Mospeada
-    '40': '55edbf04-244d-49fc-abe6-114606068ef6',  # Futurama
-    '47': 'd9acfb7b-e561-4f39-9ab0-0cdc29c5ce34',  # Macross
-    '49': 'f3bd21c4-bb53-46a0-862f-7788d04395b6',  # Naruto
-    '50': '14ad8bae-5090-41f8-aa33-cdcf63c3284c',  # Sanrio
-    '54': '63e24c0a-dbe4-45a0-9b0d-ffc51b62f6d2',  # Emily the Strange
-    '55': '77c6dd4c-182b-487a-8216-8c8477d5c4b6',  # MILLINILLIONS
-    '57': '4aa84b5d-ffa4-4a1d-a2c7-7658c8254621',  # Skelanimals
-    '58': '94e17899-9b83-4b6f-a56a-d7fb61d4b74f',  # Miyo's Mystic Musings
-    '60': '4e2e0b59-4743-4937-b2fd-2e390151435a',  # Voltron
-    '61': '49b61eec-34e7-4f8f-b0b6-9af5c37ad625',  # Robotech
-    '62': 'ea2ad5e9-da36-4a74-9855-fffffdec94c1',  # Tulipop
-    '64': '4151ef87-a643-4e59-a1fa-f6dc5b3ad24b',  # Acid Rain World B2FIVE
-    '42': None,  # Shogun Warriors
-    '65': None,  # Mega Man
-}
+from seed_pipeline.brands import BRAND_MAPPING
+from seed_pipeline.reader import read_product_groups
+from seed_pipeline.sql import text_literal
 
 def clean_html_for_sql(html_text):
     """Clean HTML for regular SQL string (like the original seed)"""
@@ -36,17 +19,13 @@ def clean_html_for_sql(html_text):
     # Clean up whitespace
     text = ' '.join(text.split())
     
-    # Escape single quotes for SQL
-    text = text.replace("'", "''")
-    
-    return f"'{text}'"
+    return text_literal(text)
 
 def clean_text(text):
     """Clean plain text for SQL"""
     if text is None or text == '':
         return 'NULL'
-    text = str(text).replace("'", "''")
-    return f"'{text}'"
+    return text_literal(str(text))
 
 def clean_number(val):
     if val is None or val == '':
@@ -102,41 +81,39 @@ def main():
     products_with_brands = 0
     seen_ids = set()
     
-    with open('/Volumes/Projects2025/toynami-paypal/product_20250827_234649.csv', 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            product_id = row.get('ID', '').strip()
-            name = row.get('Name', '').strip()
-            
-            # Skip if no ID, no name, or duplicate
-            if not product_id or not name or product_id in seen_ids:
-                continue
-            
-            seen_ids.add(product_id)
-            
-            # Get brand
-            brand_id = row.get('Brand ID', '').strip()
-            brand_uuid = BRAND_MAPPING.get(brand_id) if brand_id else None
-            
-            if brand_uuid:
-                products_with_brands += 1
-            
-            # Build INSERT with brand_id column
-            slug = create_slug(name)
-            # Clean HTML by stripping tags
-            desc = clean_html_for_sql(row.get('Description', ''))
-            
-            # Fix inventory tracking value
-            inv_tracking = row.get('Inventory Tracking', '').strip()
-            if inv_tracking == 'product':
-                inv_tracking = 'by product'
-            elif inv_tracking == 'variant':
-                inv_tracking = 'by variant'
-            elif not inv_tracking or inv_tracking == 'none':
-                inv_tracking = 'none'
-            
-            # Build the INSERT statement - WITH brand_id as second column
-            insert = f"""INSERT INTO products (
+    for group in read_product_groups('/Volumes/Projects2025/toynami-paypal/product_20250827_234649.csv'):
+        product_id = group.product_id
+        name = group.get('Name', '').strip()
+        
+        # Skip if no ID, no name, or duplicate
+        if not product_id or not name or product_id in seen_ids:
+            continue
+        
+        seen_ids.add(product_id)
+        
+        # Get brand
+        brand_id = group.get('Brand ID', '').strip()
+        brand_uuid = BRAND_MAPPING.get(brand_id) if brand_id else None
+        
+        if brand_uuid:
+            products_with_brands += 1
+        
+        # Build INSERT with brand_id column
+        slug = create_slug(name)
+        # Clean HTML by stripping tags
+        desc = clean_html_for_sql(group.get('Description', ''))
+        
+        # Fix inventory tracking value
+        inv_tracking = group.get('Inventory Tracking', '').strip()
+        if inv_tracking == 'product':
+            inv_tracking = 'by product'
+        elif inv_tracking == 'variant':
+            inv_tracking = 'by variant'
+        elif not inv_tracking or inv_tracking == 'none':
+            inv_tracking = 'none'
+        
+        # Build the INSERT statement - WITH brand_id as second column
+        insert = f"""INSERT INTO products (
     id, brand_id, slug, name, description, sku, base_price_cents, weight, width, height, depth,
     condition, upc, is_visible, allow_purchases, status, track_inventory, stock_level,
     sort_order, meta_title, meta_description, meta_keywords, product_url, created_at,
@@ -155,46 +132,46 @@ def main():
     {clean_text(slug)},
     {clean_text(name)},
     {desc},
-    {clean_text(row.get('SKU', ''))},
-    {parse_price(row.get('Price', ''))},
-    {clean_number(row.get('Weight', ''))},
-    {clean_number(row.get('Width', ''))},
-    {clean_number(row.get('Height', ''))},
-    {clean_number(row.get('Depth', ''))},
+    {clean_text(group.get('SKU', ''))},
+    {parse_price(group.get('Price', ''))},
+    {clean_number(group.get('Weight', ''))},
+    {clean_number(group.get('Width', ''))},
+    {clean_number(group.get('Height', ''))},
+    {clean_number(group.get('Depth', ''))},
     'new',
-    {clean_text(row.get('UPC/EAN', ''))},
-    {'true' if row.get('Is Visible', 'true') != 'false' else 'false'},
+    {clean_text(group.get('UPC/EAN', ''))},
+    {'true' if group.get('Is Visible', 'true') != 'false' else 'false'},
     true,
     'active',
     {clean_text(inv_tracking)},
-    {clean_number(row.get('Current Stock', ''))},
+    {clean_number(group.get('Current Stock', ''))},
     0,
-    {clean_text(row.get('Page Title', ''))},
-    {clean_text(row.get('Meta Description', ''))},
-    {clean_text(row.get('Meta Keywords', '').replace(';', ','))},
-    {clean_text(row.get('Product URL', ''))},
+    {clean_text(group.get('Page Title', ''))},
+    {clean_text(group.get('Meta Description', ''))},
+    {clean_text(group.get('Meta Keywords', '').replace(';', ','))},
+    {clean_text(group.get('Product URL', ''))},
     NOW(),
     NULL,
     NULL,
-    {parse_price(row.get('Retail Price', ''))},
-    {parse_price(row.get('Sale Price', ''))},
-    {parse_price(row.get('Cost Price', ''))},
-    {parse_price(row.get('Price', ''))},
-    {parse_price(row.get('Fixed Shipping Cost', ''))},
-    {clean_number(row.get('Low Stock', ''))},
-    {clean_text(row.get('Bin Picking Number', ''))},
+    {parse_price(group.get('Retail Price', ''))},
+    {parse_price(group.get('Sale Price', ''))},
+    {parse_price(group.get('Cost Price', ''))},
+    {parse_price(group.get('Price', ''))},
+    {parse_price(group.get('Fixed Shipping Cost', ''))},
+    {clean_number(group.get('Low Stock', ''))},
+    {clean_text(group.get('Bin Picking Number', ''))},
     NULL,
     1,
     NULL,
-    {'true' if row.get('Free Shipping', 'false') == 'true' else 'false'},
+    {'true' if group.get('Free Shipping', 'false') == 'true' else 'false'},
     NULL,
-    {clean_text(row.get('Warranty', ''))},
+    {clean_text(group.get('Warranty', ''))},
     false,
-    {clean_text(row.get('Manufacturer Part Number', ''))},
-    {clean_text(row.get('Global Trade Number', ''))},
-    {clean_text(row.get('Tax Class', 'Default Tax Class'))},
+    {clean_text(group.get('Manufacturer Part Number', ''))},
+    {clean_text(group.get('Global Trade Number', ''))},
+    {clean_text(group.get('Tax Class', 'Default Tax Class'))},
     NULL,
-    {clean_text(row.get('Search Keywords', ''))},
+    {clean_text(group.get('Search Keywords', ''))},
     false,
     NULL,
     'Right',
@@ -211,7 +188,7 @@ def main():
     '2025-01-01',
     '2025-01-01'
 );"""
-            products.append(insert)
+        products.append(insert)
     
     print(f"Generated {len(products)} product INSERTs")
     print(f"  - {products_with_brands} products have brand associations")
@@ -231,7 +208,7 @@ def main():
     print(f"  - {len(products)} products with brand_id column")
     print(f"  - {products_with_brands} products linked to brands")
     print("  - HTML stripped to plain text (like original seed)")
-    print("  - Using standard SQL escaping (no dollar quotes)")
+    print("  - Using standard SQL quoting (dollar quotes only for text with many single quotes)")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
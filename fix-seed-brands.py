@@ -1,45 +1,8 @@
 #!/usr/bin/env python3
 import csv
 import re
-import sys
 
-# Brand ID mapping from BigCommerce to our database UUIDs
-BRAND_MAPPING = {
-    '38': '7530230c-c28d-428e-8a5c-ccd476908c30',  # Acid Rain World
-    '39': 'bf9e0455-dcbd-49e4-b887-58d0120eda79',  # Mospeada
-    '40': '55edbf04-244d-49fc-abe6-114606068ef6',  # Futurama
-    '42': None,  # Shogun Warriors - no brand in DB yet
-    '47': 'd9acfb7b-e561-4f39-9ab0-0cdc29c5ce34',  # Macross
-    '49': 'f3bd21c4-bb53-46a0-862f-7788d04395b6',  # Naruto
-    '50': '14ad8bae-5090-41f8-aa33-cdcf63c3284c',  # Sanrio
-    '54': '63e24c0a-dbe4-45a0-9b0d-ffc51b62f6d2',  # Emily the Strange
-    '55': '77c6dd4c-182b-487a-8216-8c8477d5c4b6',  # MILLINILLIONS
-    '57': '4aa84b5d-ffa4-4a1d-a2c7-7658c8254621',  # Skelanimals
-    '58': '94e17899-9b83-4b6f-a56a-d7fb61d4b74f',  # Miyo's Mystic Musings (Little Embers)
-    '60': '4e2e0b59-4743-4937-b2fd-2e390151435a',  # Voltron
-    '61': '49b61eec-34e7-4f8f-b0b6-9af5c37ad625',  # Robotech
-    '62': 'ea2ad5e9-da36-4a74-9855-fffffdec94c1',  # Tulipop
-    '64': '4151ef87-a643-4e59-a1fa-f6dc5b3ad24b',  # Acid Rain World B2FIVE
-    '65': None,  # Mega Man - no brand in DB yet
-}
-
-# Brand slug to UUID mapping (from the database export)
-BRAND_SLUG_TO_UUID = {
-    'acid-rain-world': '7530230c-c28d-428e-8a5c-ccd476908c30',
-    'acid-rain-world-b2five': '4151ef87-a643-4e59-a1fa-f6dc5b3ad24b',
-    'emily-the-strange': '63e24c0a-dbe4-45a0-9b0d-ffc51b62f6d2',
-    'futurama': '55edbf04-244d-49fc-abe6-114606068ef6',
-    'millinillions': '77c6dd4c-182b-487a-8216-8c8477d5c4b6',
-    'macross': 'd9acfb7b-e561-4f39-9ab0-0cdc29c5ce34',
-    'miyo-s-mystic-musings': '94e17899-9b83-4b6f-a56a-d7fb61d4b74f',
-    'mospeada': 'bf9e0455-dcbd-49e4-b887-58d0120eda79',
-    'naruto': 'f3bd21c4-bb53-46a0-862f-7788d04395b6',
-    'robotech': '49b61eec-34e7-4f8f-b0b6-9af5c37ad625',
-    'sanrio': '14ad8bae-5090-41f8-aa33-cdcf63c3284c',
-    'skelanimals': '4aa84b5d-ffa4-4a1d-a2c7-7658c8254621',
-    'tulipop': 'ea2ad5e9-da36-4a74-9855-fffffdec94c1',
-    'voltron': '4e2e0b59-4743-4937-b2fd-2e390151435a',
-}
+from seed_pipeline.brands import BRAND_MAPPING, with_brand_id
 
 def read_csv_products(csv_file):
     """Read products from BigCommerce CSV and extract ID to Brand ID mapping"""
@@ -81,15 +44,11 @@ def fix_brand_inserts(content):
                 i += 1
                 next_line = lines[i]
                 
-                # Extract the slug from the VALUES line
-                slug_match = re.search(r"^\s*\('([^']+)'", next_line)
-                if slug_match:
-                    slug = slug_match.group(1)
-                    if slug in BRAND_SLUG_TO_UUID:
-                        uuid = BRAND_SLUG_TO_UUID[slug]
-                        # Add the UUID at the beginning of the VALUES
-                        next_line = re.sub(r"^\s*\('", f"    ('{uuid}', '", next_line)
-                        updated_count += 1
+                # Add the UUID at the beginning of the VALUES
+                fixed = with_brand_id(next_line)
+                if fixed is not None:
+                    next_line = fixed
+                    updated_count += 1
                 
                 new_lines.append(next_line)
         else:
@@ -1,279 +1,451 @@
 #!/usr/bin/env python3
-import csv
-import re
+import argparse
+import functools
 import json
-from datetime import datetime
-
-# Brand ID mappings
-BRAND_MAPPING = {
-    '38': '7530230c-c28d-428e-8a5c-ccd476908c30',  # Acid Rain World
-    '39': 'bf9e0455-dcbd-49e4-b887-58d0120eda79',  # Mospeada
-    '40': '55edbf04-244d-49fc-abe6-114606068ef6',  # Futurama
-    '42': None,  # Shogun Warriors - no brand
-    '47': 'd9acfb7b-e561-4f39-9ab0-0cdc29c5ce34',  # Macross
-    '49': 'f3bd21c4-bb53-46a0-862f-7788d04395b6',  # Naruto
-    '50': '14ad8bae-5090-41f8-aa33-cdcf63c3284c',  # Sanrio
-    '54': '63e24c0a-dbe4-45a0-9b0d-ffc51b62f6d2',  # Emily the Strange
-    '55': '77c6dd4c-182b-487a-8216-8c8477d5c4b6',  # MILLINILLIONS
-    '57': '4aa84b5d-ffa4-4a1d-a2c7-7658c8254621',  # Skelanimals
-    '58': '94e17899-9b83-4b6f-a56a-d7fb61d4b74f',  # Miyo's Mystic Musings
-    '60': '4e2e0b59-4743-4937-b2fd-2e390151435a',  # Voltron
-    '61': '49b61eec-34e7-4f8f-b0b6-9af5c37ad625',  # Robotech
-    '62': 'ea2ad5e9-da36-4a74-9855-fffffdec94c1',  # Tulipop
-    '64': '4151ef87-a643-4e59-a1fa-f6dc5b3ad24b',  # Acid Rain World B2FIVE
-    '65': None,  # Mega Man - no brand
-}
+import os
+import sys
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from itertools import chain
+
+from seed_pipeline.brands import BRAND_SLUGS, brand_rows
+from seed_pipeline.cache import DEFAULT_MAX_BYTES, DescriptionCache
+from seed_pipeline.categories import product_category_rows, render_product_categories
+from seed_pipeline.chunks import DEFAULT_SHARD_ROWS, INSERT_KINDS, ChunkWriter, chunk_name
+from seed_pipeline.media import hand_made_images
+from seed_pipeline.metrics import NullProfiler, StageProfiler
+from seed_pipeline.parallel import DEFAULT_CHUNK_SIZE, chunked, job_count, ordered_map
+from seed_pipeline.products import product_rows
+from seed_pipeline.reader import read_product_groups
+from seed_pipeline.render import DEFAULT_BATCH_SIZE, render_batched_inserts, render_copy, render_inserts
+from seed_pipeline.schema import foreign_keys
+from seed_pipeline.sinks import SinkError, is_compressed, open_sink, sink_path
+from seed_pipeline.splice import open_seed, replace, splice, write_chunks
+from seed_pipeline.tables import BRANDS, MEDIA_LIBRARY, PRODUCT_CATEGORIES, PRODUCT_VARIANTS, PRODUCTS
+from seed_pipeline.transform import (CHILD_TABLES, add_child_rows, description_overrides, init_worker,
+                                     transform_chunk)
+from seed_pipeline.validate import validate_file
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Products columns shown for --profile's slowest products
+_ID = PRODUCTS.columns.index('id')
+_NAME = PRODUCTS.columns.index('name')
+_DESCRIPTION = PRODUCTS.columns.index('description')
 
-BRAND_SLUGS = {
-    'acid-rain-world': '7530230c-c28d-428e-8a5c-ccd476908c30',
-    'acid-rain-world-b2five': '4151ef87-a643-4e59-a1fa-f6dc5b3ad24b',
-    'emily-the-strange': '63e24c0a-dbe4-45a0-9b0d-ffc51b62f6d2',
-    'futurama': '55edbf04-244d-49fc-abe6-114606068ef6',
-    'millinillions': '77c6dd4c-182b-487a-8216-8c8477d5c4b6',
-    'macross': 'd9acfb7b-e561-4f39-9ab0-0cdc29c5ce34',
-    'miyo-s-mystic-musings': '94e17899-9b83-4b6f-a56a-d7fb61d4b74f',
-    'mospeada': 'bf9e0455-dcbd-49e4-b887-58d0120eda79',
-    'naruto': 'f3bd21c4-bb53-46a0-862f-7788d04395b6',
-    'robotech': '49b61eec-34e7-4f8f-b0b6-9af5c37ad625',
-    'sanrio': '14ad8bae-5090-41f8-aa33-cdcf63c3284c',
-    'skelanimals': '4aa84b5d-ffa4-4a1d-a2c7-7658c8254621',
-    'tulipop': 'ea2ad5e9-da36-4a74-9855-fffffdec94c1',
-    'voltron': '4e2e0b59-4743-4937-b2fd-2e390151435a',
+RENDERERS = {
+    'insert': render_inserts,
+    'batched': render_batched_inserts,
+    'copy': render_copy,
 }
 
-def clean_text(text):
-    """Clean text for SQL insertion"""
-    if text is None or text == '':
-        return 'NULL'
-    # Escape single quotes
-    text = text.replace("'", "''")
-    return f"'{text}'"
-
-def clean_number(val):
-    """Clean numeric value"""
-    if val is None or val == '':
-        return 'NULL'
-    try:
-        return str(val)
-    except:
-        return 'NULL'
-
-def clean_boolean(val):
-    """Convert to boolean"""
-    if val in ['true', 'True', '1', True, 1]:
-        return 'true'
-    elif val in ['false', 'False', '0', False, 0]:
-        return 'false'
-    return 'false'
-
-def parse_price(price_str):
-    """Parse price to cents"""
-    if not price_str or price_str == '':
-        return 'NULL'
-    try:
-        # Remove $ and commas
-        price_str = price_str.replace('$', '').replace(',', '')
-        price = float(price_str)
-        return str(int(price * 100))
-    except:
-        return 'NULL'
-
-def create_slug(name):
-    """Create URL slug from name"""
-    slug = name.lower()
-    slug = re.sub(r'[^a-z0-9]+', '-', slug)
-    slug = slug.strip('-')
-    return slug
-
-def extract_product_images(seed_file, product_id):
-    """Extract image data for a product from existing seed"""
-    # This would need to parse the existing seed for image relationships
-    # For now, return empty - we'll preserve existing image structure
-    return []
-
-def read_csv_products(csv_file):
-    """Read products from BigCommerce CSV"""
-    products = []
-    
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            product_id = row.get('ID', '').strip()
-            if not product_id:
-                continue
-                
-            # Get brand UUID
-            brand_id = row.get('Brand ID', '').strip()
-            brand_uuid = BRAND_MAPPING.get(brand_id) if brand_id else None
-            
-            # Parse product data
-            product = {
-                'id': product_id,
-                'brand_id': f"'{brand_uuid}'" if brand_uuid else 'NULL',
-                'slug': clean_text(create_slug(row.get('Name', ''))),
-                'name': clean_text(row.get('Name', '')),
-                'description': clean_text(row.get('Description', '')),
-                'sku': clean_text(row.get('SKU', '')),
-                'base_price_cents': parse_price(row.get('Price', '')),
-                'weight': clean_number(row.get('Weight', '')),
-                'width': clean_number(row.get('Width', '')),  
-                'height': clean_number(row.get('Height', '')),
-                'depth': clean_number(row.get('Depth', '')),
-                'condition': "'new'",
-                'upc': clean_text(row.get('UPC/EAN', '')),
-                'is_visible': clean_boolean(row.get('Is Visible', 'true')),
-                'allow_purchases': 'true',
-                'status': "'active'",
-                'track_inventory': clean_text(row.get('Inventory Tracking', '')),
-                'stock_level': clean_number(row.get('Current Stock', '')),
-                'sort_order': '0',
-                'meta_title': clean_text(row.get('Page Title', '')),
-                'meta_description': clean_text(row.get('Meta Description', '')),
-                'meta_keywords': clean_text(row.get('Meta Keywords', '')),
-                'product_url': clean_text(row.get('Product URL', '')),
-                'created_at': 'NOW()',
-                'preorder_release_date': 'NULL',
-                'preorder_message': 'NULL',
-                'retail_price_cents': parse_price(row.get('Retail Price', '')),
-                'sale_price_cents': parse_price(row.get('Sale Price', '')),
-                'cost_price_cents': parse_price(row.get('Cost Price', '')),
-                'calculated_price_cents': parse_price(row.get('Price', '')),
-                'fixed_shipping_price_cents': parse_price(row.get('Fixed Shipping Cost', '')),
-                'low_stock_level': clean_number(row.get('Low Stock', '')),
-                'bin_picking_number': clean_text(row.get('Bin Picking Number', '')),
-                'product_availability': 'NULL',
-                'min_purchase_quantity': '1',
-                'max_purchase_quantity': 'NULL',
-                'free_shipping': clean_boolean(row.get('Free Shipping', 'false')),
-                'brand_plus_name': 'NULL',
-                'warranty': clean_text(row.get('Warranty', '')),
-                'show_product_condition': 'false',
-                'manufacturer_part_number': clean_text(row.get('Manufacturer Part Number', '')),
-                'global_trade_item_number': clean_text(row.get('Global Trade Number', '')),
-                'tax_class': clean_text(row.get('Tax Class', 'Default Tax Class')),
-                'tax_provider_tax_code': 'NULL',
-                'search_keywords': clean_text(row.get('Search Keywords', '')),
-                'redirect_old_url': 'false',
-                'option_set': 'NULL',
-                'option_set_align': "'Right'",
-                'stop_processing_rules': 'false',
-                'product_custom_fields': 'NULL',
-                'event_date_required': 'false',
-                'event_date_name': 'NULL',
-                'event_date_is_limited': 'false',
-                'event_date_start_date': 'NULL',
-                'event_date_end_date': 'NULL',
-                'myob_asset_acct': 'NULL',
-                'myob_income_acct': 'NULL',
-                'myob_expense_acct': 'NULL',
-                'date_added': "'06/20/2025'",
-                'date_modified': "'06/20/2025'"
-            }
-            
-            products.append(product)
-    
-    return products
-
-def generate_product_inserts(products):
-    """Generate INSERT statements for products"""
-    columns = [
-        'id', 'brand_id', 'slug', 'name', 'description', 'sku', 'base_price_cents',
-        'weight', 'width', 'height', 'depth', 'condition', 'upc', 'is_visible',
-        'allow_purchases', 'status', 'track_inventory', 'stock_level', 'sort_order',
-        'meta_title', 'meta_description', 'meta_keywords', 'product_url', 'created_at',
-        'preorder_release_date', 'preorder_message', 'retail_price_cents', 'sale_price_cents',
-        'cost_price_cents', 'calculated_price_cents', 'fixed_shipping_price_cents',
-        'low_stock_level', 'bin_picking_number', 'product_availability',
-        'min_purchase_quantity', 'max_purchase_quantity', 'free_shipping', 'brand_plus_name',
-        'warranty', 'show_product_condition', 'manufacturer_part_number',
-        'global_trade_item_number', 'tax_class', 'tax_provider_tax_code', 'search_keywords',
-        'redirect_old_url', 'option_set', 'option_set_align', 'stop_processing_rules',
-        'product_custom_fields', 'event_date_required', 'event_date_name',
-        'event_date_is_limited', 'event_date_start_date', 'event_date_end_date',
-        'myob_asset_acct', 'myob_income_acct', 'myob_expense_acct', 'date_added', 'date_modified'
-    ]
-    
-    inserts = []
-    for product in products:
-        values = []
-        for col in columns:
-            values.append(f"    {product.get(col, 'NULL')}")
-        
-        insert = f"""INSERT INTO products (
-    {', '.join(columns)}
-) VALUES (
-{',\n'.join(values)}
-);"""
-        inserts.append(insert)
-    
-    return '\n'.join(inserts)
-
-def generate_brand_inserts():
-    """Generate brand INSERT statements with explicit UUIDs"""
-    inserts = []
-    
-    # Add brands from BRAND_SLUGS
-    for slug, uuid in BRAND_SLUGS.items():
-        # Determine brand properties based on slug
-        name = slug.replace('-', ' ').title()
-        if slug == 'millinillions':
-            name = 'MILLINILLIONS'
-        elif slug == 'miyo-s-mystic-musings':
-            name = "Miyo's Mystic Musings"
-        elif slug == 'acid-rain-world-b2five':
-            name = 'Acid Rain World B2FIVE'
-        
-        insert = f"INSERT INTO brands (id, slug, name, is_active) VALUES ('{uuid}', '{slug}', '{name}', true);"
-        inserts.append(insert)
-    
-    return '\n'.join(inserts)
+
+def counted(groups, stats):
+    """Count ProductGroups as they stream past"""
+    for group in groups:
+        stats['products'] += 1
+        yield group
+
+
+def collect_children(groups, children, unmapped=None):
+    """Pass ProductGroups through, appending their child table rows to ``children``
+
+    Children are written after all products (product_variants.product_id
+    references products.id), so they are held back while the products
+    stream out. ``children`` maps table names to row lists; category
+    links go under product_categories as (product_id, slug) pairs.
+    """
+    links = children[PRODUCT_CATEGORIES.name]
+    for group in groups:
+        if group.variants or group.images:
+            add_child_rows((group,), children)
+        links.extend(product_category_rows((group,), unmapped))
+        yield group
+
+
+def product_label(row):
+    """What --profile reports about one of the slowest products"""
+    description = row[_DESCRIPTION]
+    return {'id': row[_ID], 'name': row[_NAME], 'description_chars': len(description) if description else 0}
+
+
+def profiled_groups(csv_file, profiler):
+    """read_product_groups with CSV parsing and grouping charged to their own stages"""
+    return profiler.timed('group', read_product_groups(csv_file, functools.partial(profiler.timed, 'read')))
+
+
+def read_csv_products(csv_file, stats, cache=None, children=None, profiler=None):
+    """Stream products rows from a BigCommerce CSV"""
+    profiler = profiler or NullProfiler()
+    groups = counted(profiled_groups(csv_file, profiler), stats)
+    if children is not None:
+        groups = collect_children(groups, children, stats['unmapped categories'])
+    return profiler.timed('clean', product_rows(groups, description_overrides(cache)), label=product_label)
+
+
+def read_csv_products_parallel(csv_file, stats, cache, children, jobs, chunk_size=DEFAULT_CHUNK_SIZE,
+                               profiler=None):
+    """read_csv_products with the per-product work spread over ``jobs`` processes
+
+    Chunks come back in export order, so rows (and the rendered seed)
+    are the same as a serial run. Under --profile the clean stage is the
+    time spent waiting for workers, and products are not timed one by one.
+    """
+    profiler = profiler or NullProfiler()
+    return profiler.timed('clean', _transform_parallel(csv_file, stats, cache, children, jobs, chunk_size, profiler))
+
+
+def _transform_parallel(csv_file, stats, cache, children, jobs, chunk_size, profiler):
+    chunks = chunked(profiled_groups(csv_file, profiler), chunk_size)
+    cache_path = cache.path if cache is not None else None
+    for rows, chunk_children, unmapped, pending in ordered_map(transform_chunk, chunks, jobs,
+                                                               init_worker, (cache_path,)):
+        stats['products'] += len(rows)
+        stats['unmapped categories'].update(unmapped)
+        for name, child_rows in chunk_children.items():
+            children[name].extend(child_rows)
+        if pending is not None:
+            cache.merge(pending)
+        yield from rows
+
+
+def timed_renderer(render, profiler):
+    """``render`` with its work charged to the render stage"""
+    def timed(table, rows, **options):
+        return profiler.timed('render', render(table, rows, **options), rows=False)
+    return timed
+
+
+def banner(title):
+    """Section marker as seed_index and splice_seed look for it"""
+    return f"-- ======================================\n-- {title}\n-- ======================================\n"
+
+
+def render_children(render, children):
+    """Yield each child table's section banner and rows"""
+    for table, title in CHILD_TABLES:
+        yield '\n' + banner(title)
+        yield from render(table, children[table.name])
+
+
+def render_categories(children):
+    """Yield the product categories banner and its single INSERT ... SELECT"""
+    yield banner('🔗 Product Categories')
+    yield from render_product_categories(children[PRODUCT_CATEGORIES.name])
+
+
+def generated_chunks(render, products, children, shard_rows, categories):
+    """(name, pieces, tables, rows) of each generated chunk, in load order
+
+    Products are rendered ``shard_rows`` at a time. Child rows are only
+    complete once every product has been read, so each tuple is built
+    just before it is written. ``categories`` is the product categories
+    chunk, or None when it goes elsewhere.
+    """
+    brands = list(brand_rows())
+    yield 'brands', chain([banner('🏢 Brands')], render(BRANDS, brands)), [BRANDS.name], len(brands)
+    for number, shard in enumerate(chunked(products, shard_rows), 1):
+        pieces = chain([banner(f'🛍️ Products ({number})')], render(PRODUCTS, shard))
+        yield f'products-{number:04d}', pieces, [PRODUCTS.name], len(shard)
+    for table, title in CHILD_TABLES:
+        rows = children[table.name]
+        yield chunk_name(title), chain([banner(title)], render(table, rows)), [table.name], len(rows)
+    if categories is not None:
+        yield categories_chunk(categories, children)
+
+
+def categories_chunk(pieces, children):
+    return 'product-categories', pieces, [PRODUCT_CATEGORIES.name], len(children[PRODUCT_CATEGORIES.name])
+
+
+def section_pieces(data, start, end, replacements):
+    """data[start:end] with the replacements that fall inside it applied"""
+    pos = start
+    for replacement in sorted(replacements, key=lambda r: r.start):
+        if start <= replacement.start and replacement.end <= end:
+            yield data[pos:replacement.start]
+            yield from replacement.chunks
+            pos = replacement.end
+    yield data[pos:end]
+
+
+def write_seed_directory(writer, data, index, generated, categories, removals):
+    """Write the base seed section by section, generated chunks in place of Products
+
+    ``categories()`` builds the product categories chunk, written where
+    the base seed's Product Categories section was if it has one (only
+    then are all category links known). ``removals`` are the
+    hand_made_images replacements. Sections without statements (banners
+    only) are left out.
+    """
+    products_section = index.section('🛍️ Products')
+    categories_section = index.section('Product Categories')
+    parts = [('preamble', 0, index.sections[0].start if index.sections else len(data))]
+    parts += [(section.name, section.start, section.end) for section in index.sections]
+    starts = [statement.start for statement in index.statements]
+    for title, start, end in parts:
+        if start == products_section.start:
+            for chunk in generated:
+                writer.add(*chunk)
+            continue
+        if categories_section is not None and start == categories_section.start:
+            writer.add(*categories())
+            continue
+        if any(r.start == start and r.end == end for r in removals):
+            continue
+        statements = index.statements[bisect_left(starts, start):bisect_left(starts, end)]
+        if not statements:
+            continue
+        tables = [statement.table for statement in statements if statement.table]
+        modifies = [statement.table for statement in statements
+                    if statement.table and statement.kind not in INSERT_KINDS]
+        writer.add(chunk_name(title), section_pieces(data, start, end, removals), tables, None, modifies)
+
+
+def print_category_stats(stats, children):
+    print(f"- {len(children[PRODUCT_CATEGORIES.name])} product category links")
+    unmapped = stats['unmapped categories']
+    if unmapped:
+        ids = ', '.join(sorted(unmapped, key=int))
+        print(f"- {sum(unmapped.values())} category assignments skipped (unmapped BigCommerce categories: {ids})")
+
+
+def check_output(*paths):
+    """Validate written seed files; exits non-zero if any statement is broken"""
+    statements = 0
+    issues = 0
+    for path in paths:
+        summary = validate_file(path)
+        statements += summary.statements
+        issues += len(summary.issues)
+        for issue in summary.issues[:20]:
+            print(f"❌ {os.path.basename(path)} line {issue.line}: {issue.kind}: {issue.message}")
+        if summary.issues:
+            print(f"Found {len(summary.issues)} issues in {path}")
+    if issues:
+        sys.exit(1)
+    print(f"✅ Validated {statements} statements" + (f" in {len(paths)} files" if len(paths) > 1 else ''))
+
+
+def write_manifest(writer, args):
+    path = writer.write_manifest(foreign_keys(args.migrations), format=args.format, upsert=args.upsert,
+                                 shard_rows=args.shard_rows)
+    print(f"✅ Wrote {len(writer.chunks)} chunks and {path}")
+
+
+def write_profile(path, profiler, args, stats, children):
+    """Count rendered rows, print the stage table and save the --profile report"""
+    rendered = len(BRAND_SLUGS) + stats['products'] + sum(len(rows) for rows in children.values())
+    profiler.count('render', rendered)
+    report = profiler.report()
+    print(f"Profile ({args.format}, {job_count(args.jobs)} jobs):")
+    for name, stage in report['stages'].items():
+        line = f"  {name:7} {stage['wall_seconds'] * 1000:10.1f} ms wall {stage['cpu_seconds'] * 1000:10.1f} ms cpu"
+        if stage.get('rows_per_second'):
+            line += f"  {stage['rows_per_second']:12,.0f} rows/s"
+        if stage.get('bytes'):
+            line += f"  {stage['bytes'] / 1024 / 1024:8.1f} MB"
+        print(line)
+    for product in report['slowest'][:3]:
+        print(f"  slow: {product['id']} {product['name']} ({product['description_chars']:,} chars, "
+              f"{product['seconds'] * 1000:.1f} ms)")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'csv': os.path.relpath(args.csv, ROOT),
+            'output': (os.path.relpath(args.output_dir or args.output, ROOT)
+                       if args.output_dir or sink_path(args.output) else args.output),
+            'format': args.format,
+            'upsert': args.upsert,
+            'jobs': job_count(args.jobs),
+            'cache': not args.no_cache,
+            'products': stats['products'],
+            'total': report['total'],
+            'stages': report['stages'],
+            'slowest_products': report['slowest'],
+        }, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    print(f"✅ Saved profile to {path}")
+
+
+def print_cache_stats(cache):
+    lookups = cache.hits + cache.misses
+    rate = cache.hits / lookups * 100 if lookups else 0
+    print(f"- description cache: {cache.hits} hits, {cache.misses} misses ({rate:.0f}% hit rate)"
+          + (f", {cache.evicted} evicted" if cache.evicted else ''))
+
 
 def main():
-    # Read products from CSV
-    print("Reading products from CSV...")
-    products = read_csv_products('/Volumes/Projects2025/toynami-paypal/product_20250827_234649.csv')
-    print(f"Found {len(products)} products")
-    
-    # Generate brand INSERTs
-    print("Generating brand INSERTs...")
-    brand_sql = generate_brand_inserts()
-    
-    # Generate product INSERTs
-    print("Generating product INSERTs...")
-    product_sql = generate_product_inserts(products)
-    
-    # Read the existing seed for non-product data
+    parser = argparse.ArgumentParser(description='Generate seed SQL from a BigCommerce export')
+    parser.add_argument('--csv', default=os.path.join(ROOT, 'product_20250827_234649.csv'))
+    parser.add_argument('--base-seed', default=os.path.join(ROOT, 'supabase/seed.sql.old-before-brands'))
+    parser.add_argument('--output', default=os.path.join(ROOT, 'supabase/seed_generated.sql'),
+                        help='file (.gz and .zst are compressed), - for stdout, or psql:<connection string> '
+                             'to load the seed while it is generated')
+    parser.add_argument('--output-dir', help='write numbered per-table chunk files and a manifest.json '
+                                             'to this directory instead of --output')
+    parser.add_argument('--shard-rows', type=int, default=DEFAULT_SHARD_ROWS,
+                        help='products per chunk file with --output-dir')
+    parser.add_argument('--migrations', default=os.path.join(ROOT, 'supabase/migrations'),
+                        help='schema whose foreign keys order the --output-dir manifest')
+    parser.add_argument('--format', choices=sorted(RENDERERS), default='insert',
+                        help='insert: one INSERT per row; batched: multi-row INSERTs; '
+                             'copy: COPY ... FROM stdin blocks (load with psql)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='rows per statement for --format batched')
+    parser.add_argument('--upsert', action='store_true',
+                        help='write only brands, products, variants, product images and category links as ON CONFLICT '
+                             'DO UPDATE statements, '
+                             'without the base seed and its TRUNCATE preamble')
+    parser.add_argument('--cache', default=os.path.join(ROOT, '.cache/descriptions.sqlite'),
+                        help='on-disk cache of cleaned descriptions')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024)
+    parser.add_argument('--no-cache', action='store_true', help='clean every description from scratch')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='worker processes for the per-product transform (0: one per CPU); '
+                             'output is identical to --jobs 1')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='products handed to a worker at a time')
+    parser.add_argument('--validate', action='store_true',
+                        help='check the written seed statement by statement (see validate-seed.py)')
+    parser.add_argument('--profile', nargs='?', const=os.path.join(ROOT, '.cache/profile/generate-clean-seed.json'),
+                        metavar='REPORT', help='time each stage and write a JSON report '
+                                               '(default: .cache/profile/generate-clean-seed.json)')
+    parser.add_argument('--profile-top', type=int, default=10, help='slowest products to keep in the profile')
+    args = parser.parse_args()
+    if args.shard_rows < 1:
+        parser.error('--shard-rows must be at least 1')
+    if args.output_dir:
+        args.output = None
+    elif args.validate and (sink_path(args.output) is None or is_compressed(args.output)):
+        parser.error('--validate needs an uncompressed --output file')
+    if args.output == '-':
+        # The seed goes to stdout (see seed_pipeline.sinks); progress goes to stderr
+        sys.stdout = sys.stderr
+    profiler = StageProfiler(args.profile_top) if args.profile else NullProfiler()
+    profiler.start()
+    render = RENDERERS[args.format]
+    if args.format == 'batched':
+        render = functools.partial(render, batch_size=args.batch_size)
+    if args.upsert:
+        if args.format == 'copy':
+            parser.error('--upsert needs --format insert or batched')
+        render = functools.partial(render, upsert=True)
+    if args.profile:
+        render = timed_renderer(render, profiler)
+    stats = {'products': 0, 'unmapped categories': Counter()}
+    children = {table.name: [] for table, _ in CHILD_TABLES}
+    children[PRODUCT_CATEGORIES.name] = []
+    cache = None
+    if not args.no_cache:
+        cache = DescriptionCache(args.cache, int(args.cache_max_mb * 1024 * 1024))
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    jobs = job_count(args.jobs)
+    if jobs > 1:
+        products = read_csv_products_parallel(args.csv, stats, cache, children, jobs, args.chunk_size, profiler)
+    else:
+        products = read_csv_products(args.csv, stats, cache, children, profiler)
+
+    if args.upsert and args.output_dir:
+        print(f"Writing {args.format} upsert chunks to {args.output_dir}...")
+        writer = ChunkWriter(args.output_dir, profiler.writer)
+        categories = profiler.timed('render', render_product_categories(children[PRODUCT_CATEGORIES.name],
+                                                                        upsert=True), rows=False)
+        for chunk in generated_chunks(render, products, children, args.shard_rows, categories):
+            writer.add(*chunk)
+        write_manifest(writer, args)
+    elif args.upsert:
+        print(f"Writing {args.format} upserts to {args.output}...")
+        with open_sink(args.output) as f:
+            out = profiler.writer(f)
+            write_chunks(out, render(BRANDS, brand_rows()))
+            write_chunks(out, render(PRODUCTS, products))
+            for table, _ in CHILD_TABLES:
+                write_chunks(out, render(table, children[table.name]))
+            write_chunks(out, profiler.timed('render', render_product_categories(children[PRODUCT_CATEGORIES.name],
+                                                                                 upsert=True), rows=False))
+    if args.upsert:
+        print(f"Generated {args.output_dir or args.output}")
+        print(f"- {len(BRAND_SLUGS)} brand upserts")
+        print(f"- {stats['products']} product upserts")
+        print(f"- {len(children[PRODUCT_VARIANTS.name])} variant upserts")
+        print(f"- {len(children[MEDIA_LIBRARY.name])} product image upserts")
+        print_category_stats(stats, children)
+        if cache is not None:
+            cache.close()
+            print_cache_stats(cache)
+        if args.profile:
+            write_profile(args.profile, profiler, args, stats, children)
+        if args.validate:
+            check_output(*(writer.paths() if args.output_dir else [args.output]))
+        return
+
+    # Map the existing seed for non-product data
     print("Reading existing seed for structure...")
-    with open('/Volumes/Projects2025/toynami-paypal/supabase/seed.sql.old-before-brands', 'r') as f:
-        existing_seed = f.read()
-    
-    # Extract everything before products
-    before_products = existing_seed.split('-- ======================================\n-- 🛍️ Products')[0]
-    
-    # Extract everything after products (categories, etc)
-    after_products_match = re.search(r'(-- ======================================\n-- 📁 Categories.*)', existing_seed, re.DOTALL)
-    after_products = after_products_match.group(1) if after_products_match else ''
-    
-    # Combine everything
-    final_seed = f"""{before_products}-- ======================================
--- 🏢 Brands
--- ======================================
-{brand_sql}
-
--- ======================================
--- 🛍️ Products  
--- ======================================
-{product_sql}
-
-{after_products}"""
-    
-    # Write final seed
-    with open('/Volumes/Projects2025/toynami-paypal/supabase/seed_generated.sql', 'w') as f:
-        f.write(final_seed)
-    
-    print("Generated seed_generated.sql")
+    with ExitStack() as stack:
+        with profiler.stage('splice'):
+            existing_seed, index = stack.enter_context(open_seed(args.base_seed))
+        products_section = index.section('🛍️ Products')
+        if products_section is None:
+            parser.error(f'no Products section in {args.base_seed}')
+        # Category links replace the base seed's per-row INSERT ... SELECTs
+        # where they were, or follow the child tables if it had none
+        categories_section = index.section('Product Categories')
+        categories = profiler.timed('render', render_categories(children), rows=False)
+        replacements = []
+        if categories_section is not None:
+            replacements.append(replace(categories_section, categories, ['\n']))
+
+        if args.output_dir:
+            print(f"Writing {args.format} chunks to {args.output_dir}...")
+            writer = ChunkWriter(args.output_dir, profiler.writer)
+            with profiler.stage('splice'):
+                write_seed_directory(
+                    writer, existing_seed, index,
+                    generated_chunks(render, products, children, args.shard_rows,
+                                     categories if categories_section is None else None),
+                    lambda: categories_chunk(categories, children), hand_made_images(existing_seed, index))
+            write_manifest(writer, args)
+        else:
+            # Everything before and after the products section (categories, etc)
+            # is copied through unchanged
+            print(f"Writing {args.format} output to {args.output}...")
+            with open_sink(args.output) as out, profiler.stage('splice'):
+                splice(existing_seed, [replace(
+                    products_section,
+                    [banner('🏢 Brands')],
+                    render(BRANDS, brand_rows()),
+                    ['\n' + banner('🛍️ Products')],
+                    render(PRODUCTS, products),
+                    render_children(render, children),
+                    ['\n'],
+                    categories if categories_section is None else [],
+                )] + replacements + hand_made_images(existing_seed, index), profiler.writer(out))
+
+    print(f"Generated {args.output_dir or args.output}")
     print(f"- {len(BRAND_SLUGS)} brands with explicit UUIDs")
-    print(f"- {len(products)} products with brand_ids")
+    print(f"- {stats['products']} products with brand_ids")
+    print(f"- {len(children[PRODUCT_VARIANTS.name])} product variants")
+    print(f"- {len(children[MEDIA_LIBRARY.name])} product images")
+    print_category_stats(stats, children)
+    if cache is not None:
+        cache.close()
+        print_cache_stats(cache)
+    if args.profile:
+        write_profile(args.profile, profiler, args, stats, children)
+    if args.validate:
+        check_output(*(writer.paths() if args.output_dir else [args.output]))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    try:
+        main()
+    except SinkError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
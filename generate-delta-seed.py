@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import argparse
+import os
+
+from seed_pipeline.categories import (PRODUCT_CATEGORY_LINKS, render_product_categories,
+                                     render_product_category_deletes)
+from seed_pipeline.delta import diff_exports
+from seed_pipeline.render import DEFAULT_BATCH_SIZE, render_batched_inserts, render_deletes, render_updates
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def render_delta(tables, batch_size):
+    """Yield the delta as one transaction
+
+    Deletes run children first, inserts and updates parents first, so
+    foreign keys hold after every statement. Category links are written
+    by slug and have no columns to update.
+    """
+    yield 'BEGIN;\n'
+    for delta in reversed(tables):
+        if delta.deletes:
+            yield f'\n-- {delta.table.name}: {len(delta.deletes)} removed\n'
+            if delta.table is PRODUCT_CATEGORY_LINKS:
+                yield from render_product_category_deletes(delta.deletes, batch_size)
+            else:
+                yield from render_deletes(delta.table, delta.deletes, batch_size)
+    for delta in tables:
+        if delta.inserts:
+            yield f'\n-- {delta.table.name}: {len(delta.inserts)} added\n'
+            if delta.table is PRODUCT_CATEGORY_LINKS:
+                yield from render_product_categories(delta.inserts)
+            else:
+                yield from render_batched_inserts(delta.table, delta.inserts, batch_size)
+        if delta.updates:
+            yield f'\n-- {delta.table.name}: {len(delta.updates)} changed\n'
+            yield from render_updates(delta.table, delta.updates)
+    yield '\nCOMMIT;\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate seed SQL for the changes between two BigCommerce exports')
+    parser.add_argument('--old', default=os.path.join(ROOT, 'product_20250827_234649.csv'),
+                        help='export the database was last seeded from')
+    parser.add_argument('--new', required=True, help='newer export')
+    parser.add_argument('--output', default=os.path.join(ROOT, 'supabase/seed_delta.sql'))
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='rows per INSERT / keys per DELETE')
+    args = parser.parse_args()
+
+    print(f"Comparing {args.old} -> {args.new}...")
+    groups, tables = diff_exports(args.old, args.new)
+    print(f"- {len(groups.added)} added, {len(groups.changed)} changed, "
+          f"{len(groups.removed)} removed, {groups.unchanged} unchanged products")
+
+    with open(args.output, 'w') as out:
+        out.writelines(render_delta(tables, args.batch_size))
+
+    print(f"✅ Generated {args.output}")
+    for delta in tables:
+        print(f"- {delta.table.name}: {len(delta.inserts)} inserts, "
+              f"{len(delta.updates)} updates, {len(delta.deletes)} deletes")
+
+if __name__ == '__main__':
+    main()
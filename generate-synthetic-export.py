@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import time
+
+from seed_pipeline.synthetic import DEFAULT_SEED, DEFAULT_START_ID, write_export
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a reproducible synthetic BigCommerce export')
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help='same seed and options, same file')
+    parser.add_argument('--start-id', type=int, default=DEFAULT_START_ID,
+                        help='first product/variant/image ID (kept clear of real export IDs)')
+    parser.add_argument('--variant-rate', type=float, default=0.05, help='share of products with variants')
+    parser.add_argument('--images', type=float, default=4, help='mean images per product')
+    parser.add_argument('--video-rate', type=float, default=0.01, help='share of products with a video')
+    parser.add_argument('--output', help='default: .cache/synthetic/products-<N>-seed<S>.csv')
+    args = parser.parse_args()
+    if args.products < 0:
+        parser.error('--products must not be negative')
+
+    output = args.output or os.path.join(ROOT, f'.cache/synthetic/products-{args.products}-seed{args.seed}.csv')
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    start = time.perf_counter()
+    rows = write_export(output, args.products, seed=args.seed, start_id=args.start_id,
+                        variant_rate=args.variant_rate, images=args.images, video_rate=args.video_rate)
+    elapsed = time.perf_counter() - start
+    size_mb = os.path.getsize(output) / 1024 / 1024
+    print(f"✅ Wrote {args.products:,} products ({rows:,} rows, {size_mb:.1f} MB) to {output} in {elapsed:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import shutil
+import sys
+import time
+from contextlib import ExitStack
+
+from seed_pipeline.chunks import MANIFEST, read_manifest
+from seed_pipeline.parallel_load import (DEFAULT_SPLIT_BYTES, DEFAULT_STREAMS, directory_units, load_units, plan,
+                                         run_unit, seed_units, waves)
+from seed_pipeline.pgload import Cluster, LoadError, apply_migrations, pg_bin_dir
+from seed_pipeline.schema import foreign_keys
+from seed_pipeline.seed_index import read_seed_index
+from seed_pipeline.validate import validate_file
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def check_seed(path):
+    """Exit if ``path`` has issues: an unterminated literal would leave psql waiting instead of failing"""
+    summary = validate_file(path)
+    if summary.issues:
+        issue = summary.issues[0]
+        print(f"❌ {path} has {len(summary.issues)} issues, first at line {issue.line}: {issue.message}")
+        print("   Run validate-seed.py for the full list")
+        sys.exit(1)
+
+
+def open_units(source, migrations):
+    """Units for a seed file or a seed directory"""
+    if not os.path.isdir(source):
+        check_seed(source)
+        data, index = read_seed_index(source)
+        return seed_units(memoryview(data), index, foreign_keys(migrations))
+
+    def read(file):
+        path = os.path.join(source, file)
+        check_seed(path)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    return directory_units(read_manifest(source), read)
+
+
+def print_plan(units):
+    for number, wave in enumerate(waves(units), 1):
+        print(f"  wave {number}:")
+        for unit in wave:
+            # Parts of a split unit are listed once
+            depends_on = dict.fromkeys(name.split('#')[0] for name in unit.depends_on)
+            after = f"  after {', '.join(depends_on)}" if depends_on else ''
+            print(f"    {unit.name[:40]:40} {unit.bytes / 1024:10,.0f} KB{after}")
+
+
+def print_load(load):
+    rate = f"{load.rows / load.seconds:12,.0f} rows/s" if load.seconds and load.rows else ' ' * 19
+    print(f"  {load.name[:40]:40} {load.seconds * 1000:10.1f} ms  {load.rows:9,} rows  {rate}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load a seed file or seed directory over parallel connections, in foreign key order')
+    parser.add_argument('seed', nargs='?', default=os.path.join(ROOT, 'supabase/seed.sql'),
+                        help=f'seed file, or directory with a {MANIFEST} from generate-clean-seed.py --output-dir')
+    parser.add_argument('--db', help='connection string of the database to load (default: a throwaway cluster '
+                                     'with the migrations applied, as bench-seed-load.py uses)')
+    parser.add_argument('--migrations', default=os.path.join(ROOT, 'supabase/migrations'))
+    parser.add_argument('--pg-bin', help='PostgreSQL bin directory (default: initdb on PATH, then pg_config --bindir)')
+    parser.add_argument('--port', type=int, default=54329, help='port of the throwaway cluster')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_STREAMS, help='connections loading at once')
+    parser.add_argument('--streams', type=int, help='parallel parts for large single-table units (default: --jobs)')
+    parser.add_argument('--split-mb', type=float, default=DEFAULT_SPLIT_BYTES / 1024 / 1024,
+                        help='split units at least this large into --streams parts')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        help='session setting for every connection, e.g. --set synchronous_commit=off (repeatable)')
+    parser.add_argument('--dry-run', action='store_true', help='print the load plan without connecting')
+    args = parser.parse_args()
+
+    try:
+        units = open_units(args.seed, args.migrations)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    units = plan(units, args.streams or args.jobs, int(args.split_mb * 1024 * 1024))
+    print(f"Plan for {args.seed}: {len(units)} units")
+    print_plan(units)
+    if args.dry_run:
+        return
+
+    with ExitStack() as stack:
+        if args.db:
+            psql = os.path.join(args.pg_bin, 'psql') if args.pg_bin else shutil.which('psql')
+            if not psql:
+                print("❌ psql not found on PATH; pass --pg-bin")
+                sys.exit(1)
+            psql_args = [psql, '-X', '-v', 'ON_ERROR_STOP=1', '-d', args.db]
+        else:
+            try:
+                bin_dir = pg_bin_dir(args.pg_bin)
+            except FileNotFoundError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            cluster = stack.enter_context(Cluster(bin_dir, port=args.port))
+            print(f"Started PostgreSQL {cluster.server_version()} in {cluster.root}")
+            try:
+                apply_migrations(cluster, args.migrations)
+            except LoadError as e:
+                print(f"❌ Migration failed: {e}")
+                sys.exit(1)
+            print("✅ Applied migrations")
+            psql_args = cluster.psql_args()
+
+        print(f"Loading with {args.jobs} connections...")
+        start = time.perf_counter()
+        loads = []
+        try:
+            for load in load_units(units, lambda unit: run_unit(psql_args, unit, args.set), args.jobs):
+                loads.append(load)
+                print_load(load)
+        except LoadError as e:
+            print(f"❌ Load failed after {len(loads)} of {len(units)} units: {e}")
+            sys.exit(1)
+        seconds = time.perf_counter() - start
+
+    rows = sum(load.rows for load in loads)
+    busy = sum(load.seconds for load in loads)
+    print(f"✅ Loaded {rows:,} rows in {seconds:.2f}s ({busy:.2f}s of unit time, {busy / seconds:.1f}x overlap)")
+
+if __name__ == '__main__':
+    main()
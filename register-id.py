@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+import argparse
+
+from seed_pipeline.registry import REGISTRY_FILE, IdRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pin an id in the seed id registry')
+    parser.add_argument('entity', help="entity type, e.g. 'brand'")
+    parser.add_argument('key', help="natural key, e.g. a brand slug")
+    parser.add_argument('--id', help='existing UUID to pin (default: the derived uuid5)')
+    parser.add_argument('--none', action='store_true', help='pin the key to "no id"')
+    parser.add_argument('--bigcommerce-id', help='for brands: also map this BigCommerce Brand ID to the brand')
+    parser.add_argument('--registry', default=REGISTRY_FILE)
+    args = parser.parse_args()
+    if args.none and args.id:
+        parser.error('--none and --id are mutually exclusive')
+
+    ids = IdRegistry(args.registry)
+    try:
+        value = ids.pin(args.entity, args.key, '' if args.none else args.id)
+        if args.bigcommerce_id:
+            if args.entity != 'brand':
+                parser.error('--bigcommerce-id only applies to brands')
+            ids.pin('bigcommerce-brand', args.bigcommerce_id, value or '')
+    except ValueError as e:
+        parser.error(str(e))
+    ids.save()
+
+    print(f"✅ {args.entity} {args.key} -> {value or 'no id'}")
+    if args.bigcommerce_id:
+        print(f"✅ bigcommerce-brand {args.bigcommerce_id} -> {value or 'no id'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import argparse
+import mmap
+import os
+import re
+import sys
+import time
+
+from seed_pipeline.brands import brand_id_rewrites
+from seed_pipeline.rewrite import Rewriter
+from seed_pipeline.sinks import SinkError, open_sink, sink_path
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_ESCAPE = re.compile(r'\\(.)')
+_ESCAPED = {'t': '\t', 'n': '\n', '\\': '\\'}
+
+
+def unescape(text):
+    """Decode \\t, \\n and \\\\ in one pass, so \\\\t is a backslash and a t"""
+    return _ESCAPE.sub(lambda match: _ESCAPED.get(match.group(1), match.group()), text)
+
+
+def read_table(path):
+    """Substitutions from a file of pattern<TAB>replacement lines (\\t, \\n and \\\\ escapes; # comments)"""
+    table = {}
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.rstrip('\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            pattern, tab, replacement = line.partition('\t')
+            if not tab:
+                raise ValueError(f'{path} line {number}: no tab between pattern and replacement')
+            table[unescape(pattern)] = unescape(replacement)
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Apply a table of fixed-string substitutions to a seed in one pass, outside string literals')
+    parser.add_argument('seed', nargs='?', default=os.path.join(ROOT, 'supabase/seed.sql'))
+    parser.add_argument('--output', required=True,
+                        help='file (.gz and .zst are compressed), - for stdout, or psql:<connection string>')
+    parser.add_argument('--table', action='append', default=[],
+                        help='file of pattern<TAB>replacement lines (repeatable; later files win)')
+    parser.add_argument('--brand-ids', action='store_true',
+                        help="prepend each brand's id to its brands VALUES tuple, as the brand fix scripts do")
+    args = parser.parse_args()
+
+    if sink_path(args.output) and os.path.abspath(args.output) == os.path.abspath(args.seed):
+        print("❌ --output must not be the seed being read")
+        sys.exit(1)
+    if args.output == '-':
+        sys.stdout = sys.stderr
+
+    table = brand_id_rewrites() if args.brand_ids else {}
+    try:
+        for path in args.table:
+            table.update(read_table(path))
+        rewriter = Rewriter(table)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not table:
+        print("❌ No substitutions: pass --table or --brand-ids")
+        sys.exit(1)
+
+    print(f"Rewriting {args.seed} with {len(table)} substitutions...")
+    start = time.perf_counter()
+    with open(args.seed, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            data = b''
+        else:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            with open_sink(args.output) as out:
+                replaced = rewriter.rewrite(data, out)
+        except SinkError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        finally:
+            if data:
+                data.close()
+    elapsed = time.perf_counter() - start
+
+    for pattern, count in rewriter.counts.most_common():
+        print(f"  - {count:7,} x {pattern.decode('utf-8', 'replace')}")
+    print(f"✅ Made {replaced:,} replacements in {elapsed:.2f}s -> {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,3 @@
+"""Shared building blocks for turning BigCommerce exports into seed SQL"""
+from seed_pipeline.reader import ProductGroup, read_product_groups
+from seed_pipeline.render import render_copy, render_inserts
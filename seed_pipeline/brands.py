@@ -0,0 +1,59 @@
+"""Brand IDs shared by the seed generators, read from the id registry"""
+import re
+
+from seed_pipeline.registry import registry
+
+# BigCommerce Brand ID -> brands.id (None for brands with no brands row,
+# e.g. Shogun Warriors and Mega Man)
+BRAND_MAPPING = dict(registry().items('bigcommerce-brand'))
+
+# brands.slug -> brands.id
+BRAND_SLUGS = dict(registry().items('brand'))
+
+# The leading slug of a brands VALUES tuple: ('slug', 'Name', ...)
+_VALUES_SLUG = re.compile(r"\('([^']*)',")
+
+# Names that slug.title() gets wrong
+BRAND_NAMES = {
+    'emily-the-strange': 'Emily the Strange',
+    'millinillions': 'MILLINILLIONS',
+    'miyo-s-mystic-musings': "Miyo's Mystic Musings",
+    'acid-rain-world-b2five': 'Acid Rain World B2FIVE',
+}
+
+
+def brand_name(slug):
+    """Display name for a brand slug"""
+    return BRAND_NAMES.get(slug) or slug.replace('-', ' ').title()
+
+
+def brand_rows():
+    """Yield brands rows (id, slug, name, is_active)"""
+    for slug, uuid in BRAND_SLUGS.items():
+        yield (uuid, slug, brand_name(slug), True)
+
+
+def with_brand_id(values_line):
+    """A brands VALUES line with its id prepended, or None for unknown slugs
+
+    One regex match and a dict lookup instead of probing the line for
+    every known slug.
+    """
+    match = _VALUES_SLUG.search(values_line)
+    if match is None:
+        return None
+    uuid = BRAND_SLUGS.get(match.group(1))
+    if uuid is None:
+        return None
+    start = match.start()
+    return f"{values_line[:start]}('{uuid}', {values_line[start + 1:]}"
+
+
+def brand_id_rewrites():
+    """seed_pipeline.rewrite table that prepends the id to brands VALUES tuples
+
+    The whole-seed counterpart of with_brand_id: ('slug', ...) becomes
+    ('uuid', 'slug', ...) wherever it is SQL, but not where a description
+    or other literal happens to contain it.
+    """
+    return {f"('{slug}',": f"('{uuid}', '{slug}'," for slug, uuid in BRAND_SLUGS.items()}
@@ -0,0 +1,127 @@
+"""Persistent content-addressed cache for cleaned descriptions
+
+Most descriptions are unchanged from one BigCommerce export to the next,
+so cleaned output is stored in a small SQLite file keyed by
+sha256(cleaner name, cleaner version, raw text). Bumping a cleaner's
+version makes all of its old entries unreachable; they age out through
+the normal size-bounded eviction.
+
+Eviction is least-recently-used by run: every open starts a new
+generation, hits are stamped with it, and on close the oldest
+generations are dropped until the stored values fit in ``max_bytes``.
+"""
+import hashlib
+import os
+import sqlite3
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    key BLOB PRIMARY KEY,
+    value TEXT,
+    size INTEGER NOT NULL,
+    used INTEGER NOT NULL
+) WITHOUT ROWID
+'''
+
+
+def cache_key(name, version, raw):
+    """Digest identifying ``raw`` as cleaned by cleaner ``name`` at ``version``"""
+    digest = hashlib.sha256(f'{name}\0{version}\0'.encode('utf-8'))
+    digest.update(raw.encode('utf-8', 'surrogatepass'))
+    return digest.digest()
+
+
+class DescriptionCache:
+    """On-disk cache of cleaner output with hit/miss counters"""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._db = sqlite3.connect(path)
+        self._db.execute(_SCHEMA)
+        self.generation = self._db.execute('SELECT COALESCE(MAX(used), 0) + 1 FROM entries').fetchone()[0]
+        self._touched = []
+        self._added = []
+
+    def wrap(self, name, version, cleaner):
+        """Return ``cleaner`` memoised through the cache
+
+        Empty input is passed straight through: it is cheap to clean and
+        not worth a lookup.
+        """
+        lookup = self._db.execute
+
+        def cached(raw):
+            if not raw:
+                return cleaner(raw)
+            key = cache_key(name, version, raw)
+            row = lookup('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                self._touched.append((self.generation, key))
+                return row[0]
+            self.misses += 1
+            value = cleaner(raw)
+            size = len(value.encode('utf-8', 'surrogatepass')) if value else 0
+            self._added.append((key, value, size, self.generation))
+            return value
+
+        return cached
+
+    def pending(self):
+        """Take the counters and unwritten entries gathered since the last call
+
+        Worker processes hand these to the parent's cache (see merge)
+        instead of writing the file themselves.
+        """
+        pending = (self.hits, self.misses, self._touched, self._added)
+        self.hits = 0
+        self.misses = 0
+        self._touched = []
+        self._added = []
+        return pending
+
+    def merge(self, pending):
+        """Fold another instance's pending() into this one, stamped with our generation"""
+        hits, misses, touched, added = pending
+        self.hits += hits
+        self.misses += misses
+        self._touched.extend((self.generation, key) for _, key in touched)
+        self._added.extend((key, value, size, self.generation) for key, value, size, _ in added)
+
+    def close(self):
+        """Write new entries, refresh hit timestamps and evict down to max_bytes"""
+        with self._db:
+            self._db.executemany('UPDATE entries SET used = ? WHERE key = ?', self._touched)
+            self._db.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)', self._added)
+            self._evict()
+        self._db.close()
+        self._touched = []
+        self._added = []
+
+    def _evict(self):
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        stale = []
+        for key, size in self._db.execute('SELECT key, size FROM entries ORDER BY used, key'):
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._db.executemany('DELETE FROM entries WHERE key = ?', stale)
+        self.evicted = len(stale)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,91 @@
+"""Turn the export's Categories column into product_categories rows
+
+``Categories`` holds BigCommerce category IDs separated by ';'. They are
+resolved to category slugs here; the categories themselves come from
+the base seed and get their UUIDs from the column default, so the slug
+is the stable key. All assignments are written as one INSERT ... SELECT
+joining a VALUES list to categories, instead of one subquery per row;
+delta seeds remove links the same way.
+"""
+from itertools import islice
+
+from seed_pipeline.render import DEFAULT_BATCH_SIZE
+from seed_pipeline.sql import sql_literal
+from seed_pipeline.tables import PRODUCT_CATEGORIES, Table
+
+# BigCommerce category ID -> categories.slug
+CATEGORY_SLUGS = {
+    '24': 'products',
+    '25': 'new-products',
+    '26': 'the-archive',
+    '27': 'convention-exclusives',
+    '29': 'hidden',
+    '31': 'pre-orders',
+}
+
+# product_categories as the generators hold it: (product_id, slug) rows,
+# keyed by both, since category ids only exist in the database
+PRODUCT_CATEGORY_LINKS = Table(PRODUCT_CATEGORIES.name, ('product_id', 'slug'), ('product_id', 'slug'), ())
+
+
+def category_ids(val):
+    """BigCommerce category IDs of a Categories cell, in order"""
+    return [part.strip() for part in val.split(';') if part.strip()]
+
+
+def product_category_rows(groups, unmapped=None):
+    """Yield (product_id, category slug) pairs for each ProductGroup
+
+    IDs missing from CATEGORY_SLUGS are skipped and, when ``unmapped`` is
+    given (a Counter), counted there.
+    """
+    for group in groups:
+        product_id = int(group.product_id)
+        seen = set()
+        for category_id in category_ids(group.get('Categories')):
+            slug = CATEGORY_SLUGS.get(category_id)
+            if slug is None:
+                if unmapped is not None:
+                    unmapped[category_id] += 1
+                continue
+            if slug not in seen:
+                seen.add(slug)
+                yield (product_id, slug)
+
+
+def _linked_ids(values):
+    """SELECT of (product_id, category id) for a VALUES list of (product_id, slug)"""
+    return (f"SELECT v.product_id, c.id\n"
+            f"FROM (VALUES\n{values}\n) AS v (product_id, slug)\n"
+            f"JOIN categories c ON c.slug = v.slug")
+
+
+def _values(rows):
+    return ',\n'.join(f'    ({sql_literal(product_id)}, {sql_literal(slug)})' for product_id, slug in rows)
+
+
+def render_product_categories(rows, upsert=False):
+    """Yield a single INSERT ... SELECT linking products to categories by slug
+
+    Works for every output format: COPY cannot resolve slugs to ids, and
+    one statement is already one round trip.
+    """
+    values = _values(rows)
+    if not values:
+        return
+    suffix = f"\nON CONFLICT ({', '.join(PRODUCT_CATEGORIES.key)}) DO NOTHING" if upsert else ''
+    yield (f"INSERT INTO {PRODUCT_CATEGORIES.name} ({', '.join(PRODUCT_CATEGORIES.columns)})\n"
+           f"{_linked_ids(values)}{suffix};\n")
+
+
+def render_product_category_deletes(rows, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield DELETE statements unlinking (product_id, slug) pairs, ``batch_size`` per statement"""
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        yield (f"DELETE FROM {PRODUCT_CATEGORIES.name}\n"
+               f"WHERE ({', '.join(PRODUCT_CATEGORIES.columns)}) IN (\n{_linked_ids(_values(batch))}\n);\n")
@@ -0,0 +1,129 @@
+"""Seed directories: ordered per-table chunk files plus a manifest
+
+A seed directory holds ``NNN-<name>.sql`` files that, run in file order,
+load the same data as the single-file seed, and a ``manifest.json``
+listing each chunk's file, tables, row count, size, sha256 and the
+earlier chunks it depends on. The manifest has no timestamps, so an
+unchanged export regenerates it byte for byte and a changed chunk shows
+up as a changed hash.
+
+A chunk depends on an earlier chunk when
+- one of its tables has a foreign key to a table the earlier chunk
+  writes (see seed_pipeline.schema), or
+- either chunk truncates, updates or deletes from a table the other one
+  writes (the preamble's TRUNCATEs, the featured-products UPDATE).
+Chunks of the same table that only insert, such as products shards, are
+independent.
+"""
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+
+from seed_pipeline.validate import validate_file
+
+MANIFEST = 'manifest.json'
+
+DEFAULT_SHARD_ROWS = 5000
+
+# Statement kinds that only add rows
+INSERT_KINDS = frozenset(('INSERT', 'COPY'))
+
+Chunk = namedtuple('Chunk', 'file tables rows bytes sha256 modifies')
+
+_CHUNK_FILE = re.compile(r'^\d{3}-[\w-]+\.sql$')
+
+
+def chunk_name(title):
+    """File name part for a section title ('🛍️ Products' -> 'products')"""
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-') or 'section'
+
+
+def chunk_dependencies(chunks, references):
+    """Files each chunk depends on, as lists in chunk order"""
+    dependencies = []
+    for i, chunk in enumerate(chunks):
+        referenced = set()
+        for table in chunk.tables:
+            referenced |= references.get(table, set())
+        tables = set(chunk.tables)
+        modifies = set(chunk.modifies)
+        dependencies.append([
+            earlier.file for earlier in chunks[:i]
+            if referenced & set(earlier.tables)
+            or tables & set(earlier.modifies)
+            or modifies & set(earlier.tables)
+        ])
+    return dependencies
+
+
+class ChunkWriter:
+    """Writes numbered chunk files into ``directory`` and then its manifest
+
+    Chunk files and a manifest left by an earlier run are removed first,
+    so the directory never mixes two generations. ``wrap`` is applied to
+    each open file (generate-clean-seed.py passes its profiler's writer).
+    """
+
+    def __init__(self, directory, wrap=None):
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            if _CHUNK_FILE.match(name) or name == MANIFEST:
+                os.remove(os.path.join(directory, name))
+        self.directory = directory
+        self.wrap = wrap
+        self.chunks = []
+
+    def add(self, name, pieces, tables, rows=None, modifies=()):
+        """Write str or bytes ``pieces`` as the next chunk; returns its Chunk
+
+        ``rows`` is counted from the written file when not given.
+        """
+        file = f'{len(self.chunks):03d}-{name}.sql'
+        path = os.path.join(self.directory, file)
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, 'wb') as f:
+            out = self.wrap(f) if self.wrap is not None else f
+            for piece in pieces:
+                if isinstance(piece, str):
+                    piece = piece.encode('utf-8')
+                digest.update(piece)
+                size += out.write(piece)
+        if rows is None:
+            summary = validate_file(path)
+            rows = summary.rows + summary.copy_rows
+        chunk = Chunk(file, sorted(set(tables)), rows, size, digest.hexdigest(), sorted(set(modifies)))
+        self.chunks.append(chunk)
+        return chunk
+
+    def paths(self):
+        return [os.path.join(self.directory, chunk.file) for chunk in self.chunks]
+
+    def write_manifest(self, references, **info):
+        """Write manifest.json with dependencies from ``references`` (see seed_pipeline.schema)
+
+        ``info`` (format, shard size, ...) is stored alongside the chunks.
+        """
+        entries = []
+        for chunk, depends_on in zip(self.chunks, chunk_dependencies(self.chunks, references)):
+            entries.append({
+                'file': chunk.file,
+                'tables': chunk.tables,
+                'rows': chunk.rows,
+                'bytes': chunk.bytes,
+                'sha256': chunk.sha256,
+                'depends_on': depends_on,
+            })
+        path = os.path.join(self.directory, MANIFEST)
+        with open(path, 'w') as f:
+            json.dump(dict(info, chunks=entries), f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        return path
+
+
+def read_manifest(directory):
+    """The manifest of a seed directory as a dict"""
+    with open(os.path.join(directory, MANIFEST)) as f:
+        return json.load(f)
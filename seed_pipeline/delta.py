@@ -0,0 +1,110 @@
+"""Delta seeds between two BigCommerce exports
+
+Every product group (product row plus its variant, image and video rows)
+is fingerprinted from its raw cells. Only groups whose fingerprint is
+new, different or gone are converted to table rows, and those rows are
+then diffed by primary key. The cost of a delta therefore follows the
+size of the change, not the size of the catalog: unchanged groups are
+hashed and dropped.
+
+The old export is read twice (fingerprints, then the rows of changed
+and removed groups); the new export once.
+"""
+import hashlib
+from collections import namedtuple
+
+from seed_pipeline.categories import PRODUCT_CATEGORY_LINKS, product_category_rows
+from seed_pipeline.products import product_rows
+from seed_pipeline.reader import read_product_groups
+from seed_pipeline.render import key_indexes
+from seed_pipeline.tables import MEDIA_LIBRARY, MEDIA_USAGE, PRODUCT_VARIANTS, PRODUCTS
+from seed_pipeline.transform import CHILD_TABLES, add_child_rows
+
+# Tables in foreign key order: parents first. Category links are diffed by
+# slug; categories themselves come from the base seed and never change here.
+DELTA_TABLES = (PRODUCTS, PRODUCT_CATEGORY_LINKS, PRODUCT_VARIANTS, MEDIA_LIBRARY, MEDIA_USAGE)
+
+GroupDelta = namedtuple('GroupDelta', 'added changed removed unchanged')
+TableDelta = namedtuple('TableDelta', 'table inserts updates deletes')
+
+
+def fingerprint(group):
+    """Digest of every raw cell in a product group"""
+    digest = hashlib.blake2b(digest_size=16)
+    for rows in ((group.product,), group.variants, group.images, group.videos):
+        for row in rows:
+            digest.update('\x1f'.join(row).encode('utf-8', 'surrogatepass'))
+            digest.update(b'\x1e')
+        digest.update(b'\x1d')
+    return digest.digest()
+
+
+def diff_groups(old_csv, new_csv):
+    """Compare two exports group by group
+
+    Returns a GroupDelta whose ``added`` and ``changed`` hold the new
+    export's ProductGroups, ``removed`` the product ids that disappeared
+    and ``unchanged`` a count.
+    """
+    old_prints = {group.product_id: fingerprint(group) for group in read_product_groups(old_csv)}
+    added = []
+    changed = []
+    unchanged = 0
+    for group in read_product_groups(new_csv):
+        old_print = old_prints.pop(group.product_id, None)
+        if old_print is None:
+            added.append(group)
+        elif old_print != fingerprint(group):
+            changed.append(group)
+        else:
+            unchanged += 1
+    return GroupDelta(added, changed, set(old_prints), unchanged)
+
+
+def keyed_rows(table, rows):
+    """Map primary key tuples to rows"""
+    indexes = key_indexes(table)
+    return {tuple(row[i] for i in indexes): row for row in rows}
+
+
+def changed_columns(table, old, new):
+    """Columns whose values differ between two versions of a row"""
+    return [column for column, a, b in zip(table.columns, old, new) if a != b]
+
+
+def diff_table(table, old_rows, new_rows):
+    """Row-level delta of one table, keyed by its primary key"""
+    old = keyed_rows(table, old_rows)
+    new = keyed_rows(table, new_rows)
+    inserts = []
+    updates = []
+    for key, row in new.items():
+        previous = old.pop(key, None)
+        if previous is None:
+            inserts.append(row)
+        elif previous != row:
+            updates.append((row, changed_columns(table, previous, row)))
+    return TableDelta(table, inserts, updates, sorted(old))
+
+
+def table_rows(groups):
+    """{table name: rows} of every DELTA_TABLES table for a list of ProductGroups"""
+    rows = {table.name: [] for table, _ in CHILD_TABLES}
+    rows[PRODUCTS.name] = list(product_rows(groups))
+    rows[PRODUCT_CATEGORY_LINKS.name] = list(product_category_rows(groups))
+    add_child_rows(groups, rows)
+    return rows
+
+
+def diff_exports(old_csv, new_csv):
+    """Compute the GroupDelta and per-table deltas between two exports"""
+    groups = diff_groups(old_csv, new_csv)
+    wanted = {group.product_id for group in groups.changed} | groups.removed
+    old_groups = []
+    if wanted:
+        old_groups = [group for group in read_product_groups(old_csv) if group.product_id in wanted]
+    new_groups = groups.added + groups.changed
+    old_rows = table_rows(old_groups)
+    new_rows = table_rows(new_groups)
+    tables = [diff_table(table, old_rows[table.name], new_rows[table.name]) for table in DELTA_TABLES]
+    return groups, tables
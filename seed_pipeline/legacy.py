@@ -0,0 +1,282 @@
+"""Pre-pipeline cleaners and products generator, copied from the one-off fix scripts
+
+Kept only as baselines for benchmarks and output comparisons; new code
+should use seed_pipeline.sanitize and the renderers instead.
+"""
+import html
+import re
+
+
+def clean_html_for_postgres(html_text):
+    """final-fix-html.py: regex attribute stripping + quote rewriting"""
+    if not html_text or html_text == '':
+        return 'NULL'
+
+    # Decode HTML entities
+    text = html.unescape(html_text)
+
+    # Remove all id attributes which cause issues
+    text = re.sub(r'\s+id="[^"]*"', '', text)
+    text = re.sub(r"\s+id='[^']*'", '', text)
+
+    # Remove problematic type attributes
+    text = re.sub(r'\s+type="[^"]*"', '', text)
+    text = re.sub(r"\s+type='[^']*'", '', text)
+
+    # Convert all double quotes in attributes to single quotes
+    def replace_attr_quotes(match):
+        attr_content = match.group(1)
+        return f"='{attr_content}'"
+
+    text = re.sub(r'="([^"]*)"', replace_attr_quotes, text)
+
+    # Now escape single quotes for PostgreSQL (double them)
+    text = text.replace("'", "''")
+
+    # Clean up whitespace
+    text = re.sub(r'\s+', ' ', text)
+    text = text.strip()
+
+    # Remove any null bytes
+    text = text.replace('\x00', '')
+
+    return f"'{text}'"
+
+
+def escape_for_postgres(html_text):
+    """proper-escape-html.py / fix-products-brand-id.py: dollar quoting"""
+    if not html_text or html_text == '':
+        return 'NULL'
+
+    text = html.unescape(html_text)
+
+    delimiter = '$$DESC$$'
+    counter = 1
+    while delimiter in text:
+        delimiter = f'$$DESC{counter}$$'
+        counter += 1
+
+    return f"{delimiter}{text}{delimiter}"
+
+
+def clean_html_for_sql(html_text):
+    """fix-final.py: strip all tags down to plain text"""
+    if not html_text or html_text == '':
+        return 'NULL'
+
+    text = html.unescape(html_text)
+    text = re.sub(r'<[^>]+>', ' ', text)
+    text = ' '.join(text.split())
+    text = text.replace("'", "''")
+
+    return f"'{text}'"
+
+
+def clean_text(text):
+    """Shared by every script: quote plain text"""
+    if text is None or text == '':
+        return 'NULL'
+    text = str(text).replace("'", "''")
+    return f"'{text}'"
+
+
+# proper-escape-html.py's products pipeline, the last one-off generator
+# before seed_pipeline. Its INSERT rendering used a backslash inside an
+# f-string, which Python < 3.12 rejects, so the join is hoisted here.
+
+PRODUCT_COLUMNS = [
+    'id', 'brand_id', 'slug', 'name', 'description', 'sku', 'base_price_cents',
+    'weight', 'width', 'height', 'depth', 'condition', 'upc', 'is_visible',
+    'allow_purchases', 'status', 'track_inventory', 'stock_level', 'sort_order',
+    'meta_title', 'meta_description', 'meta_keywords', 'product_url', 'created_at',
+    'preorder_release_date', 'preorder_message', 'retail_price_cents', 'sale_price_cents',
+    'cost_price_cents', 'calculated_price_cents', 'fixed_shipping_price_cents',
+    'low_stock_level', 'bin_picking_number', 'product_availability',
+    'min_purchase_quantity', 'max_purchase_quantity', 'free_shipping', 'brand_plus_name',
+    'warranty', 'show_product_condition', 'manufacturer_part_number',
+    'global_trade_item_number', 'tax_class', 'tax_provider_tax_code', 'search_keywords',
+    'redirect_old_url', 'option_set', 'option_set_align', 'stop_processing_rules',
+    'product_custom_fields', 'event_date_required', 'event_date_name',
+    'event_date_is_limited', 'event_date_start_date', 'event_date_end_date',
+    'myob_asset_acct', 'myob_income_acct', 'myob_expense_acct', 'date_added', 'date_modified'
+]
+
+
+def clean_number(val):
+    if val is None or val == '':
+        return 'NULL'
+    try:
+        if '.' in str(val):
+            return str(float(val))
+        return str(int(val))
+    except:
+        return 'NULL'
+
+
+def clean_boolean(val):
+    if val in ['true', 'True', '1', True, 1]:
+        return 'true'
+    return 'false'
+
+
+def parse_price(price_str):
+    if not price_str or price_str == '':
+        return 'NULL'
+    try:
+        price_str = str(price_str).replace('$', '').replace(',', '')
+        price = float(price_str)
+        return str(int(price * 100))
+    except:
+        return 'NULL'
+
+
+def create_slug(name):
+    if not name:
+        return ''
+    slug = name.lower()
+    slug = re.sub(r'[^a-z0-9]+', '-', slug)
+    slug = slug.strip('-')
+    return slug
+
+
+def product_dicts(groups, brand_mapping):
+    """proper-escape-html.py read_csv_products: one dict of SQL fragments per product"""
+    products = []
+
+    for group in groups:
+        product_id = group.product_id
+        if not product_id:
+            continue
+
+        brand_id = group.get('Brand ID', '').strip()
+        brand_uuid = brand_mapping.get(brand_id) if brand_id else None
+
+        name = group.get('Name', '')
+        slug = create_slug(name)
+
+        desc = group.get('Description', '')
+        cleaned_desc = escape_for_postgres(desc)
+
+        product = {
+            'id': product_id,
+            'brand_id': f"'{brand_uuid}'" if brand_uuid else 'NULL',
+            'slug': clean_text(slug),
+            'name': clean_text(name),
+            'description': cleaned_desc,
+            'sku': clean_text(group.get('SKU', '')),
+            'base_price_cents': parse_price(group.get('Price', '')),
+            'weight': clean_number(group.get('Weight', '')),
+            'width': clean_number(group.get('Width', '')),
+            'height': clean_number(group.get('Height', '')),
+            'depth': clean_number(group.get('Depth', '')),
+            'condition': "'new'",
+            'upc': clean_text(group.get('UPC/EAN', '')),
+            'is_visible': clean_boolean(group.get('Is Visible', 'true')),
+            'allow_purchases': 'true',
+            'status': "'active'",
+            'track_inventory': clean_text(group.get('Inventory Tracking', '')),
+            'stock_level': clean_number(group.get('Current Stock', '')),
+            'sort_order': '0',
+            'meta_title': clean_text(group.get('Page Title', '')),
+            'meta_description': clean_text(group.get('Meta Description', '')),
+            'meta_keywords': clean_text(group.get('Meta Keywords', '')),
+            'product_url': clean_text(group.get('Product URL', '')),
+            'created_at': 'NOW()',
+            'preorder_release_date': 'NULL',
+            'preorder_message': 'NULL',
+            'retail_price_cents': parse_price(group.get('Retail Price', '')),
+            'sale_price_cents': parse_price(group.get('Sale Price', '')),
+            'cost_price_cents': parse_price(group.get('Cost Price', '')),
+            'calculated_price_cents': parse_price(group.get('Price', '')),
+            'fixed_shipping_price_cents': parse_price(group.get('Fixed Shipping Cost', '')),
+            'low_stock_level': clean_number(group.get('Low Stock', '')),
+            'bin_picking_number': clean_text(group.get('Bin Picking Number', '')),
+            'product_availability': 'NULL',
+            'min_purchase_quantity': '1',
+            'max_purchase_quantity': 'NULL',
+            'free_shipping': clean_boolean(group.get('Free Shipping', 'false')),
+            'brand_plus_name': 'NULL',
+            'warranty': clean_text(group.get('Warranty', '')),
+            'show_product_condition': 'false',
+            'manufacturer_part_number': clean_text(group.get('Manufacturer Part Number', '')),
+            'global_trade_item_number': clean_text(group.get('Global Trade Number', '')),
+            'tax_class': clean_text(group.get('Tax Class', 'Default Tax Class')),
+            'tax_provider_tax_code': 'NULL',
+            'search_keywords': clean_text(group.get('Search Keywords', '')),
+            'redirect_old_url': 'false',
+            'option_set': 'NULL',
+            'option_set_align': "'Right'",
+            'stop_processing_rules': 'false',
+            'product_custom_fields': 'NULL',
+            'event_date_required': 'false',
+            'event_date_name': 'NULL',
+            'event_date_is_limited': 'false',
+            'event_date_start_date': 'NULL',
+            'event_date_end_date': 'NULL',
+            'myob_asset_acct': 'NULL',
+            'myob_income_acct': 'NULL',
+            'myob_expense_acct': 'NULL',
+            'date_added': "'2025-01-01'",
+            'date_modified': "'2025-01-01'"
+        }
+
+        products.append(product)
+
+    return products
+
+
+def product_inserts(products):
+    """proper-escape-html.py generate_product_inserts"""
+    inserts = []
+    for product in products:
+        values = []
+        for col in PRODUCT_COLUMNS:
+            values.append(f"    {product.get(col, 'NULL')}")
+
+        body = ',\n'.join(values)
+        insert = f"""INSERT INTO products (
+    {', '.join(PRODUCT_COLUMNS)}
+) VALUES (
+{body}
+);"""
+        inserts.append(insert)
+
+    return '\n'.join(inserts)
+
+
+def brand_inserts(brand_slugs):
+    """proper-escape-html.py generate_brand_inserts"""
+    inserts = []
+
+    for slug, uuid in brand_slugs.items():
+        name = slug.replace('-', ' ').title()
+        if slug == 'millinillions':
+            name = 'MILLINILLIONS'
+        elif slug == 'miyo-s-mystic-musings':
+            name = "Miyo's Mystic Musings"
+        elif slug == 'acid-rain-world-b2five':
+            name = 'Acid Rain World B2FIVE'
+
+        insert = f"INSERT INTO brands (id, slug, name, is_active) VALUES ('{uuid}', '{slug}', '{name}', true);"
+        inserts.append(insert)
+
+    return '\n'.join(inserts)
+
+
+def splice_seed(existing_seed, brand_sql, product_sql):
+    """proper-escape-html.py main: split the base seed text around its products"""
+    before_products = existing_seed.split('-- ======================================\n-- 🛍️ Products')[0]
+    after_products_match = re.search(r'(-- ======================================\n-- 📁 Categories.*)', existing_seed, re.DOTALL)
+    after_products = after_products_match.group(1) if after_products_match else ''
+
+    return f"""{before_products}-- ======================================
+-- 🏢 Brands
+-- ======================================
+{brand_sql}
+
+-- ======================================
+-- 🛍️ Products  
+-- ======================================
+{product_sql}
+
+{after_products}"""
@@ -0,0 +1,126 @@
+"""Turn export Image rows into media_library and media_usage rows
+
+Every Image row becomes one media_library row and one media_usage row
+linking it to its product as ``gallery_image_N``, where N is the image's
+1-based position by ``Image Sort Order``. The thumbnail keeps its flag
+as a 'thumbnail' tag.
+
+IDs come from the id registry, keyed on the product ID and image URL
+(and, for media_usage, the media id and field name), so regenerating a seed from the same
+export is byte-stable and a changed image only touches its own rows.
+"""
+import posixpath
+import re
+from urllib.parse import urlsplit
+
+from seed_pipeline.products import boolean, integer, stripped
+from seed_pipeline.registry import registry
+from seed_pipeline.splice import Replacement, replace
+from seed_pipeline.tables import MEDIA_LIBRARY
+
+FOLDER = 'products'
+
+# The base seed's hand-made product image rows, replaced by the ones
+# generated from Image rows
+HAND_MADE_IMAGES = re.compile(rb'^-- Product Images\b.*$', re.M)
+
+# Fixed so output does not depend on the host's mime.types; other
+# extensions get a NULL mime_type
+MIME_TYPES = {
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+}
+
+# BigCommerce CDN file names carry an upload timestamp and resize
+# dimensions: name.1750464104.386.513.jpg
+_CDN_SUFFIX = re.compile(r'\.\d+\.\d+\.\d+(?=\.[A-Za-z0-9]+$)')
+
+
+def image_url(group, row):
+    """Image URL without its cache-busting query string"""
+    url = group.get('Image URL (Import)', row=row).strip() or group.get('Internal Image URL (Export)', row=row).strip()
+    return url.split('?', 1)[0]
+
+
+def image_filename(url):
+    """Original file name of an image URL"""
+    name = posixpath.basename(urlsplit(url).path)
+    return _CDN_SUFFIX.sub('', name)
+
+
+def media_id(product_id, url):
+    return registry().get('product-image', f'{product_id}:{url}')
+
+
+def usage_id(media, entity_type, entity_id, field_name):
+    return registry().get('media-usage', f'{media}:{entity_type}:{entity_id}:{field_name}')
+
+
+def sorted_images(group):
+    """Image rows in Image Sort Order, export order breaking ties"""
+    def key(item):
+        position, row = item
+        try:
+            return integer(group.get('Image Sort Order', '0', row=row) or '0'), position
+        except ValueError:
+            return 0, position
+    return [row for _, row in sorted(enumerate(group.images), key=key)]
+
+
+def product_images(group):
+    """Yield (media_library row, media_usage row) pairs for a ProductGroup's images"""
+    product_id = group.product_id
+    name = stripped(group.get('Name'))
+    seen = set()
+    position = 0
+    for row in sorted_images(group):
+        url = image_url(group, row)
+        # The same URL twice would collide on media_library.id
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        position += 1
+        filename = image_filename(url)
+        extension = posixpath.splitext(filename)[1].lstrip('.').lower() or None
+        mime_type = MIME_TYPES.get(extension)
+        tags = ['product']
+        if boolean(group.get('Image is Thumbnail', row=row)):
+            tags.append('thumbnail')
+        try:
+            sort_order = integer(group.get('Image Sort Order', row=row))
+        except ValueError:
+            sort_order = position - 1
+        media = media_id(product_id, url)
+        field_name = f'gallery_image_{position}'
+        yield (
+            (media, filename, filename, f'product_images/{filename}', url, FOLDER, name,
+             group.get('Image Description', row=row).strip() or name, mime_type, extension, tags, sort_order),
+            (usage_id(media, 'product', product_id, field_name), media, 'product', product_id, field_name),
+        )
+
+
+def media_rows(groups):
+    """Yield (media_library row, media_usage row) for every image of every ProductGroup
+
+    Both tables come from one pass over the images; callers split the pairs.
+    """
+    for group in groups:
+        yield from product_images(group)
+
+
+def hand_made_images(data, index):
+    """Replacements that drop the base seed's hand-written product image rows and their usage records"""
+    replacements = []
+    comment = HAND_MADE_IMAGES.search(data)
+    if comment is not None:
+        for statement in index.statements:
+            if statement.start > comment.start() and statement.table == MEDIA_LIBRARY.name:
+                replacements.append(Replacement(comment.start(), statement.end, ()))
+                break
+    usage = index.section('Media Usage')
+    if usage is not None:
+        replacements.append(replace(usage))
+    return replacements
@@ -0,0 +1,200 @@
+"""Per-stage wall time, CPU time and memory for the seed generators
+
+The pipeline streams: reading, grouping, cleaning and rendering all
+happen inside the pulls that writing the output makes. StageProfiler
+keeps a stack of the stages currently inside a pull and charges time
+to the innermost one only, so each stage's figures exclude the stages
+it pulls from and the stage totals add up to the run.
+
+Peak RSS is the process high-water mark, sampled when a stage is left
+(every SAMPLE_EVERY exits, and at the end of a timed block), so a
+stage's figure is the highest the process had reached by then.
+
+NullProfiler has the same interface and does nothing, so callers can
+thread one profiler through whether or not --profile was given.
+"""
+import heapq
+import resource
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from itertools import count
+
+STAGES = ('read', 'group', 'clean', 'render', 'splice', 'write')
+
+SAMPLE_EVERY = 256
+
+# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+_RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+
+def peak_rss():
+    """Highest resident set size of this process so far, in bytes"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+class _Stage:
+    __slots__ = ('wall', 'cpu', 'rows', 'bytes', 'peak_rss', 'exits')
+
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rows = 0
+        self.bytes = 0
+        self.peak_rss = 0
+        self.exits = 0
+
+
+class StageProfiler:
+    """Exclusive per-stage timings plus the ``top`` slowest items of timed iterables"""
+
+    def __init__(self, top=10):
+        self.top = top
+        self.stages = {name: _Stage() for name in STAGES}
+        self.slowest = []  # min-heap of (seconds, sequence, label)
+        self._sequence = count()
+        self._stack = []
+        self._mark = None
+        self._start = None
+
+    def start(self):
+        self._start = (time.perf_counter(), time.process_time())
+        self._mark = self._start
+
+    def _charge(self):
+        """Charge time since the last boundary to the innermost stage"""
+        now = (time.perf_counter(), time.process_time())
+        if self._stack:
+            stage = self._stack[-1]
+            stage.wall += now[0] - self._mark[0]
+            stage.cpu += now[1] - self._mark[1]
+        self._mark = now
+
+    def enter(self, name):
+        self._charge()
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = _Stage()
+        self._stack.append(stage)
+        return stage
+
+    def leave(self, sample=False):
+        self._charge()
+        stage = self._stack.pop()
+        stage.exits += 1
+        if sample or stage.exits % SAMPLE_EVERY == 0:
+            stage.peak_rss = max(stage.peak_rss, peak_rss())
+
+    @contextmanager
+    def stage(self, name):
+        """Charge the body of a with block to ``name``"""
+        self.enter(name)
+        try:
+            yield
+        finally:
+            self.leave(sample=True)
+
+    def count(self, name, rows):
+        """Add ``rows`` to a stage whose timed items are not rows (such as rendered chunks)"""
+        self.stages[name].rows += rows
+
+    def timed(self, name, iterable, label=None, rows=True):
+        """Yield from ``iterable``, charging each pull to ``name``
+
+        Every item counts as a row unless ``rows`` is false. With
+        ``label``, each item's own time in ``name`` is ranked and
+        label(item), a dict, is kept for the slowest ``top`` items.
+        """
+        iterator = iter(iterable)
+        while True:
+            stage = self.enter(name)
+            before = stage.wall
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.leave(sample=True)
+                return
+            except BaseException:
+                self.leave()
+                raise
+            self.leave()
+            if rows:
+                stage.rows += 1
+            if label is not None and self.top:
+                seconds = stage.wall - before
+                if len(self.slowest) < self.top:
+                    heapq.heappush(self.slowest, (seconds, next(self._sequence), label(item)))
+                elif seconds > self.slowest[0][0]:
+                    heapq.heapreplace(self.slowest, (seconds, next(self._sequence), label(item)))
+            yield item
+
+    def writer(self, out):
+        """``out`` with writes charged to the write stage"""
+        return _TimedWriter(self, out)
+
+    def report(self):
+        """Stage figures and the slowest items as plain dicts, for JSON"""
+        end = (time.perf_counter(), time.process_time())
+        total_wall = end[0] - self._start[0]
+        total_cpu = end[1] - self._start[1]
+        stages = {}
+        for name, stage in self.stages.items():
+            stages[name] = {
+                'wall_seconds': stage.wall,
+                'cpu_seconds': stage.cpu,
+                'rows': stage.rows,
+                'rows_per_second': stage.rows / stage.wall if stage.rows and stage.wall else None,
+                'bytes': stage.bytes,
+                'peak_rss_bytes': stage.peak_rss or None,
+            }
+        stages['other'] = {
+            'wall_seconds': total_wall - sum(stage.wall for stage in self.stages.values()),
+            'cpu_seconds': total_cpu - sum(stage.cpu for stage in self.stages.values()),
+        }
+        slowest = [dict(label, seconds=seconds)
+                   for seconds, _, label in sorted(self.slowest, key=lambda entry: (-entry[0], entry[1]))]
+        return {
+            'total': {'wall_seconds': total_wall, 'cpu_seconds': total_cpu, 'peak_rss_bytes': peak_rss()},
+            'stages': stages,
+            'slowest': slowest,
+        }
+
+
+class _TimedWriter:
+    def __init__(self, profiler, out):
+        self._profiler = profiler
+        self._out = out
+        self._stage = profiler.stages['write']
+
+    def write(self, data):
+        self._profiler.enter('write')
+        try:
+            written = self._out.write(data)
+            # Text files count characters; the report is in bytes
+            self._stage.bytes += len(data.encode('utf-8')) if isinstance(data, str) else written
+        finally:
+            self._profiler.leave()
+        return written
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+
+class NullProfiler:
+    """StageProfiler stand-in for runs without --profile"""
+
+    def start(self):
+        pass
+
+    def stage(self, name):
+        return nullcontext()
+
+    def count(self, name, rows):
+        pass
+
+    def timed(self, name, iterable, label=None, rows=True):
+        return iterable
+
+    def writer(self, out):
+        return out
@@ -0,0 +1,47 @@
+"""Process-pool map over chunks of product groups, in input order
+
+Turning a ProductGroup into rows only depends on that group, so an
+export can be cut at group boundaries and the chunks converted in
+worker processes. Results come back in the order the chunks went in,
+which keeps the output identical to a serial run.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+DEFAULT_CHUNK_SIZE = 64
+
+
+def chunked(items, size):
+    """Yield lists of up to ``size`` consecutive items"""
+    if size < 1:
+        raise ValueError('chunk size must be at least 1')
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def job_count(jobs):
+    """Worker count for a --jobs value; 0 means one per CPU"""
+    return jobs if jobs > 0 else os.cpu_count() or 1
+
+
+def ordered_map(function, chunks, jobs, initializer=None, initargs=()):
+    """Yield ``function(chunk)`` for every chunk, in input order
+
+    At most two chunks per worker are in flight, so a large export is
+    read only as fast as it is converted rather than queued up front the
+    way Executor.map would.
+    """
+    with ProcessPoolExecutor(jobs, initializer=initializer, initargs=initargs) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(function, chunk))
+            if len(in_flight) >= 2 * jobs:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
@@ -0,0 +1,216 @@
+"""Load a seed through several psql connections at once
+
+A seed is cut into units: the chunks of a seed directory (see
+seed_pipeline.chunks), or the sections of a single-file seed. A unit
+waits for the units it depends on, which are the chunk dependencies the
+manifest lists or, for a single file, the same rules applied to its
+sections with foreign keys from supabase/migrations: brands and
+categories load before products, and products before their category
+links and media usage. Units whose dependencies have finished run
+concurrently, at most ``jobs`` at a time, each in its own psql process
+and transaction.
+
+A unit that only inserts into one table and is at least ``split_bytes``
+long is split into ``streams`` parts that load in parallel: INSERT
+statements are divided between the parts and COPY data rows are divided
+at line boundaries, each part getting its own COPY header. Units that
+depend on a split unit wait for all of its parts.
+"""
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from seed_pipeline.chunks import INSERT_KINDS, Chunk, chunk_dependencies, chunk_name
+from seed_pipeline.pgload import LoadError, command_rows, psql_env
+from seed_pipeline.seed_index import index_seed
+
+DEFAULT_STREAMS = 4
+DEFAULT_SPLIT_BYTES = 1 << 20
+
+# ``pieces`` are the unit's SQL as bytes-like slices, in order
+Unit = namedtuple('Unit', 'name tables bytes depends_on pieces')
+UnitLoad = namedtuple('UnitLoad', 'name tables bytes rows seconds')
+
+_COPY_HEADER = re.compile(rb'.*?\bFROM\s+stdin\s*;[^\n]*\n', re.S | re.I)
+_COPY_END = re.compile(rb'^\\\.\r?$', re.M)
+
+
+def seed_units(data, index, references):
+    """Units for the sections of a single-file seed (bytes before the first banner are the preamble)
+
+    Sections without statements are left out. ``references`` is what
+    schema.foreign_keys returns.
+    """
+    parts = [('preamble', 0, index.sections[0].start if index.sections else len(data))]
+    parts += [(section.name, section.start, section.end) for section in index.sections]
+    starts = [statement.start for statement in index.statements]
+    chunks = []
+    for title, start, end in parts:
+        statements = index.statements[bisect_left(starts, start):bisect_left(starts, end)]
+        if not statements:
+            continue
+        tables = [statement.table for statement in statements if statement.table]
+        modifies = [statement.table for statement in statements
+                    if statement.table and statement.kind not in INSERT_KINDS]
+        name = f'{len(chunks):03d}-{chunk_name(title)}'
+        chunks.append((Chunk(name, sorted(set(tables)), None, end - start, None, sorted(set(modifies))),
+                       data[start:end]))
+    dependencies = chunk_dependencies([chunk for chunk, _ in chunks], references)
+    return [Unit(chunk.file, chunk.tables, chunk.bytes, depends_on, [piece])
+            for (chunk, piece), depends_on in zip(chunks, dependencies)]
+
+
+def directory_units(manifest, read):
+    """Units for the chunks of a seed directory; ``read(file)`` returns a chunk's bytes"""
+    return [Unit(entry['file'], entry['tables'], entry['bytes'], entry['depends_on'], [read(entry['file'])])
+            for entry in manifest['chunks']]
+
+
+def _copy_parts(data, statement, parts):
+    """A COPY statement as up to ``parts`` COPY statements over consecutive rows"""
+    header = _COPY_HEADER.match(data, statement.start, statement.end)
+    end = _COPY_END.search(data, header.end() if header else statement.end, statement.end)
+    if header is None or end is None:
+        return [[data[statement.start:statement.end]]]
+    head = data[statement.start:header.end()]
+    rows_start, rows_end = header.end(), end.start()
+    target = (rows_end - rows_start) // parts + 1
+    pieces = []
+    pos = rows_start
+    while pos < rows_end:
+        cut = data.find(b'\n', min(pos + target, rows_end) - 1, rows_end)
+        cut = rows_end if cut < 0 else cut + 1
+        pieces.append([head, data[pos:cut], b'\\.\n'])
+        pos = cut
+    return pieces or [[data[statement.start:statement.end]]]
+
+
+def split_unit(unit, streams, split_bytes=DEFAULT_SPLIT_BYTES):
+    """``unit`` as up to ``streams`` units of about equal size, or [unit] if it should load whole
+
+    Only units that insert into a single table, and nothing else, are split.
+    """
+    if streams < 2 or unit.bytes < split_bytes or len(unit.tables) != 1:
+        return [unit]
+    data = b''.join(unit.pieces)
+    statements = index_seed(data).statements
+    if not statements or any(statement.kind not in INSERT_KINDS for statement in statements):
+        return [unit]
+
+    segments = []
+    for statement in statements:
+        if statement.kind == 'COPY':
+            segments.extend(_copy_parts(data, statement, streams))
+        else:
+            segments.append([data[statement.start:statement.end]])
+    sizes = [sum(len(piece) for piece in segment) for segment in segments]
+    target = sum(sizes) / streams
+
+    parts = []
+    current, size, done = [], 0, 0
+    for segment, segment_size in zip(segments, sizes):
+        current.extend(segment)
+        size += segment_size
+        if done + size >= target * (len(parts) + 1) and len(parts) < streams - 1:
+            parts.append((current, size))
+            done += size
+            current, size = [], 0
+    if current:
+        parts.append((current, size))
+    if len(parts) < 2:
+        return [unit]
+    return [Unit(f'{unit.name}#{number}', unit.tables, size, unit.depends_on, pieces)
+            for number, (pieces, size) in enumerate(parts, 1)]
+
+
+def plan(units, streams, split_bytes=DEFAULT_SPLIT_BYTES):
+    """Split the large units and point dependencies at every part"""
+    parts = {unit.name: split_unit(unit, streams, split_bytes) for unit in units}
+    planned = []
+    for unit in units:
+        for part in parts[unit.name]:
+            depends_on = [dependency.name for name in part.depends_on for dependency in parts.get(name, ())]
+            planned.append(part._replace(depends_on=depends_on))
+    return planned
+
+
+def waves(units):
+    """Units grouped by how many dependency levels precede them"""
+    level = {}
+    for unit in units:
+        level[unit.name] = 1 + max((level[name] for name in unit.depends_on if name in level), default=-1)
+    grouped = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for unit in units:
+        grouped[level[unit.name]].append(unit)
+    return grouped
+
+
+def _write_pieces(stdin, pieces):
+    try:
+        for piece in pieces:
+            stdin.write(piece)
+        stdin.close()
+    except BrokenPipeError:
+        pass  # psql stopped on an error; its exit status says why
+
+
+def run_unit(psql_args, unit, settings=()):
+    """Load one unit in a single transaction through its own psql; returns a UnitLoad"""
+    start = time.perf_counter()
+    rows = 0
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen([*psql_args, '--single-transaction'], stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, stderr=stderr, env=psql_env(settings))
+        writer = threading.Thread(target=_write_pieces, args=(process.stdin, unit.pieces), daemon=True)
+        writer.start()
+        for line in process.stdout:
+            tagged = command_rows(line.rstrip(b'\r\n'))
+            if tagged is not None:
+                rows += tagged
+        writer.join()
+        if process.wait():
+            stderr.seek(0)
+            raise LoadError(stderr.read().decode('utf-8', 'replace').strip() or 'psql exited with an error')
+    return UnitLoad(unit.name, unit.tables, unit.bytes, rows, time.perf_counter() - start)
+
+
+def load_units(units, run, jobs):
+    """Run units with ``run(unit)`` as their dependencies finish; yields each result
+
+    At most ``jobs`` units run at once. After a failure no more units
+    are started; the running ones are waited for and LoadError names the
+    unit that failed.
+    """
+    names = {unit.name for unit in units}
+    waiting = {unit.name: {name for name in unit.depends_on if name in names} for unit in units}
+    pending = list(units)
+    finished = set()
+    running = {}
+    failure = None
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            if failure is None:
+                for unit in [unit for unit in pending if waiting[unit.name] <= finished]:
+                    if len(running) >= jobs:
+                        break
+                    pending.remove(unit)
+                    running[pool.submit(run, unit)] = unit
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                unit = running.pop(future)
+                try:
+                    result = future.result()
+                except LoadError as e:
+                    failure = failure or LoadError(f'{unit.name}: {e}')
+                    continue
+                finished.add(unit.name)
+                yield result
+    if failure is not None:
+        raise failure
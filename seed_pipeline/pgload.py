@@ -0,0 +1,278 @@
+"""Throwaway PostgreSQL clusters for timing seed loads
+
+Cluster runs initdb into a temporary directory and starts a postmaster
+that only listens on a unix socket inside it, so nothing else on the
+machine is touched and everything is removed on exit.
+
+apply_migrations loads supabase/migrations in order after a bootstrap
+that stands in for what the Supabase images provide (the anon,
+authenticated and service_role roles, the auth schema with auth.users
+and auth.uid(), and the schemas extensions are installed into). CREATE
+EXTENSION statements for extensions the cluster does not ship, such as
+pg_net, pg_graphql and supabase_vault, are commented out; the schema
+does not depend on them.
+
+load_sections feeds a seed through one psql session a section at a
+time. After each section a marker query reports the server clock and
+WAL insert position, so each section's time and WAL volume are measured
+on the server and exclude psql start-up. Rows are summed from the
+INSERT and COPY command tags psql prints.
+"""
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+from contextlib import contextmanager
+
+# Result of one section: statements as indexed, rows from command tags
+SectionLoad = namedtuple('SectionLoad', 'name bytes statements rows seconds wal_bytes')
+
+BOOTSTRAP_SQL = """\
+CREATE ROLE anon NOLOGIN NOINHERIT;
+CREATE ROLE authenticated NOLOGIN NOINHERIT;
+CREATE ROLE service_role NOLOGIN NOINHERIT BYPASSRLS;
+CREATE SCHEMA IF NOT EXISTS extensions;
+CREATE SCHEMA IF NOT EXISTS graphql;
+CREATE SCHEMA IF NOT EXISTS vault;
+CREATE SCHEMA IF NOT EXISTS auth;
+CREATE TABLE auth.users (
+  id uuid PRIMARY KEY,
+  email text,
+  raw_user_meta_data jsonb,
+  created_at timestamptz DEFAULT now()
+);
+CREATE FUNCTION auth.uid() RETURNS uuid LANGUAGE sql STABLE AS $$
+  SELECT nullif(current_setting('request.jwt.claim.sub', true), '')::uuid
+$$;
+"""
+
+PREAMBLE = '(before first section)'
+
+_CREATE_EXTENSION = re.compile(r'^CREATE EXTENSION IF NOT EXISTS "([^"]+)"[^;]*;', re.M | re.I)
+_MARKER = 'seed-load-marker'
+_ROW_TAG = re.compile(rb'^(?:INSERT \d+|COPY) (\d+)$')
+
+
+class LoadError(Exception):
+    """psql stopped on an error; the message carries its stderr"""
+
+
+def pg_bin_dir(path=None):
+    """Directory holding initdb, pg_ctl and psql
+
+    Uses ``path`` if given, else initdb on PATH, else ``pg_config --bindir``
+    (Debian and Ubuntu keep the server binaries off PATH).
+    """
+    if not path:
+        initdb = shutil.which('initdb')
+        pg_config = shutil.which('pg_config')
+        if initdb:
+            path = os.path.dirname(initdb)
+        elif pg_config:
+            path = subprocess.run([pg_config, '--bindir'], check=True, capture_output=True, text=True).stdout.strip()
+        else:
+            raise FileNotFoundError('initdb not found on PATH; pass the PostgreSQL bin directory')
+    for tool in ('initdb', 'pg_ctl', 'psql'):
+        if not os.path.exists(os.path.join(path, tool)):
+            raise FileNotFoundError(f'{tool} not found in {path} (is the PostgreSQL server package installed?)')
+    return path
+
+
+def command_rows(line):
+    """Rows in an INSERT or COPY command tag line of psql output, else None"""
+    tag = _ROW_TAG.match(line)
+    return int(tag.group(1)) if tag else None
+
+
+def parse_lsn(lsn):
+    """Byte position of a WAL location written as 'X/Y'"""
+    high, low = lsn.split('/')
+    return (int(high, 16) << 32) + int(low, 16)
+
+
+class Cluster:
+    """A temporary cluster; use as a context manager to start and remove it"""
+
+    def __init__(self, bin_dir, port=54329, settings=(), keep=False):
+        self.bin_dir = bin_dir
+        self.port = port
+        self.settings = list(settings)
+        self.keep = keep
+        self.root = None
+
+    def tool(self, name):
+        return os.path.join(self.bin_dir, name)
+
+    @property
+    def data_dir(self):
+        return os.path.join(self.root, 'data')
+
+    def __enter__(self):
+        self.root = tempfile.mkdtemp(prefix='seed-load-')
+        try:
+            subprocess.run([self.tool('initdb'), '-D', self.data_dir, '-U', 'postgres', '-A', 'trust',
+                            '-E', 'UTF8', '--no-sync'], check=True, capture_output=True)
+            options = [f"-k {self.root}", f"-p {self.port}", "-c listen_addresses=''"]
+            options += [f'-c {setting}' for setting in self.settings]
+            subprocess.run([self.tool('pg_ctl'), '-D', self.data_dir, '-l', os.path.join(self.root, 'server.log'),
+                            '-w', '-o', ' '.join(options), 'start'], check=True, capture_output=True)
+        except BaseException:
+            self.remove()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        subprocess.run([self.tool('pg_ctl'), '-D', self.data_dir, '-m', 'immediate', 'stop'], capture_output=True)
+        self.remove()
+
+    def remove(self):
+        if self.root and not self.keep:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+    def psql_args(self, *extra):
+        return [self.tool('psql'), '-X', '-h', self.root, '-p', str(self.port), '-U', 'postgres',
+                '-d', 'postgres', '-v', 'ON_ERROR_STOP=1', *extra]
+
+    def run_sql(self, sql):
+        """Run SQL text quietly and return psql's unaligned output"""
+        result = subprocess.run(self.psql_args('-q', '-A', '-t'), input=sql.encode('utf-8'),
+                                capture_output=True, env=psql_env())
+        if result.returncode:
+            raise LoadError(result.stderr.decode('utf-8', 'replace').strip())
+        return result.stdout.decode('utf-8')
+
+    def server_version(self):
+        return self.run_sql('SHOW server_version;').strip()
+
+
+def psql_env(settings=()):
+    """Environment for psql; ``settings`` (NAME=VALUE) become session settings"""
+    env = dict(os.environ)
+    env['PGCLIENTENCODING'] = 'UTF8'
+    if settings:
+        env['PGOPTIONS'] = ' '.join(f'-c {setting}' for setting in settings)
+    else:
+        env.pop('PGOPTIONS', None)
+    return env
+
+
+def without_missing_extensions(sql, available):
+    """Comment out CREATE EXTENSION statements for extensions not in ``available``"""
+    def comment(match):
+        if match.group(1) in available:
+            return match.group(0)
+        return f'-- skipped, not available here: {match.group(0)}'
+    return _CREATE_EXTENSION.sub(comment, sql)
+
+
+def apply_migrations(cluster, migrations_dir):
+    """Bootstrap Supabase's roles and auth schema, then run every migration in order
+
+    Returns the names of the extensions that were skipped.
+    """
+    cluster.run_sql(BOOTSTRAP_SQL)
+    available = set(cluster.run_sql('SELECT name FROM pg_available_extensions;').split())
+    skipped = set()
+    for name in sorted(os.listdir(migrations_dir)):
+        if not name.endswith('.sql'):
+            continue
+        with open(os.path.join(migrations_dir, name), encoding='utf-8') as f:
+            sql = f.read()
+        skipped.update(match.group(1) for match in _CREATE_EXTENSION.finditer(sql)
+                       if match.group(1) not in available)
+        try:
+            cluster.run_sql(without_missing_extensions(sql, available))
+        except LoadError as e:
+            raise LoadError(f'{name}: {e}') from None
+    return sorted(skipped)
+
+
+def _marker_sql(number):
+    return (f"\nSELECT '{_MARKER}', {number}, extract(epoch FROM clock_timestamp()), "
+            f"pg_current_wal_insert_lsn();\n").encode()
+
+
+def _read_lines(stream, lines):
+    for line in iter(stream.readline, b''):
+        lines.put(line.rstrip(b'\r\n'))
+    lines.put(None)
+
+
+@contextmanager
+def _psql_session(cluster):
+    """A psql reading a script from a pipe, with its output lines on a queue
+
+    stdout is drained by a thread so psql never blocks on it while a
+    large section is still being written to its stdin.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        process = subprocess.Popen(cluster.psql_args('-A', '-t'), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=stderr, env=psql_env())
+        lines = queue.Queue()
+        reader = threading.Thread(target=_read_lines, args=(process.stdout, lines), daemon=True)
+        reader.start()
+        try:
+            yield process, lines, stderr
+        finally:
+            if process.stdin and not process.stdin.closed:
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+            process.wait()
+            reader.join()
+
+
+def _wait_for_marker(lines, number, stderr):
+    """Rows tagged before marker ``number``, and the marker's (epoch, lsn)"""
+    rows = 0
+    while True:
+        line = lines.get()
+        if line is None:
+            stderr.seek(0)
+            raise LoadError(stderr.read().decode('utf-8', 'replace').strip() or 'psql exited early')
+        tagged = command_rows(line)
+        if tagged is not None:
+            rows += tagged
+            continue
+        fields = line.decode('utf-8', 'replace').split('|')
+        if fields[0] == _MARKER and fields[1] == str(number):
+            return rows, float(fields[2]), parse_lsn(fields[3])
+
+
+def load_sections(cluster, data, index, write_size=1 << 20):
+    """Load a seed section by section; yields a SectionLoad as each one finishes
+
+    ``data`` and ``index`` are what splice.open_seed yields. Bytes before
+    the first section banner are loaded (and reported) first.
+    """
+    parts = []
+    first = index.sections[0].start if index.sections else len(data)
+    if first:
+        parts.append((PREAMBLE, 0, first))
+    parts.extend((section.name, section.start, section.end) for section in index.sections)
+    starts = [statement.start for statement in index.statements]
+
+    with _psql_session(cluster) as (process, lines, stderr):
+        def send(chunk):
+            try:
+                process.stdin.write(chunk)
+                process.stdin.flush()
+            except BrokenPipeError:
+                pass  # psql stopped on an error; _wait_for_marker reports it
+
+        send(_marker_sql(0))
+        _, clock, lsn = _wait_for_marker(lines, 0, stderr)
+        for number, (name, start, end) in enumerate(parts, 1):
+            for offset in range(start, end, write_size):
+                send(data[offset:min(offset + write_size, end)])
+            send(_marker_sql(number))
+            rows, now, now_lsn = _wait_for_marker(lines, number, stderr)
+            statements = bisect_left(starts, end) - bisect_left(starts, start)
+            yield SectionLoad(name, end - start, statements, rows, now - clock, now_lsn - lsn)
+            clock, lsn = now, now_lsn
@@ -0,0 +1,162 @@
+"""Turn export ProductGroups into products rows
+
+Converters return plain Python values (None for NULL); quoting is left to
+the renderer so the same row can be written as INSERT, batched INSERT or
+COPY. PRODUCT_SPEC is the single CSV -> products column mapping that all
+of them are driven from.
+"""
+import re
+
+from seed_pipeline.brands import BRAND_MAPPING
+from seed_pipeline.sanitize import sanitize_html
+from seed_pipeline.spec import column, compile_spec, const
+
+TRACK_INVENTORY = {
+    'product': 'by product',
+    'variant': 'by variant',
+}
+
+DATE_ADDED = '2025-01-01'
+
+
+def text(val):
+    """Text column; empty strings become NULL"""
+    if val is None or val == '':
+        return None
+    return val
+
+
+def stripped(val):
+    """Text column with surrounding whitespace removed"""
+    return val.strip()
+
+
+def integer(val):
+    return int(val)
+
+
+def number(val):
+    """Numeric column"""
+    if val is None or val == '':
+        return None
+    try:
+        if '.' in val:
+            return float(val)
+        return int(val)
+    except ValueError:
+        return None
+
+
+def price(val):
+    """Price string to integer cents"""
+    if not val:
+        return None
+    try:
+        return int(round(float(val.replace('$', '').replace(',', '')) * 100))
+    except ValueError:
+        return None
+
+
+def boolean(val):
+    """BigCommerce TRUE/FALSE flag"""
+    return val.strip().lower() in ('true', '1')
+
+
+def track_inventory(val):
+    """Map export tracking values onto the products_track_inventory_check values"""
+    return TRACK_INVENTORY.get(val.strip(), 'none')
+
+
+def create_slug(name):
+    """Create URL slug from name"""
+    if not name:
+        return ''
+    slug = name.lower()
+    slug = re.sub(r'[^a-z0-9]+', '-', slug)
+    return slug.strip('-')
+
+
+def brand_lookup(mapping):
+    """Converter from a BigCommerce Brand ID to brands.id using ``mapping``"""
+    def convert(val):
+        val = val.strip()
+        return mapping.get(val) if val else None
+    return convert
+
+
+PRODUCT_SPEC = (
+    column('id', 'ID', integer),
+    column('brand_id', 'Brand ID', brand_lookup(BRAND_MAPPING)),
+    column('slug', 'Name', create_slug),
+    column('name', 'Name', stripped),
+    column('description', 'Description', sanitize_html),
+    column('sku', 'SKU', text),
+    column('base_price_cents', 'Price', price),
+    column('weight', 'Weight', number),
+    column('width', 'Width', number),
+    column('height', 'Height', number),
+    column('depth', 'Depth', number),
+    const('condition', 'new'),
+    column('upc', 'UPC/EAN', text),
+    column('is_visible', 'Is Visible', boolean, True),
+    const('allow_purchases', True),
+    const('status', 'active'),
+    column('track_inventory', 'Inventory Tracking', track_inventory, 'none'),
+    column('stock_level', 'Current Stock', number),
+    const('sort_order', 0),
+    column('meta_title', 'Page Title', text),
+    column('meta_description', 'Meta Description', text),
+    column('meta_keywords', 'Meta Keywords', text),
+    column('product_url', 'Product URL', text),
+    const('preorder_release_date', None),
+    const('preorder_message', None),
+    column('retail_price_cents', 'Retail Price', price),
+    column('sale_price_cents', 'Sale Price', price),
+    column('cost_price_cents', 'Cost Price', price),
+    column('calculated_price_cents', 'Price', price),
+    column('fixed_shipping_price_cents', 'Fixed Shipping Cost', price),
+    column('low_stock_level', 'Low Stock', number),
+    column('bin_picking_number', 'Bin Picking Number', text),
+    const('product_availability', None),
+    const('min_purchase_quantity', 1),
+    const('max_purchase_quantity', None),
+    column('free_shipping', 'Free Shipping', boolean, False),
+    const('brand_plus_name', None),
+    column('warranty', 'Warranty', text),
+    const('show_product_condition', False),
+    column('manufacturer_part_number', 'Manufacturer Part Number', text),
+    column('global_trade_item_number', 'Global Trade Number', text),
+    column('tax_class', 'Tax Class', text, 'Default Tax Class'),
+    const('tax_provider_tax_code', None),
+    column('search_keywords', 'Search Keywords', text),
+    const('redirect_old_url', False),
+    const('option_set', None),
+    const('option_set_align', 'Right'),
+    const('stop_processing_rules', False),
+    const('product_custom_fields', None),
+    const('event_date_required', False),
+    const('event_date_name', None),
+    const('event_date_is_limited', False),
+    const('event_date_start_date', None),
+    const('event_date_end_date', None),
+    const('myob_asset_acct', None),
+    const('myob_income_acct', None),
+    const('myob_expense_acct', None),
+    const('date_added', DATE_ADDED),
+    const('date_modified', DATE_ADDED),
+)
+
+
+def product_rows(groups, overrides=None):
+    """Yield a products row for each ProductGroup
+
+    The spec is compiled against the export header on the first group and
+    reused for every row after that.
+    """
+    convert = None
+    columns = None
+    for group in groups:
+        if group.columns is not columns:
+            columns = group.columns
+            convert = compile_spec(PRODUCT_SPEC, columns, overrides)
+        yield convert(group.product)
@@ -0,0 +1,118 @@
+"""Central registry of seed row ids
+
+Maps (entity type, natural key) to a UUID. Ids that predate the
+pipeline, such as the hand-assigned brand UUIDs, are pinned in ids.tsv;
+every other key gets uuid5(NAMESPACE, "entity:key"), so the same key
+always yields the same id without having to be stored anywhere.
+
+The file is loaded once per process and lookups are plain dict hits.
+Adding a brand is a data change (a line in ids.tsv, see register-id.py)
+rather than an edit to every generator.
+"""
+import os
+import uuid
+
+NAMESPACE = uuid.UUID('8f3a2c1e-5b7d-4e9a-a6c0-1d2e3f4a5b6c')
+
+REGISTRY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ids.tsv')
+
+_HEADER = '''\
+# Pinned seed ids: entity<TAB>natural key<TAB>uuid
+# Keys not listed here get uuid5(NAMESPACE, "entity:key"); an empty uuid
+# pins a key to "no id" (e.g. BigCommerce brands with no brands row).
+# Add entries with register-id.py.
+'''
+
+
+def derived_id(entity, key):
+    """The uuid5 a key gets when it is not pinned"""
+    return str(uuid.uuid5(NAMESPACE, f'{entity}:{key}'))
+
+
+class IdRegistry:
+    """Pinned ids from a registry file plus derived ids for everything else"""
+
+    def __init__(self, path=REGISTRY_FILE):
+        self.path = path
+        # entity -> {key: uuid or None}, in file order
+        self.pinned = {}
+        self._derived = {}
+        self.dirty = False
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.rstrip('\n')
+                if not line or line.startswith('#'):
+                    continue
+                try:
+                    entity, key, value = line.split('\t')
+                except ValueError:
+                    raise ValueError(f'{self.path}:{line_number}: expected entity<TAB>key<TAB>uuid') from None
+                self.pinned.setdefault(entity, {})[key] = str(uuid.UUID(value)) if value else None
+
+    def get(self, entity, key):
+        """Id for ``key``: the pinned one (possibly None) or its derived uuid5"""
+        pinned = self.pinned.get(entity)
+        if pinned is not None and key in pinned:
+            return pinned[key]
+        cache_key = (entity, key)
+        value = self._derived.get(cache_key)
+        if value is None:
+            value = self._derived[cache_key] = derived_id(entity, key)
+        return value
+
+    def lookup(self, entity, key):
+        """Pinned id for ``key``, or None when it is not registered"""
+        return self.pinned.get(entity, {}).get(key)
+
+    def items(self, entity):
+        """(key, id) pairs pinned for ``entity``, in file order"""
+        return list(self.pinned.get(entity, {}).items())
+
+    def pin(self, entity, key, value=None):
+        """Register ``key``; ``value`` defaults to its derived uuid5. Returns the id
+
+        Re-registering a key is a no-op unless it asks for a different id.
+        """
+        existing = self.pinned.get(entity, {})
+        if value is None and key in existing:
+            return existing[key]
+        if value is None:
+            value = derived_id(entity, key)
+        elif value:
+            value = str(uuid.UUID(value))
+        else:
+            value = None
+        if key in existing and existing[key] != value:
+            raise ValueError(f'{entity} {key} is already registered as {existing[key]}')
+        if key not in existing:
+            self.pinned.setdefault(entity, {})[key] = value
+            self.dirty = True
+        return value
+
+    def save(self):
+        """Write pinned ids back to the registry file if anything changed"""
+        if not self.dirty:
+            return
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(_HEADER)
+            for entity, keys in self.pinned.items():
+                for key, value in keys.items():
+                    f.write(f'{entity}\t{key}\t{value or ""}\n')
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+_registry = None
+
+
+def registry():
+    """The process-wide registry, loaded from REGISTRY_FILE on first use"""
+    global _registry
+    if _registry is None:
+        _registry = IdRegistry()
+    return _registry
@@ -0,0 +1,108 @@
+"""Render table rows as seed SQL
+
+Every renderer is a generator of text chunks so callers can write output
+as it is produced instead of assembling the whole seed in memory.
+"""
+from itertools import islice
+
+from seed_pipeline.sql import copy_text, sql_literal
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def insert_columns(table):
+    """Column list for INSERT output: row columns followed by defaults"""
+    return list(table.columns) + [column for column, _ in table.defaults]
+
+
+def conflict_clause(table):
+    """ON CONFLICT clause that updates every non-key row column from EXCLUDED"""
+    key = ', '.join(table.key)
+    updates = [f'{column} = EXCLUDED.{column}' for column in table.columns if column not in table.key]
+    if not updates:
+        return f'ON CONFLICT ({key}) DO NOTHING'
+    return f'ON CONFLICT ({key}) DO UPDATE SET\n    ' + ',\n    '.join(updates)
+
+
+def render_inserts(table, rows, upsert=False):
+    """Yield one multi-line INSERT statement per row"""
+    columns = ', '.join(insert_columns(table))
+    defaults = [f'    {expr}' for _, expr in table.defaults]
+    suffix = '\n' + conflict_clause(table) if upsert else ''
+    for row in rows:
+        values = [f'    {sql_literal(value)}' for value in row] + defaults
+        body = ',\n'.join(values)
+        yield f'INSERT INTO {table.name} (\n    {columns}\n) VALUES (\n{body}\n){suffix};\n'
+
+
+def render_batched_inserts(table, rows, batch_size=DEFAULT_BATCH_SIZE, upsert=False):
+    """Yield multi-row INSERT statements of up to ``batch_size`` rows each
+
+    For clients that cannot run COPY (SQL editors, transaction poolers).
+    With ``upsert`` every statement ends in ON CONFLICT ... DO UPDATE so the
+    output can be re-applied to a populated database.
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    header = f"INSERT INTO {table.name} ({', '.join(insert_columns(table))}) VALUES\n"
+    defaults = ''.join(f', {expr}' for _, expr in table.defaults)
+    suffix = '\n' + conflict_clause(table) if upsert else ''
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        values = ',\n'.join('(' + ', '.join([sql_literal(value) for value in row]) + defaults + ')'
+                            for row in batch)
+        yield f'{header}{values}{suffix};\n'
+
+
+def render_copy(table, rows):
+    """Yield a COPY ... FROM stdin block in PostgreSQL text format
+
+    Columns listed in ``table.defaults`` are left out so the schema default
+    applies. The block must be run through psql (or another client that
+    speaks the COPY protocol).
+    """
+    yield f"COPY {table.name} ({', '.join(table.columns)}) FROM stdin;\n"
+    for row in rows:
+        yield '\t'.join([copy_text(value) for value in row]) + '\n'
+    yield '\\.\n'
+
+
+def key_indexes(table):
+    """Positions of the primary key columns within a row"""
+    return [table.columns.index(column) for column in table.key]
+
+
+def key_condition(table, key):
+    """WHERE condition matching one primary key value tuple"""
+    return ' AND '.join(f'{column} = {sql_literal(value)}' for column, value in zip(table.key, key))
+
+
+def render_updates(table, changes):
+    """Yield one UPDATE per (row, changed columns) pair, setting only those columns"""
+    positions = {column: i for i, column in enumerate(table.columns)}
+    indexes = key_indexes(table)
+    for row, columns in changes:
+        sets = ',\n    '.join(f'{column} = {sql_literal(row[positions[column]])}' for column in columns)
+        key = [row[i] for i in indexes]
+        yield f'UPDATE {table.name} SET\n    {sets}\nWHERE {key_condition(table, key)};\n'
+
+
+def render_deletes(table, keys, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield DELETE statements covering ``keys`` (primary key value tuples)"""
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+    if len(table.key) == 1:
+        target = table.key[0]
+        literal = lambda key: sql_literal(key[0])
+    else:
+        target = '(' + ', '.join(table.key) + ')'
+        literal = lambda key: '(' + ', '.join([sql_literal(value) for value in key]) + ')'
+    keys = iter(keys)
+    while True:
+        batch = list(islice(keys, batch_size))
+        if not batch:
+            break
+        yield f"DELETE FROM {table.name} WHERE {target} IN ({', '.join([literal(key) for key in batch])});\n"
@@ -0,0 +1,112 @@
+"""Many fixed-string substitutions in one pass over a seed
+
+Rewriter compiles a substitution table into a single regular expression:
+one alternation of every pattern, longest first, next to the SQL tokens
+whose insides must not be touched ('...' and E'...' strings, dollar
+quotes, "quoted" identifiers, -- and /* */ comments, and COPY data
+rows). The regex engine finds the next pattern or protected token
+in one scan, so the cost of a pass follows the size of the seed, not
+lines times patterns. Protected tokens are stepped over whole; a pattern
+matches only where the SQL around it is code.
+
+A pattern may contain whole literals, such as ``('acid-rain',``, but not
+open one: the end of every match must be code as well, so a table
+entry that starts a literal and leaves it unclosed is rejected.
+Literals that never close run to the end of the data, as they do in
+PostgreSQL.
+"""
+import re
+from collections import Counter
+
+# COPY data rows, from the line after "FROM stdin;" to the \. line
+_COPY_DATA = rb'(?<=(?i:stdin);\n).*?(?:^\\\.$|\Z)'
+_PROTECTED = (
+    rb"(?<![\w$])[Ee]'(?:[^'\\]|\\.|'')*(?:'|\Z)",
+    rb"'(?:[^']|'')*(?:'|\Z)",
+    rb'"(?:[^"]|"")*(?:"|\Z)',
+    rb'(?<![\w$])(?P<tag>\$[A-Za-z_]*\$)(?:.*?(?P=tag)|.*\Z)',
+    rb'--[^\n]*',
+    rb'/\*.*?(?:\*/|\Z)',
+)
+_FLAGS = re.S | re.M
+_LITERAL = re.compile(b'|'.join(_PROTECTED), _FLAGS)
+
+
+def _encode(value):
+    return value.encode('utf-8') if isinstance(value, str) else value
+
+
+def _closes(pattern):
+    """Whether every literal or comment that ``pattern`` opens also closes in it
+
+    A token left open runs on past the end of the pattern into whatever
+    follows, here a NUL.
+    """
+    return all(match.end() <= len(pattern) for match in _LITERAL.finditer(pattern + b'\x00'))
+
+
+class Rewriter:
+    """Applies a {pattern: replacement} table outside SQL literals and comments
+
+    Patterns and replacements are str or bytes; a replacement may also be
+    a function of the matched bytes returning the new bytes. ``counts``
+    tallies the replacements made, by pattern.
+    """
+
+    def __init__(self, table):
+        self.table = {}
+        for pattern, replacement in table.items():
+            pattern = _encode(pattern)
+            if not pattern:
+                raise ValueError('empty pattern')
+            if not _closes(pattern):
+                raise ValueError(f'pattern {pattern!r} opens a literal or comment it does not close')
+            self.table[pattern] = replacement if callable(replacement) else _encode(replacement)
+        alternation = b'|'.join(re.escape(pattern) for pattern in sorted(self.table, key=len, reverse=True))
+        # COPY data goes first so that no pattern matches at the start of
+        # its first row; patterns go before literals so they may start with one
+        self.regex = re.compile(b'|'.join((_COPY_DATA, b'(?P<pattern>' + alternation + b')') + _PROTECTED), _FLAGS)
+        self.counts = Counter()
+
+    def chunks(self, data):
+        """Yield ``data`` (bytes, or a memoryview/mmap) with the table applied, in pieces"""
+        if not self.table:
+            yield data
+            return
+        pos = 0
+        scan = 0
+        search = self.regex.search
+        while True:
+            match = search(data, scan)
+            if match is None:
+                break
+            pattern = match.group('pattern')
+            if pattern is None:
+                scan = match.end()
+                continue
+            start, end = match.span()
+            if pattern[-1:] in b'\'"' and data[end:end + 1] == pattern[-1:]:
+                # The pattern's closing quote is the first of a doubled
+                # one, so the literal goes on; step over it instead
+                literal = _LITERAL.match(data, start)
+                scan = literal.end() if literal else start + 1
+                continue
+            replacement = self.table[pattern]
+            if callable(replacement):
+                replacement = replacement(pattern)
+            self.counts[pattern] += 1
+            yield data[pos:start]
+            yield replacement
+            pos = scan = end
+        yield data[pos:]
+
+    def rewrite(self, data, out):
+        """Write ``data`` with the table applied to binary ``out``; returns the number of replacements"""
+        before = sum(self.counts.values())
+        for chunk in self.chunks(data):
+            out.write(chunk)
+        return sum(self.counts.values()) - before
+
+    def sub(self, text):
+        """``text`` (str) with the table applied"""
+        return b''.join(self.chunks(text.encode('utf-8'))).decode('utf-8')
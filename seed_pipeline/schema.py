@@ -0,0 +1,36 @@
+"""Table relationships read from supabase/migrations
+
+foreign_keys finds every REFERENCES clause in the migrations, both the
+``ALTER TABLE ONLY ... ADD CONSTRAINT ... FOREIGN KEY`` statements of the
+dumped init schema and inline column references in later CREATE TABLEs,
+and attributes it to the table being created or altered. Self references
+are left out.
+"""
+import os
+import re
+
+_NAME = r'(?:"?(?:public|auth)"?\.)?"?(\w+)"?'
+_TABLE_OR_REFERENCE = re.compile(
+    r'\b(?:CREATE\s+TABLE(?:\s+IF\s+NOT\s+EXISTS)?|ALTER\s+TABLE(?:\s+ONLY)?)\s+' + _NAME
+    + r'|\bREFERENCES\s+' + _NAME
+    # Anything else that is created ends the current table's statements
+    + r'|\bCREATE\s+(?:OR\s+REPLACE\s+)?(?:FUNCTION|VIEW|UNIQUE|INDEX|POLICY|TRIGGER|TYPE)\b', re.I)
+
+
+def foreign_keys(migrations_dir):
+    """{table: set of tables it references}, from every migration in order"""
+    references = {}
+    for name in sorted(os.listdir(migrations_dir)):
+        if not name.endswith('.sql'):
+            continue
+        with open(os.path.join(migrations_dir, name), encoding='utf-8') as f:
+            sql = f.read()
+        table = None
+        for match in _TABLE_OR_REFERENCE.finditer(sql):
+            if match.group(1):
+                table = match.group(1)
+            elif match.group(2) is None:
+                table = None
+            elif table is not None and match.group(2) != table:
+                references.setdefault(table, set()).add(match.group(2))
+    return references
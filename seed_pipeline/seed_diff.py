@@ -0,0 +1,204 @@
+"""Row-level differences between two seed files
+
+Both seeds are read with the validator's tokenizer (see
+seed_pipeline.validate), so INSERT rows and COPY rows are compared by
+value rather than by text: every value is brought to one canonical form
+(the text PostgreSQL would store, or None for NULL), whichever quoting,
+cast or COPY escape the seed used for it. Values the server computes,
+NOW(), are left out like the columns COPY leaves to their defaults, so
+a seed in COPY format and the same seed in INSERT format have no
+differences.
+
+Rows are keyed by table and primary key (seed_index.TABLE_KEYS, else
+``id``); rows without those columns are keyed by all of their values.
+That covers the generators' product_categories links, read from their
+INSERT ... SELECT ... FROM (VALUES ...) as (product_id, slug) rows.
+Statements whose rows cannot be read at all (each Summary's ``unread``)
+are compared by text instead; see unmatched_statements.
+The old seed is reduced to a map of keys to row digests in one pass; the
+new seed is then streamed against it, so memory follows the number of
+rows, not their size. Only the changed rows are kept whole, and a last
+pass over the old seed fetches their old values for the column detail.
+"""
+import hashlib
+import re
+from collections import Counter, namedtuple
+
+from seed_pipeline.seed_index import TABLE_KEYS
+from seed_pipeline.sql import array_text
+from seed_pipeline.validate import validate_file
+
+# ``added`` and ``removed`` are keys; ``changed`` are RowChanges
+TableDiff = namedtuple('TableDiff', 'table added removed changed unchanged')
+# ``columns`` are (column, old value, new value); MISSING stands for a column one seed does not set
+RowChange = namedtuple('RowChange', 'key columns')
+
+MISSING = object()
+
+# Values the server fills in; rows are compared without them
+SERVER_VALUES = frozenset((b'NOW()', b'now()', b'CURRENT_TIMESTAMP'))
+
+_CAST = re.compile(rb'\s*::\s*[\w ."]+(?:\[\])?\Z')
+_DOLLAR_QUOTED = re.compile(rb'(\$\w*\$)(.*)\1\Z', re.S)
+_ARRAY = re.compile(rb'ARRAY\s*\[(.*)\]\Z', re.S | re.I)
+_ELEMENT = re.compile(rb"\s*('(?:[^']|'')*'|(\$\w*\$).*?\2|[^,]+?)\s*(?:,|\Z)", re.S)
+_BACKSLASH = re.compile(r"\\(.)|''", re.S)
+_COPY_ESCAPE = re.compile(r'\\(.)', re.S)
+_ESCAPED = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+
+
+def _unescape(match):
+    char = match.group(1)
+    if char is None:
+        return "'"
+    return _ESCAPED.get(char, char)
+
+
+def sql_value(raw):
+    """Canonical value of one SQL literal as written in a VALUES row"""
+    if raw[:1] == b"'" and raw[-1:] == b"'":
+        # The common case, and one no cast can follow
+        return raw[1:-1].replace(b"''", b"'").decode('utf-8', 'replace')
+    raw = _CAST.sub(b'', raw)
+    upper = raw.upper()
+    if upper == b'NULL':
+        return None
+    if upper == b'TRUE':
+        return 't'
+    if upper == b'FALSE':
+        return 'f'
+    if raw[:1] == b"'":
+        return raw[1:-1].replace(b"''", b"'").decode('utf-8', 'replace')
+    if raw[:2] in (b"E'", b"e'"):
+        return _BACKSLASH.sub(_unescape, raw[2:-1].decode('utf-8', 'replace'))
+    dollar = _DOLLAR_QUOTED.match(raw)
+    if dollar is not None:
+        return dollar.group(2).decode('utf-8', 'replace')
+    array = _ARRAY.match(raw)
+    if array is not None:
+        elements = array.group(1)
+        if not elements.strip():
+            return '{}'
+        return array_text([sql_value(match.group(1)) for match in _ELEMENT.finditer(elements) if match.group(1)])
+    return raw.decode('utf-8', 'replace')
+
+
+def copy_value(raw):
+    """Canonical value of one COPY text field"""
+    if raw == b'\\N':
+        return None
+    text = raw.decode('utf-8', 'replace')
+    if '\\' not in text:
+        return text
+    return _COPY_ESCAPE.sub(_unescape, text)
+
+
+def _digest(row):
+    parts = []
+    for column in sorted(row):
+        value = row[column]
+        parts.append(column + ('\x1f' if value is None else '\x1e' + value))
+    return hashlib.blake2b('\x1d'.join(parts).encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+def _key_columns(table, columns):
+    """Columns that key ``table``'s rows, or None to key by the whole row"""
+    key = TABLE_KEYS.get(table, ('id',))
+    return key if all(column in columns for column in key) else None
+
+
+def read_rows(path, on_row):
+    """Call ``on_row(table, key, row)`` for every row of a seed; returns its validate.Summary
+
+    ``row`` maps column names to canonical values; ``key`` is a tuple.
+    """
+    key_columns = {}
+
+    def row_seen(table, columns, values, offset, copy):
+        if copy:
+            row = dict(zip(columns, map(copy_value, values)))
+        else:
+            row = {column: sql_value(value) for column, value in zip(columns, values) if value not in SERVER_VALUES}
+        names = key_columns.get((table, tuple(columns)), MISSING)
+        if names is MISSING:
+            names = key_columns[table, tuple(columns)] = _key_columns(table, columns)
+        if names is None:
+            key = tuple(row[column] for column in sorted(row))
+        else:
+            key = tuple(row[column] for column in names)
+        on_row(table, key, row)
+
+    return validate_file(path, row_seen)
+
+
+def row_digests(path):
+    """{table: {key: row digest}} for a seed, and its validate.Summary"""
+    tables = {}
+
+    def add(table, key, row):
+        rows = tables.get(table)
+        if rows is None:
+            rows = tables[table] = {}
+        rows[key] = _digest(row)
+
+    return tables, read_rows(path, add)
+
+
+def changed_columns(old, new):
+    """(column, old value, new value) for every column that differs, in the new row's order"""
+    columns = list(new) + [column for column in old if column not in new]
+    return [(column, old.get(column, MISSING), new.get(column, MISSING)) for column in columns
+            if old.get(column, MISSING) != new.get(column, MISSING)]
+
+
+def diff_seeds(old_path, new_path):
+    """Compare two seeds row by row
+
+    Returns a TableDiff per table that either seed writes, ordered by
+    table name, and both seeds' validate.Summary.
+    """
+    old, old_summary = row_digests(old_path)
+    added = {}
+    changed = {}  # table -> {key: new row}
+    unchanged = {}
+
+    def compare(table, key, row):
+        digests = old.get(table, {})
+        digest = digests.pop(key, None)
+        if digest is None:
+            added.setdefault(table, []).append(key)
+        elif digest != _digest(row):
+            changed.setdefault(table, {})[key] = row
+        else:
+            unchanged[table] = unchanged.get(table, 0) + 1
+
+    new_summary = read_rows(new_path, compare)
+
+    old_rows = {}
+    if changed:
+        def fetch(table, key, row):
+            if key in changed.get(table, ()):
+                old_rows[table, key] = row
+        read_rows(old_path, fetch)
+
+    diffs = []
+    for table in sorted(set(old) | set(added) | set(changed) | set(unchanged)):
+        changes = [RowChange(key, changed_columns(old_rows[table, key], row))
+                   for key, row in changed.get(table, {}).items()]
+        diffs.append(TableDiff(table, added.get(table, []), sorted(old.get(table, {}), key=repr), changes,
+                               unchanged.get(table, 0)))
+    return diffs, old_summary, new_summary
+
+
+def unmatched_statements(old_summary, new_summary):
+    """Lines of the unread statements of each seed that the other seed does not repeat verbatim
+
+    Returns (old lines, new lines). Rows such statements write are not
+    compared, so a seed pair with any of them cannot be called equal.
+    """
+    old = Counter(unread.digest for unread in old_summary.unread)
+    new = Counter(unread.digest for unread in new_summary.unread)
+    old_only = old - new
+    new_only = new - old
+    return ([unread.line for unread in old_summary.unread if old_only[unread.digest]],
+            [unread.line for unread in new_summary.unread if new_only[unread.digest]])
@@ -0,0 +1,241 @@
+"""Single-pass section and statement index for seed SQL files
+
+index_seed walks the raw bytes of a seed once with a tokenizer that
+understands quoted literals, dollar quoting, ``--`` comments and COPY
+data blocks. It records byte ranges for every section and statement,
+so callers can slice ``data[start:end]`` directly instead of searching
+for marker strings again.
+
+Section headers are the comment banners the seeds already use:
+
+    -- ======================================
+    -- 🛍️ Products
+    -- ======================================
+
+A header is a comment line right after a ``-- ====`` rule, or a
+comment line that opens a comment block and is followed by a rule (as
+in ``-- 🔗 Product Categories``). A section runs from its banner to the
+next banner. Bytes before the first banner belong to no section.
+"""
+import re
+from bisect import bisect_right
+from collections import namedtuple
+
+from seed_pipeline.tables import BRANDS, MEDIA_LIBRARY, MEDIA_USAGE, PRODUCT_CATEGORIES, PRODUCTS
+
+# Primary key columns of the tables the generators write; anything else
+# is assumed to be keyed on ``id``
+TABLE_KEYS = {table.name: table.key for table in (BRANDS, MEDIA_LIBRARY, MEDIA_USAGE, PRODUCT_CATEGORIES, PRODUCTS)}
+
+Section = namedtuple('Section', 'name start end')
+
+# kind: leading keyword (INSERT, UPDATE, COPY, ...); key: primary key
+# value as text (a tuple for composite keys) when the statement touches
+# exactly one row that can be read from the statement itself, else None
+Statement = namedtuple('Statement', 'kind table key start end')
+
+# Outside statements only whitespace and comments need to be told apart
+_SPACE = re.compile(rb'\s+')
+_COMMENT = re.compile(rb'--[^\n]*')
+# Inside a statement, everything up to a top-level ';' (or a dollar quote,
+# handled separately) is consumed in one match
+_BODY = re.compile(rb"(?:[^'$;-]+|'(?:[^']|'')*'|--[^\n]*|-|\$(?![A-Za-z_]*\$))*")
+_DOLLAR = re.compile(rb'\$([A-Za-z_]*)\$.*?(?:\$\1\$|\Z)', re.S)
+
+_RULE = re.compile(rb'--\s*={4,}\s*$')
+_COPY_FROM_STDIN = re.compile(rb'\s*COPY\b.*\bFROM\s+stdin\b', re.S | re.I)
+_COPY_END = re.compile(rb'^\\\.\r?\n?', re.M)
+
+_HEAD = re.compile(rb'\s*(INSERT\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?|COPY|SELECT|[A-Za-z]+)'
+                   rb'(?:\s+(?:ONLY\s+)?("?[\w.]+"?))?', re.I)
+_INSERT_VALUES = re.compile(rb'\s*\(([^)]*)\)\s*VALUES\s*\(', re.I)
+_VALUE_TOKENS = re.compile(rb"'(?:[^']|'')*'|(\$[A-Za-z_]*\$).*?\1|[(\[]|[)\]]|,|[^'()\[\],$]+|\$", re.S)
+# Rest of a row tuple after the key values, allowing one level of nested parens
+_TUPLE_REST = re.compile(rb"(?:'(?:[^']|'')*'|(\$[A-Za-z_]*\$).*?\1|[^'()$]+|\$|"
+                         rb"\((?:[^'()]|'(?:[^']|'')*')*\))*\)", re.S)
+_DOLLAR_QUOTED = re.compile(r'(\$[A-Za-z_]*\$)(.*)\1', re.S)
+_WHERE_KEY = re.compile(rb"\bWHERE\s+(\w+)\s*=\s*('(?:[^']|'')*'|[\w.-]+)\s*;?\s*$", re.I)
+
+
+class SeedIndex(namedtuple('SeedIndex', 'sections statements')):
+    """Sections and statements of one seed, both in file order"""
+    __slots__ = ()
+
+    def section(self, name):
+        """First section whose title contains ``name``, or None"""
+        for section in self.sections:
+            if name in section.name:
+                return section
+        return None
+
+    def sections_named(self, name):
+        """Every section whose title contains ``name``"""
+        return [section for section in self.sections if name in section.name]
+
+    def statements_in(self, section):
+        """Statements that start inside ``section``"""
+        starts = [statement.start for statement in self.statements]
+        lo = bisect_right(starts, section.start - 1)
+        hi = bisect_right(starts, section.end - 1)
+        return self.statements[lo:hi]
+
+    def find(self, table, key):
+        """Statements writing the row ``key`` (text, or tuple for composite keys) of ``table``"""
+        return [statement for statement in self.statements
+                if statement.table == table and statement.key == key]
+
+
+def _unquote(literal):
+    text = literal.decode('utf-8', 'replace')
+    if text.startswith("'") and text.endswith("'"):
+        return text[1:-1].replace("''", "'")
+    dollar = _DOLLAR_QUOTED.fullmatch(text)
+    if dollar is not None:
+        return dollar.group(2)
+    return text
+
+
+def _insert_key(body, key_columns):
+    match = _INSERT_VALUES.match(body)
+    if match is None:
+        return None
+    columns = [name.strip().strip(b'"').decode() for name in match.group(1).split(b',')]
+    try:
+        positions = [columns.index(column) for column in key_columns]
+    except ValueError:
+        return None
+    needed = max(positions) + 1
+    values = []
+    value = []
+    depth = 0
+    pos = match.end()
+    closed = False
+    for token in _VALUE_TOKENS.finditer(body, pos):
+        text = token.group()
+        pos = token.end()
+        if text in (b'(', b'['):
+            depth += 1
+        elif text in (b')', b']'):
+            if depth == 0:
+                values.append(b''.join(value).strip())
+                closed = True
+                break
+            depth -= 1
+        elif text == b',' and depth == 0:
+            values.append(b''.join(value).strip())
+            value = []
+            if len(values) == needed:
+                break
+            continue
+        value.append(text)
+    if len(values) < needed:
+        return None
+    if not closed:
+        rest = _TUPLE_REST.match(body, pos)
+        if rest is None:
+            return None
+        pos = rest.end()
+    # A second row tuple means the statement has no single key
+    if body[pos:pos + 64].lstrip()[:1] == b',':
+        return None
+    key = tuple(_unquote(values[i]) for i in positions)
+    return key[0] if len(key) == 1 else key
+
+
+def describe_statement(data, start, end):
+    """Kind, table and single-row key of the statement at data[start:end]"""
+    head = _HEAD.match(data, start, end)
+    if head is None:
+        return None, None, None
+    kind = b' '.join(head.group(1).split()).upper().decode()
+    table = head.group(2).strip(b'"').decode() if head.group(2) else None
+    key = None
+    if table:
+        key_columns = TABLE_KEYS.get(table, ('id',))
+        if kind == 'INSERT INTO':
+            key = _insert_key(data[head.end():end], key_columns)
+        elif kind in ('UPDATE', 'DELETE FROM') and len(key_columns) == 1:
+            where = _WHERE_KEY.search(data[head.end():end])
+            if where is not None and where.group(1).decode() == key_columns[0]:
+                key = _unquote(where.group(2))
+    return kind.split()[0], table, key
+
+
+def _banners(lines):
+    """Yield (title, start) for section headers in one block of comment lines"""
+    rules = [_RULE.match(text) is not None for _, text in lines]
+    for i, (start, text) in enumerate(lines):
+        if rules[i]:
+            continue
+        if i > 0 and rules[i - 1]:
+            title = text[2:].strip().decode('utf-8', 'replace')
+            yield title, lines[i - 1][0]
+        elif i == 0 and len(lines) > 1 and rules[1]:
+            yield text[2:].strip().decode('utf-8', 'replace'), start
+
+
+def index_seed(data):
+    """Index seed SQL ``data`` (bytes, or a memoryview/mmap) in one pass"""
+    statements = []
+    banners = []
+    block = []  # consecutive top-level comment lines: (start, text)
+    statement_start = None
+    pos = 0
+    size = len(data)
+
+    while pos < size:
+        if statement_start is not None:
+            pos = _BODY.match(data, pos).end()
+            char = data[pos:pos + 1]
+            if char == b'$':
+                pos = _DOLLAR.match(data, pos).end()
+                continue
+            if char != b';':
+                # Unterminated literal or end of input
+                pos = size
+                break
+            pos += 1
+            if _COPY_FROM_STDIN.match(data, statement_start, pos):
+                # The data rows belong to the COPY statement and are not SQL
+                copy_end = _COPY_END.search(data, pos)
+                pos = copy_end.end() if copy_end else size
+            elif data[pos:pos + 1] == b'\n':
+                pos += 1
+            statements.append(Statement(*describe_statement(data, statement_start, pos), statement_start, pos))
+            statement_start = None
+            continue
+
+        match = _SPACE.match(data, pos)
+        if match is not None:
+            pos = match.end()
+            if block and match.group().count(b'\n') > 1:
+                banners.extend(_banners(block))
+                block = []
+            continue
+        match = _COMMENT.match(data, pos)
+        if match is not None:
+            pos = match.end()
+            block.append((match.start(), match.group()))
+            continue
+        if block:
+            banners.extend(_banners(block))
+            block = []
+        statement_start = pos
+
+    if block:
+        banners.extend(_banners(block))
+    if statement_start is not None:
+        statements.append(Statement(*describe_statement(data, statement_start, size), statement_start, size))
+
+    sections = []
+    for i, (title, start) in enumerate(banners):
+        end = banners[i + 1][1] if i + 1 < len(banners) else size
+        sections.append(Section(title, start, end))
+    return SeedIndex(sections, statements)
+
+
+def read_seed_index(path):
+    """Read and index a seed file; returns (data, SeedIndex)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return data, index_seed(data)
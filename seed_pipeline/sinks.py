@@ -0,0 +1,110 @@
+"""Binary output targets for rendered seed SQL
+
+open_sink turns an --output value into a file-like object that the
+renderers write chunk by chunk, so no target ever holds the whole seed:
+
+- ``path.sql``: a plain file
+- ``path.sql.gz``: gzip
+- ``path.sql.zst``: zstd, through the zstandard module if it is
+  installed, else the zstd command line tool
+- ``-``: standard output
+- ``psql:<connection string>``: stdin of a psql process, so the database
+  loads statements while later ones are still being generated. An empty
+  connection string uses psql's defaults (PGHOST, PGDATABASE, ...).
+"""
+import gzip
+import os
+import shutil
+import subprocess
+import sys
+from contextlib import contextmanager
+
+PSQL_PREFIX = 'psql:'
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class SinkError(Exception):
+    """A sink's process (psql or zstd) exited with an error"""
+
+
+def sink_path(target):
+    """File that ``target`` writes, or None for stdout and psql"""
+    if target == '-' or target.startswith(PSQL_PREFIX):
+        return None
+    return target
+
+
+def is_compressed(target):
+    return target.endswith(('.gz', '.zst'))
+
+
+def _make_parent(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+@contextmanager
+def _process_sink(args, what, stdout=None):
+    """stdin of a subprocess; raises SinkError if it exits non-zero"""
+    try:
+        process = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=stdout)
+    except FileNotFoundError:
+        raise SinkError(f'{args[0]} not found') from None
+    try:
+        yield process.stdin
+    except BrokenPipeError:
+        pass  # the process has stopped reading; its exit status says why
+    finally:
+        try:
+            process.stdin.close()
+        except BrokenPipeError:
+            pass
+        returncode = process.wait()
+    if returncode:
+        raise SinkError(f'{what} exited with status {returncode}')
+
+
+@contextmanager
+def _zstd_file(path):
+    try:
+        import zstandard
+    except ImportError:
+        zstandard = None
+    if zstandard is not None:
+        with open(path, 'wb') as f, zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(f) as out:
+            yield out
+        return
+    zstd = shutil.which('zstd')
+    if zstd is None:
+        raise SinkError('writing .zst needs the zstandard module or the zstd command')
+    with _process_sink([zstd, '-q', '-f', f'-{ZSTD_LEVEL}', '-o', path], 'zstd') as out:
+        yield out
+
+
+@contextmanager
+def _stdout():
+    out = sys.__stdout__.buffer
+    yield out
+    out.flush()
+
+
+def open_sink(target):
+    """Context manager yielding a binary file-like object for ``target`` (see module docstring)"""
+    if target == '-':
+        return _stdout()
+    if target.startswith(PSQL_PREFIX):
+        conninfo = target[len(PSQL_PREFIX):]
+        args = ['psql', '-X', '-q', '-v', 'ON_ERROR_STOP=1']
+        if conninfo:
+            args += ['-d', conninfo]
+        # psql's own output would otherwise mix with ours on stdout
+        return _process_sink(args, 'psql', stdout=subprocess.DEVNULL)
+    _make_parent(target)
+    if target.endswith('.gz'):
+        return gzip.open(target, 'wb', compresslevel=GZIP_LEVEL)
+    if target.endswith('.zst'):
+        return _zstd_file(target)
+    return open(target, 'wb')
@@ -0,0 +1,73 @@
+"""Declarative CSV -> table column specs
+
+A spec is an ordered tuple of Column entries. compile_spec resolves it
+against an export header once and returns a function that turns a raw
+csv row (a list) into a tuple of column values, with no per-row dict or
+header lookups.
+"""
+from collections import namedtuple
+from operator import itemgetter
+
+# target: table column; source: CSV header (None for constants);
+# converter: raw cell -> value; default: value used when the source
+# header is absent (or for constants)
+Column = namedtuple('Column', 'target source converter default')
+
+
+def column(target, source, converter=None, default=None):
+    return Column(target, source, converter, default)
+
+
+def const(target, value):
+    """A column that always holds the same value"""
+    return Column(target, None, None, value)
+
+
+def _identity(value):
+    return value
+
+
+def _constant(value):
+    def convert(_):
+        return value
+    return convert
+
+
+def compile_spec(spec, columns, overrides=None):
+    """Compile ``spec`` against a header index into a row -> tuple converter
+
+    ``overrides`` maps target columns to replacement converters, e.g. to
+    plug in a different description cleaner without touching the spec.
+    """
+    overrides = overrides or {}
+    indexes = []
+    converters = []
+    for entry in spec:
+        index = columns.get(entry.source) if entry.source else None
+        if index is None:
+            # Constants still need a slot in the itemgetter; their
+            # converter ignores whatever cell it is handed
+            indexes.append(0)
+            converters.append(_constant(entry.default))
+        else:
+            indexes.append(index)
+            converters.append(overrides.get(entry.target, entry.converter) or _identity)
+
+    getter = itemgetter(*indexes)
+    if len(indexes) == 1:
+        single = getter
+        getter = lambda row: (single(row),)
+    converters = tuple(converters)
+    width = max(indexes) + 1
+
+    def convert(row):
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+        return tuple([f(v) for f, v in zip(converters, getter(row))])
+
+    return convert
+
+
+def spec_columns(spec):
+    """Target column names of a spec, in order"""
+    return tuple(entry.target for entry in spec)
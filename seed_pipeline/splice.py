@@ -0,0 +1,70 @@
+"""Copy-free splicing of seed files
+
+A seed is memory-mapped and indexed (see seed_pipeline.seed_index), and
+a new seed is written by streaming the unchanged byte ranges of the
+mapping straight to the output with only the replaced ranges
+re-rendered. No full copy of the source is ever built, so rewriting a
+seed costs roughly constant memory beyond the page cache.
+"""
+import mmap
+from collections import namedtuple
+from contextlib import contextmanager
+
+from seed_pipeline.seed_index import index_seed
+
+# Bytes [start, end) of the source are replaced by ``chunks``, an
+# iterable of str or bytes-like objects (rendered SQL, or slices of
+# another mapped seed)
+Replacement = namedtuple('Replacement', 'start end chunks')
+
+
+@contextmanager
+def open_seed(path):
+    """Memory-map a seed read-only; yields (data, SeedIndex)"""
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            # Zero-length files cannot be mapped
+            yield b'', index_seed(b'')
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            view = memoryview(data)
+            try:
+                yield view, index_seed(data)
+            finally:
+                view.release()
+
+
+def replace(section_or_statement, *chunk_iterables):
+    """Replacement for a whole Section or Statement"""
+    def chunks():
+        for iterable in chunk_iterables:
+            yield from iterable
+    return Replacement(section_or_statement.start, section_or_statement.end, chunks())
+
+
+def write_chunks(out, chunks):
+    """Write str (as UTF-8) or bytes-like chunks to a binary file; returns bytes written"""
+    written = 0
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        written += out.write(chunk)
+    return written
+
+
+def splice(data, replacements, out):
+    """Write ``data`` to binary file ``out`` with ``replacements`` applied
+
+    Replacements may come in any order but must not overlap. Returns the
+    number of bytes written.
+    """
+    pos = 0
+    written = 0
+    for replacement in sorted(replacements, key=lambda r: (r.start, r.end)):
+        if replacement.start < pos:
+            raise ValueError(f'replacement at byte {replacement.start} overlaps the one before it')
+        written += out.write(data[pos:replacement.start])
+        written += write_chunks(out, replacement.chunks)
+        pos = replacement.end
+    written += out.write(data[pos:])
+    return written
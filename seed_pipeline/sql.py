@@ -0,0 +1,116 @@
+"""Value encoders for SQL literals and COPY text format"""
+import json
+import re
+
+
+class SqlExpr(str):
+    """A raw SQL expression such as NOW() that is emitted without quoting"""
+    __slots__ = ()
+
+
+NOW = SqlExpr('NOW()')
+
+# Extra bytes of the shortest dollar quote ($q$...$q$) over '...'; text
+# with more single quotes than this is shorter dollar-quoted
+DOLLAR_QUOTE_OVERHEAD = 4
+
+# Identifier run after each '$' in a value; no tag equal to one of these
+# can close early. Tags stay letters-only so seed_index recognises them.
+_DOLLAR_RUN = re.compile(r'\$(\w*)')
+
+# COPY text format escapes, applied in a single str.translate pass
+_COPY_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\b': '\\b',
+    '\f': '\\f',
+    '\v': '\\v',
+    '\x00': None,
+})
+
+
+def json_text(value):
+    """Text of a json/jsonb value; dicts keep their insertion order"""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def dollar_tag(text):
+    """Shortest $q...$ tag that cannot occur inside ``text``"""
+    if '$' not in text:
+        return '$q$'
+    used = {match.group(1) for match in _DOLLAR_RUN.finditer(text)}
+    name = 'q'
+    while name in used:
+        name += 'q'
+    return f'${name}$'
+
+
+def text_literal(text):
+    """Quote text in its shortest safe form
+
+    Text without single quotes is wrapped as is. Otherwise the quotes are
+    doubled, unless there are more than DOLLAR_QUOTE_OVERHEAD of them, in
+    which case the text is dollar-quoted unchanged. Each form costs a
+    single scan of the value, however large.
+    """
+    if '\x00' in text:
+        text = text.replace('\x00', '')
+    quotes = text.count("'")
+    if not quotes:
+        return f"'{text}'"
+    if quotes <= DOLLAR_QUOTE_OVERHEAD:
+        return "'" + text.replace("'", "''") + "'"
+    tag = dollar_tag(text)
+    return f'{tag}{text}{tag}'
+
+
+def sql_literal(value):
+    """Render a Python value as a SQL literal"""
+    if value is None:
+        return 'NULL'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, SqlExpr):
+        return value
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return 'ARRAY[' + ', '.join(sql_literal(v) for v in value) + ']'
+    if isinstance(value, dict):
+        value = json_text(value)
+    return text_literal(str(value))
+
+
+def _array_element(value):
+    if value is None:
+        return 'NULL'
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{text}"'
+
+
+def array_text(values):
+    """Text form of an array ({"a","b"}), as COPY data and array input take it"""
+    return '{' + ','.join(_array_element(v) for v in values) + '}'
+
+
+def copy_text(value):
+    """Render a Python value as one field of a COPY ... FROM stdin data line"""
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, SqlExpr):
+        raise ValueError(f'SQL expression {value} cannot be written in COPY data')
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        value = array_text(value)
+    elif isinstance(value, dict):
+        value = json_text(value)
+    return str(value).translate(_COPY_ESCAPES)
@@ -0,0 +1,237 @@
+"""Synthetic BigCommerce exports for scale testing
+
+write_export produces a CSV with the real export's header and row layout
+(each Product row followed by its Variant, Image and Video rows) at any
+size. Everything is drawn from one random.Random(seed), so the same
+arguments always give the same file.
+
+Descriptions are built to exercise the cleaners rather than to read
+well: they mix single and double quotes, named and numeric entities,
+``$$`` and ``$$DESC$$`` sequences, ``id=`` and ``type=`` attributes,
+comments and disallowed tags. Brand IDs come from the id registry's
+BigCommerce brand mapping and category IDs from CATEGORY_SLUGS.
+"""
+import csv
+import random
+
+from seed_pipeline.brands import BRAND_MAPPING, BRAND_SLUGS, brand_name
+from seed_pipeline.categories import CATEGORY_SLUGS
+
+EXPORT_HEADER = (
+    'Item', 'ID', 'Name', 'Type', 'SKU', 'Options', 'Inventory Tracking', 'Current Stock',
+    'Low Stock', 'Price', 'Cost Price', 'Retail Price', 'Sale Price', 'Brand ID', 'Channels',
+    'Categories', 'Description', 'Custom Fields', 'Page Title', 'Product URL', 'Meta Description',
+    'Search Keywords', 'Meta Keywords', 'Bin Picking Number', 'UPC/EAN', 'Global Trade Number',
+    'Manufacturer Part Number', 'Free Shipping', 'Fixed Shipping Cost', 'Weight', 'Width', 'Height',
+    'Depth', 'Is Visible', 'Is Featured', 'Warranty', 'Tax Class', 'Product Condition',
+    'Show Product Condition', 'Sort Order', 'Variant Image URL', 'Internal Image URL (Export)',
+    'Image URL (Import)', 'Image Description', 'Image is Thumbnail', 'Image Sort Order',
+    'YouTube ID', 'Video Title', 'Video Description', 'Video Sort Order',
+)
+
+DEFAULT_SEED = 0
+DEFAULT_START_ID = 100000
+
+CDN = 'https://cdn11.bigcommerce.com/s-synthetic'
+
+_BRAND_IDS = sorted(BRAND_MAPPING, key=int)
+_BRAND_NAMES = {bid: brand_name(slug) for bid, uuid in BRAND_MAPPING.items()
+                for slug, brand_uuid in BRAND_SLUGS.items() if uuid and uuid == brand_uuid}
+_CATEGORY_IDS = sorted(CATEGORY_SLUGS, key=int)
+
+_LINES = ('Deluxe', 'Collector\'s', 'Limited Edition', 'Convention Exclusive', '40th Anniversary',
+          'Super Deformed', 'Vinyl', 'Die-cast', '"Hero" Series', 'Mini')
+_THINGS = ('Plush', 'Action Figure', 'Figure Set', 'Model Kit', 'Keychain', 'T-Shirt', 'Poster',
+           'Art Print', 'Blind Box', 'Combo Pack', 'Enamel Pin', 'Statue')
+_WORDS = ('articulated', 'hand-painted', 'poseable', 'soft', 'officially licensed', 'exclusive',
+          'transforming', 'numbered', 'glow-in-the-dark', 'detailed', 'display', 'interchangeable')
+_SIZES = ('XS', 'S', 'M', 'L', 'XL', '2XL', '3XL')
+_COLORS = ('Black', 'White', 'Red', 'Blue', 'Pink', 'Glow')
+_ENTITIES = ('&amp;', '&quot;', '&#39;', '&nbsp;', '&eacute;', '&mdash;', '&trade;', '&#8217;', '&lt;3')
+_TRACKING = (('product', 68), ('none', 29), ('variant', 3))
+
+
+def _choice_weighted(rng, pairs):
+    values, weights = zip(*pairs)
+    return rng.choices(values, weights)[0]
+
+
+def _sentence(rng, name):
+    """One description sentence with quotes, entities and dollar signs mixed in"""
+    words = rng.sample(_WORDS, 3)
+    pieces = [
+        f'This {words[0]} {name} is {words[1]} and {words[2]}',
+        rng.choice((
+            f" &mdash; it's the \"must-have\" of the year",
+            ' (save $$ when you pre-order)',
+            f' {rng.choice(_ENTITIES)} more',
+            ", don't miss it",
+            ' for fans of "classic" designs',
+            ' priced at $$DESC$$ less',
+            '',
+        )),
+        '.',
+    ]
+    return ''.join(pieces)
+
+
+def _description(rng, name, product_id):
+    """HTML description of a few hundred bytes to a few KB"""
+    parts = [f'<div id="product-{product_id}" class="product-description">']
+    for _ in range(rng.randint(1, 6)):
+        kind = rng.random()
+        if kind < 0.45:
+            sentences = ' '.join(_sentence(rng, name) for _ in range(rng.randint(1, 4)))
+            parts.append(f'<p><span style="font-size: {rng.choice((12, 14, 16))}px;">{sentences}</span></p>')
+        elif kind < 0.65:
+            items = ''.join(f'<li>{rng.choice(_WORDS).capitalize()} {rng.choice(_ENTITIES)} {rng.randint(1, 99)}"</li>'
+                            for _ in range(rng.randint(2, 6)))
+            parts.append(f'<ul type="disc" id="features-{rng.randint(1, 9)}">{items}</ul>')
+        elif kind < 0.75:
+            parts.append(f'<p><a href="https://www.example.com/{product_id}?ref=a&amp;b=\'1\'" target="_blank">'
+                         f'<strong>Read more</strong></a></p>')
+        elif kind < 0.85:
+            parts.append(f'<p><img id="img{rng.randint(1, 999)}" src="{CDN}/product_images/uploaded_images/'
+                         f'{product_id}.jpg" alt="{name}" width="500" /></p>')
+        elif kind < 0.92:
+            parts.append('<!-- imported from BigCommerce --><p>Price: $$ <em>TBD</em></p>')
+        else:
+            parts.append('<script type="text/javascript">var price = "$$";</script>'
+                         '<input type="hidden" id="sku" value="\'x\'" />')
+    parts.append('</div>')
+    return '\n'.join(parts)
+
+
+def _price(rng, low, high):
+    return f'{rng.uniform(low, high):.2f}'
+
+
+def _row(values):
+    return [values.get(name, '') for name in EXPORT_HEADER]
+
+
+class _Ids:
+    """Per-item-type ID counters, like BigCommerce's separate sequences"""
+
+    def __init__(self, start):
+        self.next = {'Product': start, 'Variant': start, 'Image': start, 'Video': 1}
+
+    def take(self, item):
+        value = self.next[item]
+        self.next[item] = value + 1
+        return str(value)
+
+
+def synthetic_groups(products, seed=DEFAULT_SEED, start_id=DEFAULT_START_ID,
+                     variant_rate=0.05, images=4, video_rate=0.01):
+    """Yield the rows of each synthetic product group (Product row first)
+
+    ``variant_rate`` and ``video_rate`` are the share of products with
+    variants or a video; ``images`` is the mean image count per product.
+    """
+    rng = random.Random(seed)
+    ids = _Ids(start_id)
+    for _ in range(products):
+        product_id = ids.take('Product')
+        brand_id = rng.choice(_BRAND_IDS)
+        line = f'{rng.choice(_LINES)} {rng.choice(_THINGS)}'
+        name = f"{_BRAND_NAMES.get(brand_id, 'Toynami')} {line} {product_id}"
+        slug = '-'.join(''.join(c if c.isalnum() else ' ' for c in name.lower()).split())
+        sku = f'SYN-{product_id}'
+        price = _price(rng, 4, 400)
+        keywords = rng.sample(_WORDS, 4)
+        tracking = _choice_weighted(rng, _TRACKING)
+        categories = rng.sample(_CATEGORY_IDS, rng.choice((1, 1, 1, 2, 3)))
+        rows = [_row({
+            'Item': 'Product',
+            'ID': product_id,
+            'Name': name,
+            'Type': 'physical',
+            'SKU': sku,
+            'Inventory Tracking': tracking,
+            'Current Stock': str(rng.randint(0, 500)),
+            'Low Stock': str(rng.choice((0, 0, 5, 10))),
+            'Price': price,
+            'Cost Price': _price(rng, 1, float(price)),
+            'Retail Price': rng.choice(('0.00', price)),
+            'Sale Price': rng.choice(('0.00', '0.00', '0.00', _price(rng, 1, float(price)))),
+            'Brand ID': brand_id,
+            'Channels': '1',
+            'Categories': ';'.join(categories),
+            'Description': _description(rng, name, product_id),
+            'Page Title': f'{name} | Toynami',
+            'Product URL': f'/{slug}/',
+            'Meta Description': f"{name} - {rng.choice(_WORDS)} & \"collectible\"",
+            'Search Keywords': ', '.join(keywords),
+            'Meta Keywords': '; '.join(keywords),
+            'UPC/EAN': f'8-16355-{rng.randint(0, 99999):05d}-{rng.randint(0, 9)}',
+            'Free Shipping': rng.choice(('FALSE',) * 30 + ('TRUE',)),
+            'Fixed Shipping Cost': '0.00',
+            'Weight': _price(rng, 0.1, 20),
+            'Width': _price(rng, 1, 24),
+            'Height': _price(rng, 1, 24),
+            'Depth': _price(rng, 1, 24),
+            'Is Visible': rng.choice(('TRUE', 'FALSE')),
+            'Is Featured': rng.choice(('FALSE',) * 40 + ('TRUE',)),
+            'Tax Class': '0',
+            'Product Condition': 'New',
+            'Show Product Condition': 'FALSE',
+            'Sort Order': '0',
+        })]
+
+        if rng.random() < variant_rate:
+            colors = rng.sample(_COLORS, 2) if rng.random() < 0.3 else [None]
+            for color in colors:
+                for size in _SIZES[rng.randint(0, 2):rng.randint(4, 7)]:
+                    options = f'Type=Radio|Name=Size|Value={size}'
+                    if color:
+                        options += f'|Type=Swatch|Name=Color|Value={color}'
+                    rows.append(_row({
+                        'Item': 'Variant',
+                        'ID': ids.take('Variant'),
+                        'SKU': f'{sku}-{size}' + (f'-{color}' if color else ''),
+                        'Options': options,
+                        'Current Stock': str(rng.randint(0, 50)),
+                        'Low Stock': '0',
+                        'Price': rng.choice(('', '', _price(rng, 4, 400))),
+                        'Free Shipping': 'FALSE',
+                    }))
+
+        for position in range(max(1, min(12, round(rng.gauss(images, images / 2))))):
+            image_id = ids.take('Image')
+            stamp = 1750464104 + rng.randint(0, 99)
+            rows.append(_row({
+                'Item': 'Image',
+                'ID': image_id,
+                'Internal Image URL (Export)': f'{CDN}/products/{product_id}/images/{image_id}/'
+                                               f'{slug[:24]}_{position:02d}__{rng.randint(10000, 99999)}'
+                                               f'.{stamp}.386.513.jpg?c=1',
+                'Image Description': rng.choice(('',) * 20 + (f'{name} "front"',)),
+                'Image is Thumbnail': 'TRUE' if position == 0 else 'FALSE',
+                'Image Sort Order': str(position),
+            }))
+
+        if rng.random() < video_rate:
+            rows.append(_row({
+                'Item': 'Video',
+                'ID': ids.take('Video'),
+                'YouTube ID': ''.join(rng.choice('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_')
+                                      for _ in range(11)),
+                'Video Title': name,
+                'Video Description': _sentence(rng, name),
+                'Video Sort Order': '0',
+            }))
+
+        yield rows
+
+
+def write_export(path, products, **options):
+    """Write a synthetic export CSV; returns the number of rows written"""
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_HEADER)
+        for rows in synthetic_groups(products, **options):
+            writer.writerows(rows)
+            written += len(rows)
+    return written
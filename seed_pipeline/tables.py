@@ -0,0 +1,34 @@
+"""Column layouts for the tables the seed generators write
+
+``columns`` are the values a row supplies, in order, and ``key`` is the
+primary key used for ON CONFLICT upserts. ``defaults`` are (column,
+expression) pairs that INSERT output spells out explicitly and COPY
+output leaves to the column default in the schema.
+"""
+from collections import namedtuple
+
+from seed_pipeline.products import PRODUCT_SPEC
+from seed_pipeline.spec import spec_columns
+from seed_pipeline.sql import NOW
+from seed_pipeline.variants import VARIANT_COLUMNS
+
+Table = namedtuple('Table', 'name columns key defaults')
+
+PRODUCTS = Table('products', spec_columns(PRODUCT_SPEC), ('id',), (('created_at', NOW),))
+
+PRODUCT_VARIANTS = Table('product_variants', VARIANT_COLUMNS, ('id',),
+                         (('created_at', NOW), ('updated_at', NOW)))
+
+BRANDS = Table('brands', ('id', 'slug', 'name', 'is_active'), ('id',), ())
+
+PRODUCT_CATEGORIES = Table('product_categories', ('product_id', 'category_id'),
+                           ('product_id', 'category_id'), ())
+
+MEDIA_LIBRARY = Table('media_library', (
+    'id', 'filename', 'original_name', 'file_path', 'file_url', 'folder', 'title',
+    'alt_text', 'mime_type', 'file_extension', 'tags', 'sort_order',
+), ('id',), (('created_at', NOW), ('updated_at', NOW)))
+
+MEDIA_USAGE = Table('media_usage', (
+    'id', 'media_id', 'entity_type', 'entity_id', 'field_name',
+), ('id',), (('created_at', NOW),))
@@ -0,0 +1,71 @@
+"""Per-product transform stage of generate-clean-seed.py
+
+transform_chunk turns a list of ProductGroups into every row the seed
+needs from them: products, the child tables and category links. It runs
+in pool workers (see parallel.py), each with its own read-only view of
+the description cache; cache hits and new entries travel back with the
+rows so the parent can write them once.
+"""
+from collections import Counter
+
+from seed_pipeline.cache import DescriptionCache
+from seed_pipeline.categories import product_category_rows
+from seed_pipeline.media import media_rows
+from seed_pipeline.products import product_rows
+from seed_pipeline.sanitize import SANITIZER_VERSION, sanitize_html
+from seed_pipeline.tables import MEDIA_LIBRARY, MEDIA_USAGE, PRODUCT_CATEGORIES, PRODUCT_VARIANTS
+from seed_pipeline.variants import variant_rows
+
+# Tables filled from a product's Variant/Image rows, written after
+# products in this order, with their section titles (see add_child_rows)
+CHILD_TABLES = (
+    (PRODUCT_VARIANTS, '🎛️ Product Variants'),
+    (MEDIA_LIBRARY, '📸 Product Images'),
+    (MEDIA_USAGE, '🔗 Product Image Usage'),
+)
+
+_cache = None
+_overrides = None
+
+
+def add_child_rows(groups, children):
+    """Append the CHILD_TABLES rows of ``groups`` to ``children`` (table name -> row list)
+
+    Each product's images are parsed once for both media tables.
+    """
+    children[PRODUCT_VARIANTS.name].extend(variant_rows(groups))
+    library = children[MEDIA_LIBRARY.name]
+    usage = children[MEDIA_USAGE.name]
+    for media, link in media_rows(groups):
+        library.append(media)
+        usage.append(link)
+
+
+def description_overrides(cache):
+    """products converter overrides that clean descriptions through ``cache``"""
+    if cache is None:
+        return None
+    return {'description': cache.wrap('sanitize_html', SANITIZER_VERSION, sanitize_html)}
+
+
+def init_worker(cache_path=None):
+    """Pool initializer: open this worker's connection to the description cache"""
+    global _cache, _overrides
+    if cache_path is not None:
+        _cache = DescriptionCache(cache_path)
+        _overrides = description_overrides(_cache)
+
+
+def transform_chunk(groups):
+    """Rows for a chunk of ProductGroups
+
+    Returns (products rows, {table name: rows} for CHILD_TABLES and
+    product_categories, Counter of unmapped category IDs, cache pending()
+    or None).
+    """
+    unmapped = Counter()
+    children = {table.name: [] for table, _ in CHILD_TABLES}
+    add_child_rows(groups, children)
+    children[PRODUCT_CATEGORIES.name] = list(product_category_rows(groups, unmapped))
+    products = list(product_rows(groups, _overrides))
+    return products, children, unmapped, _cache.pending() if _cache is not None else None
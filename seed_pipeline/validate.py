@@ -0,0 +1,394 @@
+"""Statement-level validation of seed SQL
+
+validate_seed walks a seed once with a tokenizer that knows the literal
+forms the generators and the hand-written seed use: '...' strings with
+'' escapes, E'...' strings with backslash escapes, dollar quotes ($$...$$,
+$DESC1$...$DESC1$), "quoted" identifiers, -- and /* */ comments, and
+bracketed values such as ARRAY[...] and NOW() or other function calls.
+
+Every INSERT ... VALUES row is checked against its column list, and its
+primary key against every earlier row of the same table. COPY data rows
+get the same checks, and so do the rows of the VALUES list in an
+INSERT ... SELECT ... FROM (VALUES ...) AS v (columns), under v's column
+names (the generators link product_categories this way). Other
+statements that write rows (UPDATE, DELETE, other INSERT ... SELECTs)
+are listed as ``unread``, with a digest of their text: their rows are
+not seen, but two seeds can still tell whether they wrote the same
+statement. A literal that never closes swallows the rest of
+the file in PostgreSQL too, so it is reported at the line where it opens
+and the scan stops there.
+
+An ``on_row`` callback sees every row whose width matches its column
+list, as raw values, so other tools (seed_pipeline.seed_diff) read rows
+with the same tokenizer.
+
+Dollar quoting follows PostgreSQL: the tag ends at the second ``$``, so
+``$$DESC$$`` is the string 'DESC' rather than an opening delimiter.
+"""
+import hashlib
+import mmap
+import re
+from collections import namedtuple
+
+from seed_pipeline.seed_index import TABLE_KEYS
+
+Issue = namedtuple('Issue', 'line kind message')
+
+# What a pass covered, for the summary line; ``unread`` are the Unreads
+# of statements that write rows this module cannot read
+Summary = namedtuple('Summary', 'statements inserts rows copy_rows issues unread')
+Unread = namedtuple('Unread', 'line digest')
+
+# Whitespace and -- comments between tokens
+_GAP = re.compile(rb'(?:\s+|--[^\n]*)*')
+# Anything that is not the start of a literal, comment, bracket or separator
+_RUN = re.compile(rb"[^'\"$;,()\[\]/-]*")
+_STRING = re.compile(rb"'[^']*(?:''[^']*)*'")
+_ESCAPE_STRING = re.compile(rb"'[^'\\]*(?:(?:\\.|'')[^'\\]*)*'", re.S)
+_QUOTED_NAME = re.compile(rb'"[^"]*(?:""[^"]*)*"')
+_DOLLAR_TAG = re.compile(rb'\$(?:[A-Za-z_\x80-\xff][A-Za-z_0-9\x80-\xff]*)?\$')
+
+# A whole value that needs no further tokenizing, and the separator after it
+_SIMPLE_VALUE = re.compile(rb"\s*('[^']*(?:''[^']*)*'|-?\d+(?:\.\d+)?|NULL|true|false|NOW\(\))\s*([,)])", re.I)
+
+_NAME = rb'(?:"[^"]*(?:""[^"]*)*"|[A-Za-z_][\w$.]*)'
+_INSERT = re.compile(rb'INSERT\s+INTO\s+(' + _NAME + rb')\s*\(([^)]*)\)\s*VALUES\b', re.I)
+_INSERT_SELECT = re.compile(rb'INSERT\s+INTO\s+(' + _NAME + rb')\s*\(([^)]*)\)\s*SELECT\b[^;()]*?\bFROM\s*\(\s*VALUES\b',
+                            re.I)
+_ALIAS = re.compile(rb'\)\s*(?:AS\s+)?' + _NAME + rb'\s*\(([^)]*)\)', re.I)
+_WRITE = re.compile(rb'(?:INSERT|UPDATE|DELETE|MERGE|COPY)\b', re.I)
+_COPY = re.compile(rb'COPY\s+(' + _NAME + rb')\s*\(([^)]*)\)\s*FROM\s+stdin\s*;[ \t]*\r?\n?', re.I)
+_COPY_END = re.compile(rb'^\\\.[ \t]*\r?$', re.M)
+_ON_CONFLICT = re.compile(rb'ON\s+CONFLICT\b', re.I)
+
+_IDENTIFIER_BYTES = frozenset(b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+_OPEN = frozenset(b'([')
+_CLOSE = frozenset(b')]')
+
+_QUOTE, _DOUBLE_QUOTE, _DOLLAR, _DASH, _SLASH = b"'\"$-/"
+
+
+class _Unterminated(Exception):
+    def __init__(self, pos, what):
+        super().__init__(what)
+        self.pos = pos
+        self.what = what
+
+
+class _Lines:
+    """Byte offset -> line number, cheap for the mostly increasing offsets of one pass"""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.line = 1
+
+    def __call__(self, pos):
+        # mmap has no count(); the slices between successive rows are short
+        if pos >= self.pos:
+            self.line += self.data[self.pos:pos].count(b'\n')
+        else:
+            self.line -= self.data[pos:self.pos].count(b'\n')
+        self.pos = pos
+        return self.line
+
+
+def _literal_end(data, pos):
+    """End of the literal or comment starting at ``pos``, or None if none starts there"""
+    char = data[pos]
+    if char == _QUOTE:
+        if pos and data[pos - 1] in b'Ee' and (pos < 2 or data[pos - 2] not in _IDENTIFIER_BYTES):
+            match = _ESCAPE_STRING.match(data, pos)
+        else:
+            match = _STRING.match(data, pos)
+        if match is None:
+            raise _Unterminated(pos, 'string literal')
+        return match.end()
+    if char == _DOUBLE_QUOTE:
+        match = _QUOTED_NAME.match(data, pos)
+        if match is None:
+            raise _Unterminated(pos, 'quoted identifier')
+        return match.end()
+    if char == _DOLLAR:
+        if pos and data[pos - 1] in _IDENTIFIER_BYTES:
+            return None
+        match = _DOLLAR_TAG.match(data, pos)
+        if match is None:
+            return None
+        tag = match.group()
+        close = data.find(tag, match.end())
+        if close < 0:
+            raise _Unterminated(pos, f"dollar-quoted string {tag.decode('utf-8', 'replace')}")
+        return close + len(tag)
+    if char == _DASH and data[pos + 1:pos + 2] == b'-':
+        end = data.find(b'\n', pos)
+        return len(data) if end < 0 else end
+    if char == _SLASH and data[pos + 1:pos + 2] == b'*':
+        end = data.find(b'*/', pos + 2)
+        if end < 0:
+            raise _Unterminated(pos, 'block comment')
+        return end + 2
+    return None
+
+
+def _scan(data, pos, stop):
+    """Position of the first top-level byte in ``stop`` at or after ``pos``, or len(data)
+
+    Literals, comments and bracketed groups are stepped over whole.
+    """
+    size = len(data)
+    depth = 0
+    while True:
+        pos = _RUN.match(data, pos).end()
+        if pos >= size:
+            return size
+        char = data[pos]
+        if depth == 0 and char in stop:
+            return pos
+        if char in _OPEN:
+            depth += 1
+        elif char in _CLOSE:
+            if depth:
+                depth -= 1
+        else:
+            end = _literal_end(data, pos)
+            if end is not None:
+                pos = end
+                continue
+        pos += 1
+
+
+def _names(column_list):
+    return [name.strip().strip(b'"').decode('utf-8', 'replace') for name in column_list.split(b',')]
+
+
+def _key_positions(table, columns):
+    key = TABLE_KEYS.get(table, ('id',))
+    try:
+        return [columns.index(column) for column in key], key
+    except ValueError:
+        return None, key
+
+
+def _key_text(value):
+    """Comparable text of a key value as written in SQL"""
+    if value[:1] == b"'" and value[-1:] == b"'":
+        return value[1:-1].replace(b"''", b"'").decode('utf-8', 'replace')
+    return value.decode('utf-8', 'replace')
+
+
+class _Validator:
+    def __init__(self, data, on_row=None):
+        self.data = data
+        self.on_row = on_row
+        self.line = _Lines(data)
+        self.issues = []
+        # table -> {key tuple: line of first row}
+        self.keys = {}
+        self.statements = 0
+        self.inserts = 0
+        self.rows = 0
+        self.copy_rows = 0
+        self.unread = []
+
+    def issue(self, pos, kind, message):
+        self.issues.append(Issue(self.line(pos), kind, message))
+
+    def run(self):
+        data = self.data
+        size = len(data)
+        pos = 0
+        try:
+            while True:
+                pos = _GAP.match(data, pos).end()
+                if pos >= size:
+                    break
+                end = _literal_end(data, pos) if data[pos] == _SLASH else None
+                if end is not None:
+                    pos = end
+                    continue
+                self.statements += 1
+                insert = _INSERT.match(data, pos)
+                if insert is not None:
+                    pos = self.insert(insert)
+                    continue
+                copy = _COPY.match(data, pos)
+                if copy is not None:
+                    pos = self.copy(copy)
+                    continue
+                select = _INSERT_SELECT.match(data, pos)
+                if select is not None:
+                    pos = self.insert_select(select)
+                    continue
+                start = pos
+                pos = self.end_of_statement(pos, pos)
+                if _WRITE.match(data, start) is not None:
+                    self.add_unread(start, pos)
+        except _Unterminated as e:
+            self.issue(e.pos, 'unterminated', f'{e.what} never closes')
+        return Summary(self.statements, self.inserts, self.rows, self.copy_rows, self.issues, self.unread)
+
+    def end_of_statement(self, start, pos):
+        end = _scan(self.data, pos, b';')
+        if end >= len(self.data):
+            self.issue(start, 'unterminated', 'statement has no closing semicolon')
+            return end
+        return end + 1
+
+    def add_unread(self, start, end):
+        digest = hashlib.blake2b(self.data[start:end], digest_size=16).digest()
+        self.unread.append(Unread(self.line(start), digest))
+
+    def register(self, table, key_columns, key, pos, seen_here, upsert):
+        """Check one row's primary key; ``seen_here`` holds this statement's keys"""
+        if key in seen_here:
+            self.issue(pos, 'duplicate key', f'{table} ({", ".join(key_columns)})=({", ".join(key)}) '
+                                             f'appears twice in one statement')
+            return
+        seen_here.add(key)
+        if upsert:
+            return
+        seen = self.keys.setdefault(table, {})
+        first = seen.get(key)
+        if first is not None:
+            self.issue(pos, 'duplicate key', f'{table} ({", ".join(key_columns)})=({", ".join(key)}) '
+                                             f'already inserted at line {first}')
+        else:
+            seen[key] = self.line(pos)
+
+    def insert_select(self, match):
+        """Read the VALUES rows of an INSERT ... SELECT under the alias's column names"""
+        alias = _ALIAS.match(self.data, _scan(self.data, match.end(), b');'))
+        if alias is None:
+            end = self.end_of_statement(match.start(), match.end())
+            self.add_unread(match.start(), end)
+            return end
+        return self.insert(match, _names(alias.group(1)))
+
+    def insert(self, match, columns=None):
+        data = self.data
+        size = len(data)
+        start = match.start()
+        table = match.group(1).strip(b'"').decode('utf-8', 'replace')
+        if columns is None:
+            columns = _names(match.group(2))
+        width = len(columns)
+        positions, key_columns = _key_positions(table, columns)
+        wanted = {position: i for i, position in enumerate(positions)} if positions else {}
+        self.inserts += 1
+        pos = match.end()
+        rows = []  # (row start, key)
+        row_number = 0
+        on_row = self.on_row
+        while True:
+            pos = _GAP.match(data, pos).end()
+            if data[pos:pos + 1] != b'(':
+                self.issue(pos, 'syntax', f'{table}: expected a row tuple after VALUES')
+                return self.end_of_statement(start, pos)
+            row_start = pos
+            row_number += 1
+            pos += 1
+            count = 0
+            key = [None] * len(wanted)
+            values = [] if on_row is not None else None
+            while True:
+                simple = _SIMPLE_VALUE.match(data, pos)
+                if simple is not None:
+                    if values is not None:
+                        values.append(simple.group(1))
+                    if count in wanted:
+                        key[wanted[count]] = _key_text(simple.group(1))
+                    count += 1
+                    pos = simple.end()
+                    if simple.group(2) == b')':
+                        break
+                    continue
+                value_start = pos
+                pos = _scan(data, pos, b',);')
+                if pos >= size or data[pos] == 0x3b:
+                    self.issue(row_start, 'syntax', f'{table} row {row_number}: row tuple is not closed')
+                    return self.end_of_statement(start, pos)
+                if values is not None:
+                    values.append(data[value_start:pos].strip())
+                if count in wanted:
+                    key[wanted[count]] = _key_text(data[value_start:pos].strip())
+                count += 1
+                pos += 1
+                if data[pos - 1] == 0x29:
+                    break
+            self.rows += 1
+            if count != width:
+                self.issue(row_start, 'column count',
+                           f'{table} row {row_number}: {count} values for {width} columns')
+            else:
+                if wanted:
+                    rows.append((row_start, tuple(key)))
+                if on_row is not None:
+                    on_row(table, columns, values, row_start, False)
+            pos = _GAP.match(data, pos).end()
+            char = data[pos:pos + 1]
+            if char == b',':
+                pos += 1
+                continue
+            upsert = _ON_CONFLICT.match(data, pos) is not None
+            if char == b';':
+                pos += 1
+            else:
+                pos = self.end_of_statement(start, pos)
+            break
+        seen_here = set()
+        for row_start, key in rows:
+            self.register(table, key_columns, key, row_start, seen_here, upsert)
+        return pos
+
+    def copy(self, match):
+        data = self.data
+        table = match.group(1).strip(b'"').decode('utf-8', 'replace')
+        columns = _names(match.group(2))
+        width = len(columns)
+        positions, key_columns = _key_positions(table, columns)
+        pos = match.end()
+        end = _COPY_END.search(data, pos)
+        if end is None:
+            self.issue(match.start(), 'unterminated', f'COPY {table} data has no \\. terminator')
+            return len(data)
+        block_end = end.start()
+        seen_here = set()
+        row_number = 0
+        while pos < block_end:
+            newline = data.find(b'\n', pos, block_end)
+            line_end = block_end if newline < 0 else newline
+            row_number += 1
+            self.copy_rows += 1
+            row = data[pos:line_end].rstrip(b'\r')
+            fields = row.count(b'\t') + 1
+            if fields != width:
+                self.issue(pos, 'column count', f'{table} COPY row {row_number}: {fields} fields for {width} columns')
+            else:
+                if positions:
+                    values = row.split(b'\t', max(positions) + 1)
+                    key = tuple(values[i].decode('utf-8', 'replace') for i in positions)
+                    self.register(table, key_columns, key, pos, seen_here, False)
+                if self.on_row is not None:
+                    self.on_row(table, columns, row.split(b'\t'), pos, True)
+            pos = line_end + 1
+        return end.end()
+
+
+def validate_seed(data, on_row=None):
+    """Validate seed SQL ``data`` (bytes or mmap); returns a Summary
+
+    ``on_row(table, columns, values, offset, copy)`` is called for each
+    row with as many values as columns: the raw bytes of each SQL
+    literal, or of each COPY field when ``copy`` is true.
+    """
+    return _Validator(data, on_row).run()
+
+
+def validate_file(path, on_row=None):
+    """Memory-map and validate a seed file"""
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return validate_seed(b'', on_row)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return validate_seed(data, on_row)
@@ -0,0 +1,86 @@
+"""Turn export Variant rows into product_variants rows
+
+Each Variant row follows the Product row it belongs to and carries its
+options as one string:
+
+    Type=Radio|Name=Size|Value=XS
+
+Products with several options repeat the Type/Name/Value triple. The
+parsed {name: value} mapping goes into both option_values (read by the
+admin) and option_combination (read by calculate_variant_price and
+generate_variant_sku).
+"""
+from seed_pipeline.products import number, price, text
+from seed_pipeline.registry import registry
+from seed_pipeline.spec import column, compile_spec, const, spec_columns
+
+
+def parse_options(val):
+    """Parse a BigCommerce Options string into {option name: value}"""
+    options = {}
+    name = None
+    for part in val.split('|'):
+        key, sep, value = part.partition('=')
+        if not sep:
+            continue
+        key = key.strip()
+        if key == 'Name':
+            name = value.strip()
+        elif key == 'Value' and name:
+            options[name] = value.strip()
+            name = None
+    return options or None
+
+
+def variant_id(val):
+    """Stable product_variants.id for a BigCommerce variant ID
+
+    The same variant keeps its id across exports and delta seeds.
+    """
+    return registry().get('product-variant', val.strip())
+
+
+VARIANT_SPEC = (
+    column('id', 'ID', variant_id),
+    column('sku', 'SKU', text),
+    column('price_cents', 'Price', price),
+    column('stock', 'Current Stock', number),
+    const('is_active', True),
+    column('option_values', 'Options', parse_options),
+    column('option_combination', 'Options', parse_options),
+    column('weight', 'Weight', number),
+    column('width', 'Width', number),
+    column('height', 'Height', number),
+    column('depth', 'Depth', number),
+    column('cost_cents', 'Cost Price', price),
+    column('min_stock_level', 'Low Stock', number),
+    column('barcode', 'UPC/EAN', text),
+)
+
+# Filled from the Product row the variants follow
+VARIANT_COLUMNS = spec_columns(VARIANT_SPEC) + ('product_id', 'position')
+
+_PRICE = spec_columns(VARIANT_SPEC).index('price_cents')
+
+
+def variant_rows(groups, overrides=None):
+    """Yield a product_variants row for each Variant row of each ProductGroup
+
+    Variants without their own price inherit the product's, since
+    price_cents is NOT NULL.
+    """
+    convert = None
+    columns = None
+    for group in groups:
+        if not group.variants:
+            continue
+        if group.columns is not columns:
+            columns = group.columns
+            convert = compile_spec(VARIANT_SPEC, columns, overrides)
+        product_id = int(group.product_id)
+        product_price = price(group.get('Price')) or 0
+        for position, variant in enumerate(group.variants):
+            row = convert(variant)
+            if row[_PRICE] is None:
+                row = row[:_PRICE] + (product_price,) + row[_PRICE + 1:]
+            yield row + (product_id, position)
@@ -1,66 +1,40 @@
 #!/usr/bin/env python3
+import argparse
+import os
+import sys
+import time
 
-def validate_seed():
-    with open('/Volumes/Projects2025/toynami-paypal/supabase/seed.sql', 'r') as f:
-        lines = f.readlines()
-    
-    # Find the INSERT INTO products statement
-    in_insert = False
-    columns = []
-    
-    for i, line in enumerate(lines):
-        if 'INSERT INTO products (' in line:
-            in_insert = True
-            print(f"Found INSERT at line {i+1}")
-            continue
-        
-        if in_insert and ') VALUES' in line:
-            print(f"Found end of columns at line {i+1}")
-            break
-            
-        if in_insert:
-            # Extract column names
-            cols = [c.strip() for c in line.strip().split(',') if c.strip()]
-            columns.extend(cols)
-    
-    print(f"\nTotal columns: {len(columns)}")
-    print("Columns:", columns[:5], "...", columns[-5:])
-    
-    # Now find first product values
-    in_values = False
-    values = []
-    
-    for i, line in enumerate(lines):
-        if '    700, NULL,' in line or '    700,' in line:
-            in_values = True
-            print(f"\nFound product 700 at line {i+1}")
-            # First line has ID and brand_id
-            if 'NULL' in line:
-                values.extend(['700', 'NULL'])
-            else:
-                values.append('700')
-            continue
-            
-        if in_values:
-            if line.strip().startswith(');'):
-                print(f"Found end of values at line {i+1}")
-                break
-            
-            # Count commas to determine values
-            # Each line typically has one value
-            val = line.strip().rstrip(',')
-            if val:
-                values.append(val)
-    
-    print(f"\nTotal values: {len(values)}")
-    print("First 5 values:", values[:5])
-    print("Last 5 values:", values[-5:] if len(values) > 5 else values)
-    
-    if len(columns) != len(values):
-        print(f"\n❌ MISMATCH: {len(columns)} columns vs {len(values)} values")
-        print(f"Difference: {abs(len(columns) - len(values))}")
-    else:
-        print(f"\n✅ Match: {len(columns)} columns and values")
+from seed_pipeline.validate import validate_file
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def print_issues(summary, max_issues):
+    for issue in summary.issues[:max_issues]:
+        print(f"❌ line {issue.line}: {issue.kind}: {issue.message}")
+    if len(summary.issues) > max_issues:
+        print(f"... and {len(summary.issues) - max_issues} more")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check every statement of a seed file before loading it')
+    parser.add_argument('seed', nargs='?', default=os.path.join(ROOT, 'supabase/seed.sql'))
+    parser.add_argument('--max-issues', type=int, default=50, help='issues to print (all are counted)')
+    args = parser.parse_args()
+
+    size_mb = os.path.getsize(args.seed) / 1024 / 1024
+    print(f"Validating {args.seed} ({size_mb:.1f} MB)...")
+    start = time.perf_counter()
+    summary = validate_file(args.seed)
+    elapsed = time.perf_counter() - start
+
+    print_issues(summary, args.max_issues)
+    checked = (f"{summary.statements} statements, {summary.rows} INSERT rows, "
+               f"{summary.copy_rows} COPY rows in {elapsed:.2f}s")
+    if summary.issues:
+        print(f"Found {len(summary.issues)} issues ({checked})")
+        sys.exit(1)
+    print(f"✅ No issues: {checked}")
 
 if __name__ == '__main__':
-    validate_seed()
\ No newline at end of file
+    main()